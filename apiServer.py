@@ -0,0 +1,523 @@
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+from journal import CONFLICTING_OPS, CONFLICT_MESSAGES
+from scrumModel import DATA_FILE, ScrumProject, current_timestamp, load_projects, project_from_data
+from sprintAnalytics import Analytics
+from sprintPlanner import DEFAULT_DAILY_CAPACITY
+from storage import open_storage
+from taskStore import parse_estimate
+import instrumentation
+from instrumentation import timed
+
+# API REST local (só localhost por padrão) sobre o mesmo storage do app. Leituras saem do
+# modelo em memória, compartilhado por todos os clientes; escritas entram numa fila e são
+# aplicadas por um único escritor, que grava cada lote com um apply_batch.
+#
+#   GET  /projects                          lista (?offset=&limit=)
+#   POST /projects                          {"project_name", "scrum_master"}
+#   GET  /projects/<nome>                   dados do projeto
+#   GET  /projects/<nome>/backlog           página do backlog (?offset=&limit=)
+#   POST /projects/<nome>/backlog           {"title", "description", "assigned_to", "story_points"?, "priority"?}
+#   GET  /projects/<nome>/sprint            página das tarefas da sprint
+#   GET  /projects/<nome>/sprint-plan       plano da próxima sprint (?daily_capacity=&capacity=nome:pontos)
+#   POST /projects/<nome>/sprint            inicia a sprint com o plano ({"daily_capacity"?, "capacities"?})
+#   PUT  /projects/<nome>/sprint-info       {"sprint_planning_date", "daily_scrum_time", "sprint_duration"}
+#   PUT  /projects/<nome>/sprint/<número>   {"status"} (também /backlog/<número>)
+#   GET  /analytics                         burndown, velocidade e tarefas abertas do portfólio
+
+DEFAULT_PORT = 8765
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+MAX_BODY = 1024 * 1024
+KEEP_ALIVE_TIMEOUT = 30
+CACHE_SIZE = 1024
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def encode(payload):
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def format_date(value):
+    return value.strftime("%Y-%m-%d") if value else None
+
+
+def format_time(value):
+    return value.strftime("%H:%M") if value else None
+
+
+def project_summary(project):
+    return {
+        "project_name": project.project_name,
+        "scrum_master": project.scrum_master,
+        "sprint_planning_date": format_date(project.sprint_planning_date),
+        "daily_scrum_time": format_time(project.daily_scrum_time),
+        "sprint_duration": project.sprint_duration,
+        "backlog_count": project.backlog_count,
+        "sprint_count": project.sprint_count
+    }
+
+
+def page_args(query):
+    try:
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query.get("limit", [str(PAGE_SIZE)])[0])
+    except ValueError:
+        raise HttpError(400, "offset e limit devem ser inteiros")
+    if offset < 0 or not 0 < limit <= MAX_PAGE_SIZE:
+        raise HttpError(400, f"offset deve ser >= 0 e limit entre 1 e {MAX_PAGE_SIZE}")
+    return offset, limit
+
+
+def task_page(total, rows, offset):
+    return {"total": total, "offset": offset, "tasks": [dict(task.to_dict(), number=number) for number, task in rows]}
+
+
+def required_text(body, *fields):
+    values = []
+    for field in fields:
+        value = body.get(field)
+        if not isinstance(value, str) or not value.strip():
+            raise HttpError(400, f"O campo '{field}' é obrigatório")
+        values.append(value)
+    return values
+
+
+def parse_estimate_fields(body):
+    try:
+        return parse_estimate(body.get("story_points"), body.get("priority"))
+    except ValueError as error:
+        raise HttpError(400, str(error))
+
+
+def parse_capacity(daily_capacity, capacities):
+    # Pontos por dia: um valor para todos e, opcionalmente, {responsável: pontos} para alguns
+    try:
+        daily_capacity = DEFAULT_DAILY_CAPACITY if daily_capacity in (None, "") else float(daily_capacity)
+        capacities = {str(name): float(points) for name, points in (capacities or {}).items()}
+    except (AttributeError, TypeError, ValueError):
+        raise HttpError(400, "daily_capacity e capacities devem ser números de pontos por dia")
+    if daily_capacity < 0 or any(points < 0 for points in capacities.values()):
+        raise HttpError(400, "A capacidade não pode ser negativa")
+    return daily_capacity, capacities
+
+
+def query_capacity(query):
+    capacities = {}
+    for value in query.get("capacity", []):
+        name, _, points = value.rpartition(":")
+        if not name:
+            raise HttpError(400, "capacity deve ser nome:pontos")
+        capacities[name] = points
+    return parse_capacity(query.get("daily_capacity", [None])[0], capacities)
+
+
+def task_row(number):
+    try:
+        row = int(number) - 1
+    except ValueError:
+        raise HttpError(404, "Rota não encontrada")
+    if row < 0:
+        raise HttpError(404, "Rota não encontrada")
+    return row
+
+
+def parse_sprint_info(body):
+    # Mesmos formatos da janela "Definir Informações da Sprint"
+    try:
+        planning_date = datetime.strptime(required_text(body, "sprint_planning_date")[0], "%Y-%m-%d")
+        daily_time = datetime.strptime(body["daily_scrum_time"], "%H:%M").time() if body.get("daily_scrum_time") else None
+        duration = int(body.get("sprint_duration") or 0)
+    except (TypeError, ValueError) as error:
+        raise HttpError(400, f"Entrada inválida: {error}")
+    return planning_date, daily_time, duration
+
+
+class WriteRequest:
+    __slots__ = ("kind", "project_name", "args", "future", "operation", "response")
+
+    def __init__(self, kind, project_name, args, future):
+        self.kind = kind
+        self.project_name = project_name
+        self.args = args
+        self.future = future
+        self.operation = None
+        self.response = None
+
+
+class ApiServer:
+    def __init__(self, storage, poll_interval=2.0, max_batch=200):
+        self.storage = storage
+        self.poll_interval = poll_interval
+        self.max_batch = max_batch
+        self.projects = load_projects(storage)
+        self.by_name = {project.project_name: project for project in self.projects}
+        self.analytics = Analytics(storage.file_name + ".stats")
+        self.analytics.track(self.projects, storage.versions)
+        # Respostas de GET já serializadas, por projeto (None = lista de projetos). Uma escrita
+        # invalida só o projeto alterado e a lista.
+        self.cache = {}
+        # Projeto -> leitura das tarefas em andamento no executor (ver hydrate)
+        self.hydrating = {}
+        self.queue = None
+        self.writer_task = None
+
+    # Leituras
+
+    @timed("ApiServer.read")
+    def read(self, parts, query):
+        if parts == ["projects"]:
+            offset, limit = page_args(query)
+            return 200, {
+                "total": len(self.projects),
+                "offset": offset,
+                "projects": [project_summary(project) for project in self.projects[offset:offset + limit]]
+            }
+        project = self.find_project(parts[1])
+        if len(parts) == 2:
+            return 200, project_summary(project)
+        if parts[2] == "sprint-plan":
+            return 200, project.plan_sprint(*query_capacity(query)).to_dict()
+        offset, limit = page_args(query)
+        if parts[2] == "backlog":
+            return 200, task_page(project.backlog_count, project.backlog_page(offset, limit), offset)
+        return 200, task_page(project.sprint_count, project.sprint_page(offset, limit), offset)
+
+    def cached_read(self, parts, query, target):
+        key = parts[1] if len(parts) > 1 else None
+        cached = self.cache.get(key, {}).get(target)
+        if cached is None:
+            status, payload = self.read(parts, query)
+            project_cache = self.cache.setdefault(key, {})
+            if len(project_cache) >= CACHE_SIZE:
+                project_cache.clear()
+            cached = project_cache[target] = status, encode(payload)
+        return cached
+
+    async def hydrate(self, project_name):
+        # A primeira leitura das tarefas de um projeto vai ao disco e monta o TaskStore: roda no
+        # executor, como as gravações, para não parar o loop. Requisições simultâneas esperam a mesma.
+        project = self.by_name.get(project_name)
+        if project is None or project.loader is None:
+            return
+        pending = self.hydrating.get(project)
+        if pending is None:
+            pending = self.hydrating[project] = asyncio.get_running_loop().run_in_executor(None, project.hydrate)
+            pending.add_done_callback(lambda _: self.hydrating.pop(project, None))
+        await asyncio.shield(pending)
+
+    def invalidate(self, project_name):
+        self.cache.pop(project_name, None)
+        self.cache.pop(None, None)
+
+    def find_project(self, project_name):
+        project = self.by_name.get(project_name)
+        if project is None:
+            raise HttpError(404, f"Projeto '{project_name}' não encontrado")
+        return project
+
+    # Escritas: só o escritor (run_writer) altera o modelo e o storage
+
+    async def write(self, kind, project_name, *args):
+        await self.hydrate(project_name)
+        request = WriteRequest(kind, project_name, args, asyncio.get_running_loop().create_future())
+        await self.queue.put(request)
+        status, payload = await request.future
+        return status, encode(payload)
+
+    @timed("ApiServer.apply_writes")
+    def apply_writes(self, requests):
+        operations = []
+        for request in requests:
+            try:
+                request.response, request.operation = self.apply_write(request)
+            except HttpError as error:
+                request.response = error.status, {"error": str(error)}
+            if request.operation is not None:
+                operations.append(request.operation)
+                self.invalidate(request.project_name)
+        return operations
+
+    def apply_write(self, request):
+        if request.kind == "add_project":
+            if request.project_name in self.by_name:
+                raise HttpError(409, f"Já existe um projeto chamado '{request.project_name}'")
+            project = ScrumProject(request.project_name, *request.args)
+            self.projects.append(project)
+            self.by_name[project.project_name] = project
+            self.analytics.attach(project)
+            return (201, project_summary(project)), ("add_project", (project.to_dict(),))
+
+        project = self.find_project(request.project_name)
+        if request.kind == "add_task":
+            task = project.add_task_to_backlog(*request.args)
+            return (201, dict(task.to_dict(), number=len(project.product_backlog))), ("add_task", (project.project_name, task.to_dict()))
+
+        if request.kind == "set_sprint_info":
+            planning_date, daily_time, duration = request.args
+            message = project.set_sprint_info(planning_date, daily_time, duration)
+            operation = ("set_sprint_info", (project.project_name, format_date(planning_date), format_time(daily_time), duration))
+            return (200, dict(project_summary(project), message=message)), operation
+
+        if request.kind == "set_task_status":
+            in_sprint, row, status = request.args
+            timestamp = current_timestamp()
+            try:
+                message = project.set_task_status(in_sprint, row, status, timestamp)
+            except ValueError as error:
+                raise HttpError(400, str(error))
+            tasks = project.sprint_tasks if in_sprint else project.product_backlog
+            response = dict(tasks[row].to_dict(), number=row + 1, message=message)
+            return (200, response), ("set_task_status", (project.project_name, in_sprint, row, status, timestamp))
+
+        error = project.sprint_start_error()
+        if error:
+            raise HttpError(409, error)
+        plan = project.plan_sprint(*request.args)
+        message = project.start_sprint(plan)
+        response = dict(project_summary(project), message=message, plan=plan.to_dict())
+        return (200, response), ("start_sprint", (project.project_name, plan.rows, project.sprint_started_at))
+
+    async def run_writer(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            try:
+                request = await asyncio.wait_for(self.queue.get(), self.poll_interval)
+            except asyncio.TimeoutError:
+                try:
+                    await self.poll_changes()
+                except OSError:
+                    # Arquivo temporariamente inacessível: tenta de novo na próxima rodada
+                    pass
+                continue
+
+            # Tudo o que chegou enquanto o lote anterior gravava vai junto neste
+            requests = []
+            while request is not None:
+                requests.append(request)
+                if len(requests) >= self.max_batch or self.queue.empty():
+                    break
+                request = self.queue.get_nowait()
+            stopping = request is None
+            if not requests:
+                continue
+
+            operations = self.apply_writes(requests)
+            error, changed, conflicts = await loop.run_in_executor(None, self.persist, operations)
+            if error is not None:
+                # O modelo já mudou mas o disco não: relê os projetos afetados
+                for request in requests:
+                    if request.operation is not None:
+                        request.response = 500, {"error": f"Não foi possível salvar: {error}"}
+                changed = set(changed) | {request.project_name for request in requests if request.operation is not None}
+            if changed:
+                await self.refresh(changed)
+            for request in requests:
+                if request.operation is not None:
+                    # Projeto removido por outra instância descarta qualquer operação sobre ele
+                    kinds = (request.kind, "removed") if request.kind in CONFLICTING_OPS else ("removed",)
+                    for kind in kinds:
+                        message = CONFLICT_MESSAGES[kind].format(request.project_name)
+                        if message in conflicts:
+                            request.response = 409, {"error": message}
+                if not request.future.done():
+                    request.future.set_result(request.response)
+            instrumentation.add("api_write_batches")
+
+    def persist(self, operations):
+        # Roda fora do loop: grava o lote e já verifica conflitos e alterações de outras instâncias
+        error = None
+        if operations:
+            try:
+                self.storage.apply_batch(operations)
+            except Exception as exception:
+                error = exception
+        try:
+            changed, conflicts = self.storage.poll_changes()
+        except OSError:
+            changed, conflicts = [], []
+        return error, changed, conflicts
+
+    async def poll_changes(self):
+        # Alterações de outras instâncias (app, CLI ou outro servidor) no mesmo arquivo
+        changed, conflicts = await asyncio.get_running_loop().run_in_executor(None, self.storage.poll_changes)
+        if changed:
+            await self.refresh(changed)
+        return conflicts
+
+    async def refresh(self, project_names):
+        loop = asyncio.get_running_loop()
+        for project_name in project_names:
+            try:
+                project_data = await loop.run_in_executor(None, self.storage.load_project, project_name)
+            except OSError:
+                continue
+            if project_data is None:
+                # Outra instância desfez a criação do projeto
+                old = self.by_name.pop(project_name, None)
+                if old is not None:
+                    self.projects.remove(old)
+                    self.analytics.detach(old)
+                    self.invalidate(project_name)
+                continue
+            project = project_from_data(self.storage, project_data)
+            old = self.by_name.get(project_name)
+            if old is None:
+                self.projects.append(project)
+            else:
+                self.projects[self.projects.index(old)] = project
+            self.analytics.replace(old, project, self.storage.versions.get(project_name))
+            self.by_name[project_name] = project
+            self.invalidate(project_name)
+
+    # HTTP
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip("/").split("/")]
+        if parts == ["analytics"]:
+            if method != "GET":
+                raise HttpError(405, "Método não permitido")
+            # Indicadores já materializados: montar a resposta não varre tarefas
+            return 200, encode(self.analytics.dashboard())
+        if (not parts or parts[0] != "projects" or len(parts) > 4
+                or (len(parts) >= 3 and parts[2] not in ("backlog", "sprint", "sprint-plan", "sprint-info"))
+                or (len(parts) == 4 and parts[2] not in ("backlog", "sprint"))):
+            raise HttpError(404, "Rota não encontrada")
+
+        if method == "GET" and len(parts) < 4 and (len(parts) < 3 or parts[2] != "sprint-info"):
+            if len(parts) == 3:
+                await self.hydrate(parts[1])
+            return self.cached_read(parts, parse_qs(url.query), target)
+
+        try:
+            data = json.loads(body) if body else {}
+        except ValueError:
+            raise HttpError(400, "Corpo da requisição não é JSON válido")
+        if not isinstance(data, dict):
+            raise HttpError(400, "O corpo da requisição deve ser um objeto JSON")
+
+        if method == "POST" and len(parts) == 1:
+            return await self.write("add_project", *required_text(data, "project_name", "scrum_master"))
+        if method == "POST" and len(parts) == 3 and parts[2] == "backlog":
+            fields = required_text(data, "title", "description", "assigned_to")
+            return await self.write("add_task", parts[1], *fields, *parse_estimate_fields(data))
+        if method == "POST" and len(parts) == 3 and parts[2] == "sprint":
+            return await self.write("start_sprint", parts[1], *parse_capacity(data.get("daily_capacity"), data.get("capacities")))
+        if method == "PUT" and len(parts) == 3 and parts[2] == "sprint-info":
+            return await self.write("set_sprint_info", parts[1], *parse_sprint_info(data))
+        if method == "PUT" and len(parts) == 4:
+            status = required_text(data, "status")[0]
+            return await self.write("set_task_status", parts[1], parts[2] == "sprint", task_row(parts[3]), status)
+        raise HttpError(405, "Método não permitido")
+
+    async def read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise HttpError(400, "Linha de requisição inválida")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HttpError(400, "Content-Length inválido")
+        if length > MAX_BODY:
+            raise HttpError(413, "Corpo da requisição muito grande")
+        body = await reader.readexactly(length) if length else b""
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method.upper(), target, body, keep_alive
+
+    async def handle_connection(self, reader, writer):
+        # Conexões persistentes (keep-alive): um cliente reaproveita o socket entre requisições
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await asyncio.wait_for(self.read_request(reader), KEEP_ALIVE_TIMEOUT)
+                    if request is None:
+                        break
+                    method, target, body, keep_alive = request
+                except HttpError as error:
+                    status, content = error.status, encode({"error": str(error)})
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                    # Cliente parado, conexão cortada no meio ou linha grande demais
+                    break
+                else:
+                    instrumentation.add("api_requests")
+                    try:
+                        status, content = await self.dispatch(method, target, body)
+                    except HttpError as error:
+                        status, content = error.status, encode({"error": str(error)})
+                    except Exception as error:
+                        status, content = 500, encode({"error": f"Erro interno: {error}"})
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(content)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + content
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        self.queue = asyncio.Queue()
+        self.writer_task = asyncio.create_task(self.run_writer())
+        server = await asyncio.start_server(self.handle_connection, host, port, backlog=1024)
+        print(f"API em http://{host}:{server.sockets[0].getsockname()[1]}/projects", flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            # As escritas já na fila ainda são gravadas antes de fechar o storage
+            await self.queue.put(None)
+            await self.writer_task
+            await asyncio.get_running_loop().run_in_executor(None, self.close_storage)
+
+    def close_storage(self):
+        # Projetos que outra instância alterou depois da última leitura não entram no cache
+        try:
+            self.analytics.save(self.storage.versions, self.storage.poll_changes()[0])
+        finally:
+            self.storage.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="apiServer.py", description="API REST local do Gerenciador de Projetos Scrum")
+    parser.add_argument("--data", default=DATA_FILE, help=f"arquivo de dados (padrão: {DATA_FILE})")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(ApiServer(open_storage(args.data)).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
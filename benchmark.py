@@ -0,0 +1,332 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+from datetime import datetime
+
+WORDS = "login erro pagina banco api tela relatorio usuario senha cache fila teste deploy busca filtro".split()
+PEOPLE = ["Ana", "Bruno", "Carla", "Diego", "Elisa", "Fabio", "Gabi", "Heitor"]
+STATUSES = ["To Do", "In Progress", "Done"]
+STORY_POINTS = [1, 2, 3, 5, 8, 13]
+
+
+# Dados sintéticos
+
+def generate_projects(task_count, project_count, seed=42):
+    rng = random.Random(seed)
+    projects = []
+    for index in range(project_count):
+        projects.append({
+            "project_name": f"Projeto {index}",
+            "scrum_master": rng.choice(PEOPLE),
+            "sprint_planning_date": "2024-01-15",
+            "daily_scrum_time": "09:30",
+            "sprint_duration": 14,
+            "product_backlog": [],
+            "sprint_tasks": []
+        })
+    for index in range(task_count):
+        project_data = projects[rng.randrange(project_count)]
+        key = "sprint_tasks" if rng.random() < 0.2 else "product_backlog"
+        project_data[key].append({
+            "title": " ".join(rng.sample(WORDS, 3)),
+            "description": f"Tarefa {index}: " + " ".join(rng.sample(WORDS, 6)),
+            "assigned_to": rng.choice(PEOPLE),
+            "status": rng.choice(STATUSES),
+            "story_points": rng.choice(STORY_POINTS),
+            "priority": rng.randint(1, 5)
+        })
+    return projects
+
+
+# Stub de widgets, para medir os caminhos do Tk sem display
+
+class StubWidget:
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        StubWidget.created += 1
+
+    def winfo_height(self):
+        return 600
+
+    def winfo_width(self):
+        return 800
+
+    def winfo_children(self):
+        return []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def stub_module(name):
+    module = types.ModuleType(name)
+
+    def module_getattr(attribute):
+        if attribute.isupper():
+            return attribute.lower()
+        if attribute[:1].isupper():
+            return StubWidget
+        return lambda *args, **kwargs: None
+
+    module.__getattr__ = module_getattr
+    return module
+
+
+def install_widget_stubs():
+    tkinter = stub_module("tkinter")
+    for submodule in ("messagebox", "simpledialog", "filedialog", "ttk"):
+        setattr(tkinter, submodule, stub_module(f"tkinter.{submodule}"))
+        sys.modules[f"tkinter.{submodule}"] = getattr(tkinter, submodule)
+    sys.modules["tkinter"] = tkinter
+    sys.modules["customtkinter"] = stub_module("customtkinter")
+
+
+# Medição
+
+def measure(function, repeat, setup=None):
+    # setup (se houver) prepara cada execução fora do tempo medido
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    if setup:
+        setup()
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": min(times), "mean_seconds": sum(times) / len(times), "peak_bytes": peak}
+
+
+def save_indented(file_name, data):
+    # Como os projetos eram gravados antes do modelCodec: dicts inteiros e json.dump(indent=4)
+    with open(file_name, 'w') as file:
+        json.dump(data, file, indent=4)
+
+
+def load_closed(scrumModel, storage, hydrate=False, compact=True):
+    # Carrega (e opcionalmente hidrata) e fecha o storage: arquivos, locks e mmaps de uma
+    # repetição não ficam abertos atrapalhando as seguintes
+    try:
+        projects = scrumModel.load_projects(storage)
+        if hydrate:
+            for project in projects:
+                project.hydrate()
+        if not compact:
+            # Fecha sem refazer o índice: a próxima repetição também lê o arquivo sem índice
+            storage.needs_index = False
+        return projects
+    finally:
+        storage.close()
+
+
+def export_to_dict(tasks, file_name):
+    # Como a exportação JSONL era feita antes do modelCodec.encode_task_lines
+    with open(file_name, 'w', encoding='utf-8') as file:
+        for task in tasks:
+            file.write(json.dumps(task.to_dict(), ensure_ascii=False) + "\n")
+
+
+def new_task(index):
+    return {"title": f"t{index}", "description": "d", "assigned_to": "Ana", "status": "To Do"}
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return None
+
+
+def run_size(main, scrumModel, task_count, project_count, repeat, workdir):
+    from journal import ProjectJournal, write_snapshot
+    from storage import open_storage
+    from sqliteStorage import migrate_json
+    from bulkIO import export_tasks
+    import modelCodec
+
+    results = []
+
+    def record(name, function, times=repeat, setup=None):
+        result = measure(function, times, setup)
+        result.update(name=name, tasks=task_count, projects=project_count)
+        results.append(result)
+        print(f"  {name:<32} {result['seconds'] * 1000:10.2f} ms  {result['peak_bytes'] / 1024:10.0f} KiB")
+
+    project_dicts = generate_projects(task_count, project_count)
+    data_file = os.path.join(workdir, f"data_{task_count}.json")
+    # Arquivo no formato antigo, sem schema_version: a primeira leitura passa pela migração
+    save_indented(data_file, {"projects": project_dicts})
+
+    record("load_projects (sem índice)", lambda: load_closed(scrumModel, ProjectJournal(data_file), compact=False))
+
+    # Gera o snapshot por linhas + índice, como o app faz ao fechar
+    journal = ProjectJournal(data_file)
+    journal.load()
+    journal.close()
+    record("load_projects (índice)", lambda: load_closed(scrumModel, ProjectJournal(data_file)))
+    record("load + hydrate todos", lambda: load_closed(scrumModel, ProjectJournal(data_file), hydrate=True))
+
+    projects = load_closed(scrumModel, ProjectJournal(data_file), hydrate=True)
+    record("ScrumProject.to_dict", lambda: [project.to_dict() for project in projects])
+
+    # Gravação de todos os projetos: o caminho antigo (json.dump com indent=4) contra o snapshot
+    # do journal (modelCodec.dumps, um projeto por linha), a partir do mesmo modelo
+    record("salvar: json.dump(indent=4)", lambda: save_indented(
+        data_file + ".copy", {"projects": [project.to_dict() for project in projects]}
+    ))
+    record("salvar: write_snapshot", lambda: write_snapshot(
+        data_file + ".copy", [project.to_dict() for project in projects], 0, None
+    ))
+    results[-1]["json_backend"] = "orjson" if modelCodec.orjson is not None else "json"
+
+    # Compactação: snapshot por linhas + 1000 registros no journal viram um snapshot novo com índice
+    compacting = []
+
+    def prepare_compaction():
+        while compacting:
+            compacting.pop().close()
+        for suffix in ("", ".idx"):
+            shutil.copyfile(data_file + suffix, data_file + ".compact" + suffix)
+        target = ProjectJournal(data_file + ".compact", compact_every=sys.maxsize)
+        target.load()
+        target.apply_batch([("add_task", (projects[0].project_name, new_task(index))) for index in range(1000)])
+        compacting.append(target)
+    record("journal compact (1000 registros)", lambda: compacting[-1].compact(), setup=prepare_compaction)
+    compacting.pop().close()
+
+    largest = max(projects, key=lambda project: len(project.product_backlog))
+    # Exportação JSONL: um dict por tarefa (to_dict + json.dumps) contra o codec (colunas direto para JSON)
+    record("exportar JSONL (to_dict)", lambda: export_to_dict(largest.product_backlog, data_file + ".jsonl"))
+    record("exportar JSONL (modelCodec)", lambda: export_tasks(largest.product_backlog, data_file + ".jsonl"))
+    record("view_backlog (maior projeto)", largest.view_backlog)
+    record("backlog_page(0, 50)", lambda: list(largest.backlog_page(0, 50)))
+
+    from search import search_tasks
+    record("search_tasks", lambda: len(search_tasks(projects, "login erro", "Ana")))
+
+    from sprintAnalytics import Analytics, ProjectStats
+    record("indicadores (recalculados)", lambda: [ProjectStats.from_project(project) for project in projects])
+    analytics = Analytics()
+    analytics.track(projects, {})
+    record("Analytics.dashboard", analytics.dashboard)
+
+    from sprintPlanner import plan_sprint
+    from taskStore import TaskStore
+    backlog = TaskStore.from_dicts([task for project_data in project_dicts for task in project_data["product_backlog"]])
+    record("plan_sprint (backlog inteiro)", lambda: plan_sprint(backlog, 14, 2))
+
+    def journal_appends():
+        target = ProjectJournal(data_file + ".append", compact_every=sys.maxsize)
+        target.load()
+        for index in range(1000):
+            target.add_task(largest.project_name, new_task(index))
+        target.close()
+        os.remove(target.journal_name)
+    record("journal 1000 add_task", journal_appends, 1)
+
+    # Vazão do BackgroundWriter: um lote de 1000 tarefas por apply_batch (um write + fsync)
+    batch = [("add_task", ("Lote", new_task(index))) for index in range(1000)]
+    for extension in (".json", ".db"):
+        batch_file = os.path.join(workdir, f"batch_{task_count}{extension}")
+        target = open_storage(batch_file)
+        target.load()
+        target.add_project(scrumModel.ScrumProject("Lote", "Ana").to_dict())
+        record(f"apply_batch 1000 add_task ({extension})", lambda: target.apply_batch(batch))
+        target.close()
+
+    db_file = os.path.join(workdir, f"data_{task_count}.db")
+    if os.path.exists(db_file):
+        os.remove(db_file)
+    migrate_json(data_file, db_file)
+    record("sqlite load (índice)", lambda: load_closed(scrumModel, open_storage(db_file)))
+
+    from binarySnapshot import json_to_binary
+    bin_file = os.path.join(workdir, f"data_{task_count}.bin")
+    json_to_binary(data_file, bin_file)
+    record("binary load (mmap)", lambda: load_closed(scrumModel, open_storage(bin_file)))
+
+    os.environ["SCRUM_DATA_FILE"] = data_file
+    main.DATA_FILE = data_file
+    root = main.tk.Tk()
+    StubWidget.created = 0
+    app = main.ScrumApp(root)
+    construction_widgets = StubWidget.created
+    StubWidget.created = 0
+    record("ScrumApp.load_projects", app.load_projects)
+    result = results[-1]
+    result["widgets_created"] = StubWidget.created
+    result["widgets_at_startup"] = construction_widgets
+    app.writer.close()
+    root.destroy()
+    return results
+
+
+def compare(results, baseline_file):
+    with open(baseline_file, 'r') as file:
+        baseline = {(item["name"], item["tasks"]): item for item in json.load(file)["results"]}
+    print("\nComparação com", baseline_file)
+    for item in results:
+        old = baseline.get((item["name"], item["tasks"]))
+        if old and old["seconds"]:
+            print(f"  {item['name']:<32} {item['tasks']:>8} tarefas  {item['seconds'] / old['seconds']:6.2f}x")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmarks de persistência, modelo e renderização do Scrum App")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000],
+                        help="quantidades de tarefas (ex.: 100 1000 1000000)")
+    parser.add_argument("--tasks-per-project", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="arquivo de resultados anterior para comparar")
+    parser.add_argument("--real-tk", action="store_true", help="usa o Tk de verdade (precisa de display)")
+    args = parser.parse_args()
+
+    if not args.real_tk:
+        install_widget_stubs()
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import scrumModel
+    import main
+
+    workdir = tempfile.mkdtemp(prefix="scrum-bench-")
+    results = []
+    try:
+        for task_count in args.sizes:
+            project_count = max(1, task_count // args.tasks_per_project)
+            print(f"{task_count} tarefas em {project_count} projetos")
+            results += run_size(main, scrumModel, task_count, project_count, args.repeat, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.output, 'w') as file:
+        json.dump({
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "widgets": "tk" if args.real_tk else "stub",
+            "results": results
+        }, file, indent=4)
+    print(f"\nResultados gravados em {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main_cli()
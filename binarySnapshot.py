@@ -0,0 +1,290 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from datetime import date
+from journal import PROJECT_FIELDS, ProjectJournal, write_snapshot
+from taskStore import DEFAULT_PRIORITY, DEFAULT_STORY_POINTS
+
+# Formato binário do snapshot (little-endian):
+#   cabeçalho fixo | offsets das strings (n + 1 x u64) | bytes UTF-8 das strings |
+#   registros de projeto (largura fixa) | registros de tarefa (largura fixa)
+# Todo texto fica na tabela de strings, sem repetição; projetos e tarefas guardam só ids.
+# Datas são ordinais (0 = sem data) e o horário da daily, minutos desde 00:00 (-1 = sem horário).
+# A versão 2 acrescenta ao projeto o seq do último registro que o alterou; a 3, os pontos
+# e a prioridade de cada tarefa; a 4, o início da sprint atual (0 = nenhum) e o histórico
+# de sprints do projeto, e os eventos de cada tarefa (os dois em JSON na tabela de strings).
+MAGIC = b"SCRUMBIN"
+VERSION = 4
+HEADER = struct.Struct("<8sHHIIIQQQQQ")
+PROJECTS = {
+    1: struct.Struct("<IIiiiIIII"),
+    2: struct.Struct("<IIiiiIIIIQ"),
+    3: struct.Struct("<IIiiiIIIIQ"),
+    4: struct.Struct("<IIiiiIIIIQdI")
+}
+PROJECT = PROJECTS[VERSION]
+TASKS = {1: struct.Struct("<IIII"), 2: struct.Struct("<IIII"), 3: struct.Struct("<IIIIHH"), 4: struct.Struct("<IIIIHHI")}
+TASK = TASKS[VERSION]
+# Sem string (histórico ou eventos vazios)
+NO_STRING = 0xFFFFFFFF
+# Valores dos últimos campos do registro atual, para completar registros de versões antigas
+PROJECT_DEFAULTS = (0, 0.0, NO_STRING)
+TASK_DEFAULTS = (DEFAULT_STORY_POINTS, DEFAULT_PRIORITY, NO_STRING)
+
+
+def field_count(record_struct):
+    return len(record_struct.unpack(bytes(record_struct.size)))
+
+
+def padding(record_struct, current_struct, defaults):
+    missing = field_count(current_struct) - field_count(record_struct)
+    return defaults[len(defaults) - missing:]
+
+
+OFFSET = struct.Struct("<Q")
+
+
+def date_to_ordinal(value):
+    return date.fromisoformat(value[:10]).toordinal() if value else 0
+
+
+def time_to_minutes(value):
+    if not value:
+        return -1
+    hours, minutes = value.split(":")[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+class StringTable:
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def json_id(self, value):
+        return self.id(json.dumps(value, separators=(",", ":"))) if value else NO_STRING
+
+    def id(self, value):
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return string_id
+
+
+def write_binary(file_name, projects, journal_seq, hydrate):
+    strings = StringTable()
+    project_records = []
+    task_records = []
+    entries = []
+    for position, project_data in enumerate(projects):
+        if "product_backlog" not in project_data:
+            project_data = hydrate(project_data)
+        backlog = project_data.get("product_backlog", [])
+        sprint_tasks = project_data.get("sprint_tasks", [])
+        backlog_start = len(task_records)
+        for task in backlog + sprint_tasks:
+            task_records.append((
+                strings.id(task["title"]),
+                strings.id(task["description"]),
+                strings.id(task["assigned_to"]),
+                strings.id(task.get("status", "To Do")),
+                task.get("story_points", DEFAULT_STORY_POINTS),
+                task.get("priority", DEFAULT_PRIORITY),
+                strings.json_id(task.get("events"))
+            ))
+        project_records.append((
+            strings.id(project_data["project_name"]),
+            strings.id(project_data["scrum_master"]),
+            date_to_ordinal(project_data.get("sprint_planning_date")),
+            time_to_minutes(project_data.get("daily_scrum_time")),
+            project_data.get("sprint_duration") or 0,
+            backlog_start,
+            len(backlog),
+            backlog_start + len(backlog),
+            len(sprint_tasks),
+            project_data.get("version", 0),
+            project_data.get("sprint_started_at") or 0.0,
+            strings.json_id(project_data.get("sprint_history"))
+        ))
+        entry = {field: project_data.get(field) for field in PROJECT_FIELDS}
+        entry["backlog_count"] = len(backlog)
+        entry["sprint_count"] = len(sprint_tasks)
+        entry["version"] = project_data.get("version", 0)
+        entry["record"] = position
+        entries.append(entry)
+
+    encoded = [value.encode("utf-8") for value in strings.values]
+    offsets_position = HEADER.size
+    data_position = offsets_position + OFFSET.size * (len(encoded) + 1)
+    data_size = sum(len(value) for value in encoded)
+    projects_position = data_position + data_size
+    tasks_position = projects_position + PROJECT.size * len(project_records)
+
+    temp_name = file_name + ".tmp"
+    with open(temp_name, 'wb') as file:
+        file.write(HEADER.pack(
+            MAGIC, VERSION, 0, len(project_records), len(task_records), len(encoded), journal_seq,
+            offsets_position, data_position, projects_position, tasks_position
+        ))
+        offset = 0
+        offsets = bytearray()
+        for value in encoded:
+            offsets += OFFSET.pack(offset)
+            offset += len(value)
+        offsets += OFFSET.pack(offset)
+        file.write(offsets)
+        file.write(b"".join(encoded))
+        file.write(b"".join(PROJECT.pack(*record) for record in project_records))
+        file.write(b"".join(TASK.pack(*record) for record in task_records))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_name, file_name)
+    return entries
+
+
+class BinarySnapshot:
+    # Mapeado só para leitura; cada registro é decodificado quando é acessado
+    def __init__(self, file_name):
+        with open(file_name, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, self.project_count, self.task_count, self.string_count, self.journal_seq,
+         self.offsets_position, self.data_position, self.projects_position, self.tasks_position) = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version not in PROJECTS:
+            self.map.close()
+            raise ValueError(f"{file_name} não é um snapshot binário válido (versão {version})")
+        self.project_struct = PROJECTS[version]
+        self.task_struct = TASKS[version]
+        self.project_padding = padding(self.project_struct, PROJECT, PROJECT_DEFAULTS)
+        self.task_padding = padding(self.task_struct, TASK, TASK_DEFAULTS)
+        # Responsáveis e status se repetem muito: guarda os já decodificados
+        self.cache = {}
+
+    def string(self, string_id):
+        start = OFFSET.unpack_from(self.map, self.offsets_position + OFFSET.size * string_id)[0]
+        end = OFFSET.unpack_from(self.map, self.offsets_position + OFFSET.size * (string_id + 1))[0]
+        return self.map[self.data_position + start:self.data_position + end].decode("utf-8")
+
+    def cached_string(self, string_id):
+        value = self.cache.get(string_id)
+        if value is None:
+            value = self.cache[string_id] = self.string(string_id)
+        return value
+
+    def project_record(self, position):
+        record = self.project_struct.unpack_from(self.map, self.projects_position + self.project_struct.size * position)
+        return record + self.project_padding
+
+    def json_string(self, string_id, default):
+        return default if string_id == NO_STRING else json.loads(self.string(string_id))
+
+    def project(self, position):
+        (name, scrum_master, planning, daily, duration, _, backlog_count, _, sprint_count, version,
+         sprint_started_at, sprint_history) = self.project_record(position)
+        return {
+            "project_name": self.string(name),
+            "scrum_master": self.string(scrum_master),
+            "sprint_planning_date": date.fromordinal(planning).isoformat() if planning else None,
+            "daily_scrum_time": f"{daily // 60:02d}:{daily % 60:02d}" if daily >= 0 else None,
+            "sprint_duration": duration,
+            "sprint_started_at": sprint_started_at or None,
+            "sprint_history": self.json_string(sprint_history, []),
+            "backlog_count": backlog_count,
+            "sprint_count": sprint_count,
+            "version": version,
+            "record": position
+        }
+
+    def tasks(self, start, count):
+        task_struct = self.task_struct
+        begin = self.tasks_position + task_struct.size * start
+        records = task_struct.iter_unpack(self.map[begin:begin + task_struct.size * count])
+        if self.task_padding:
+            records = (record + self.task_padding for record in records)
+        tasks = []
+        for title, description, assigned_to, status, story_points, priority, events in records:
+            task = {
+                "title": self.string(title),
+                "description": self.string(description),
+                "assigned_to": self.cached_string(assigned_to),
+                "status": self.cached_string(status),
+                "story_points": story_points,
+                "priority": priority
+            }
+            if events != NO_STRING:
+                task["events"] = json.loads(self.string(events))
+            tasks.append(task)
+        return tasks
+
+    def close(self):
+        self.map.close()
+
+
+class BinaryJournal(ProjectJournal):
+    # Mesmo journal de alterações, mas com o snapshot no formato binário
+    def open_snapshot(self):
+        if self.snapshot_map is not None:
+            self.snapshot_map.close()
+            self.snapshot_map = None
+        if os.path.exists(self.file_name) and os.path.getsize(self.file_name):
+            self.snapshot_map = BinarySnapshot(self.file_name)
+
+    def read_state(self):
+        self.open_snapshot()
+        if self.snapshot_map is None:
+            return [], 0, False
+        snapshot = self.snapshot_map
+        return [snapshot.project(position) for position in range(snapshot.project_count)], snapshot.journal_seq, False
+
+    def hydrate(self, entry):
+        record = self.snapshot_map.project_record(entry["record"])
+        project_data = {field: entry[field] for field in PROJECT_FIELDS}
+        project_data["version"] = entry.get("version", 0)
+        project_data["product_backlog"] = self.snapshot_map.tasks(record[5], record[6])
+        project_data["sprint_tasks"] = self.snapshot_map.tasks(record[7], record[8])
+        return project_data
+
+    def write_snapshot(self, projects):
+        return write_binary(self.file_name, projects, self.seq, self.hydrate)
+
+
+def check_no_pending_journal(file_name):
+    # Um journal pendente pertence ao arquivo antigo e seria reaplicado sobre o convertido
+    journal_name = file_name + ".journal"
+    if os.path.exists(journal_name) and os.path.getsize(journal_name):
+        raise ValueError(f"{journal_name} tem alterações pendentes; remova-o ou abra {file_name} no app antes de converter")
+
+
+def json_to_binary(json_file, binary_file):
+    check_no_pending_journal(binary_file)
+    journal = ProjectJournal(json_file)
+    try:
+        projects = journal.load_all()
+    finally:
+        journal.close()
+    write_binary(binary_file, projects, 0, None)
+    return len(projects)
+
+
+def binary_to_json(binary_file, json_file):
+    check_no_pending_journal(json_file)
+    journal = BinaryJournal(binary_file)
+    try:
+        projects = journal.load_all()
+    finally:
+        journal.close()
+    write_snapshot(json_file, projects, 0, None)
+    return len(projects)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] not in ("to-binary", "to-json"):
+        print("Uso: python binarySnapshot.py to-binary projects_data.json projects_data.bin")
+        print("     python binarySnapshot.py to-json projects_data.bin projects_data.json")
+        sys.exit(1)
+    if sys.argv[1] == "to-binary":
+        count = json_to_binary(sys.argv[2], sys.argv[3])
+    else:
+        count = binary_to_json(sys.argv[2], sys.argv[3])
+    print(f"{count} projetos convertidos para {sys.argv[3]}.")
@@ -0,0 +1,126 @@
+import csv
+import json
+import os
+from modelCodec import encode_task_lines
+from taskStore import STATUSES, parse_estimate
+
+TASK_FIELDS = ("title", "description", "assigned_to", "status", "story_points", "priority")
+REQUIRED_FIELDS = ("title", "description", "assigned_to")
+MAX_REPORTED_ERRORS = 1000
+# Status aceitos na importação: os nomes canônicos, sem diferenciar maiúsculas
+STATUS_NAMES = {status.lower(): status for status in STATUSES}
+
+
+class ImportReport:
+    def __init__(self):
+        self.imported = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+    def summary(self):
+        text = f"{self.imported} tarefas importadas, {self.error_count} linhas com erro."
+        for line, message in self.errors[:20]:
+            text += f"\nLinha {line}: {message}"
+        if self.error_count > 20:
+            text += f"\n... e mais {self.error_count - 20} erros."
+        return text
+
+
+def file_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Formato de arquivo não suportado: {extension or path}")
+
+
+def read_rows(path):
+    # Lê uma linha por vez; erros de parse viram um ValueError no lugar da linha
+    if file_format(path) == "csv":
+        with open(path, 'r', newline='', encoding='utf-8-sig') as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row
+    else:
+        with open(path, 'r', encoding='utf-8') as file:
+            for line_number, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except ValueError as error:
+                    yield line_number, ValueError(f"JSON inválido: {error}")
+
+
+def validate_row(row):
+    if isinstance(row, ValueError):
+        raise row
+    if not isinstance(row, dict):
+        raise ValueError("a linha deve ser um objeto com title, description e assigned_to")
+
+    task = {}
+    for field in REQUIRED_FIELDS:
+        value = row.get(field)
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"campo obrigatório '{field}' vazio")
+        task[field] = value.strip()
+    status = row.get("status")
+    if status is None or (isinstance(status, str) and not status.strip()):
+        task["status"] = "To Do"
+    elif isinstance(status, str) and status.strip().lower() in STATUS_NAMES:
+        task["status"] = STATUS_NAMES[status.strip().lower()]
+    else:
+        raise ValueError(f"status inválido '{status}' (use {', '.join(STATUSES)})")
+    task["story_points"], task["priority"] = parse_estimate(row.get("story_points"), row.get("priority"))
+    return task
+
+
+def import_tasks(project, path, commit_batch, batch_size=1000):
+    # commit_batch(project_name, tasks) é chamado uma vez por lote já validado
+    report = ImportReport()
+    batch = []
+
+    def flush():
+        for task in batch:
+            project.add_task_to_backlog(
+                task["title"], task["description"], task["assigned_to"], task["story_points"], task["priority"], task["status"]
+            )
+        commit_batch(project.project_name, list(batch))
+        report.imported += len(batch)
+        batch.clear()
+
+    for line, row in read_rows(path):
+        try:
+            batch.append(validate_row(row))
+        except ValueError as error:
+            report.add_error(line, str(error))
+            continue
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return report
+
+
+def export_tasks(tasks, path):
+    count = 0
+    if file_format(path) == "csv":
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            # Os eventos de status ficam só no JSONL; o CSV leva os campos editáveis
+            writer = csv.DictWriter(file, fieldnames=TASK_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for task in tasks:
+                writer.writerow(task.to_dict())
+                count += 1
+    else:
+        with open(path, 'w', encoding='utf-8') as file:
+            for line in encode_task_lines(tasks):
+                file.write(line + "\n")
+                count += 1
+    return count
@@ -0,0 +1,201 @@
+import argparse
+import os
+import sys
+import instrumentation
+from scrumModel import DATA_FILE, current_timestamp, load_projects
+from sprintPlanner import DEFAULT_DAILY_CAPACITY
+from storage import open_storage
+from taskStore import parse_estimate
+
+# Entrada de linha de comando: não importa tkinter nem customtkinter, então roda
+# em cron/servidores sem display.
+
+
+def find_project(projects, name):
+    for project in reversed(projects):
+        if project.project_name == name:
+            return project
+    raise SystemExit(f"Projeto '{name}' não encontrado.")
+
+
+def list_projects(storage, projects, args):
+    for project in projects:
+        print(f"{project.project_name}\tScrum Master: {project.scrum_master}\tBacklog: {project.backlog_count}\tSprint: {project.sprint_count}")
+
+
+def add_task(storage, projects, args):
+    project = find_project(projects, args.project)
+    # Como na interface gráfica: campos vazios (ou só com espaços) não viram tarefa
+    title, description, assigned_to = (value.strip() for value in (args.title, args.description, args.assigned_to))
+    if not (title and description and assigned_to):
+        raise SystemExit("Por favor, preencha todos os campos.")
+    try:
+        story_points, priority = parse_estimate(args.points, args.priority)
+    except ValueError as error:
+        raise SystemExit(str(error))
+    task = project.add_task_to_backlog(title, description, assigned_to, story_points, priority)
+    storage.add_task(project.project_name, task.to_dict())
+    print(f"Tarefa '{title}' adicionada ao backlog de {project.project_name}.")
+
+
+def parse_capacities(values):
+    capacities = {}
+    for value in values or ():
+        name, _, points = value.rpartition("=")
+        try:
+            per_day = float(points)
+        except ValueError:
+            per_day = -1
+        if not name or per_day < 0:
+            raise SystemExit(f"Capacidade inválida: '{value}' (use NOME=PONTOS_POR_DIA)")
+        capacities[name] = per_day
+    return capacities
+
+
+def sprint_plan(project, args):
+    if args.capacity < 0:
+        raise SystemExit("A capacidade não pode ser negativa.")
+    return project.plan_sprint(args.capacity, parse_capacities(args.capacity_of))
+
+
+def plan(storage, projects, args):
+    print(sprint_plan(find_project(projects, args.project), args).summary())
+
+
+def start_sprint(storage, projects, args):
+    project = find_project(projects, args.project)
+    error = project.sprint_start_error()
+    if error:
+        raise SystemExit(error)
+    sprint = sprint_plan(project, args)
+    print(project.start_sprint(sprint))
+    storage.start_sprint(project.project_name, sprint.rows, project.sprint_started_at)
+
+
+def set_status(storage, projects, args):
+    project = find_project(projects, args.project)
+    in_sprint = not args.backlog
+    timestamp = current_timestamp()
+    try:
+        message = project.set_task_status(in_sprint, args.number - 1, args.status, timestamp)
+    except ValueError as error:
+        raise SystemExit(str(error))
+    storage.set_task_status(project.project_name, in_sprint, args.number - 1, args.status, timestamp)
+    print(message)
+
+
+def dashboard(storage, projects, args):
+    from sprintAnalytics import Analytics, format_dashboard
+    analytics = Analytics(storage.file_name + ".stats")
+    analytics.track(projects, storage.versions)
+    print(format_dashboard(analytics.dashboard(), args.limit))
+    analytics.save(storage.versions, storage.poll_changes()[0])
+
+
+def print_tasks(storage, projects, args):
+    project = find_project(projects, args.project)
+    rows = project.sprint_page(args.offset, args.limit) if args.sprint else project.backlog_page(args.offset, args.limit)
+    empty = True
+    for number, task in rows:
+        print(f"{number}. {task}")
+        empty = False
+    if empty:
+        print("Não há tarefas na Sprint." if args.sprint else "Não há tarefas no backlog.")
+
+
+def import_file(storage, projects, args):
+    from bulkIO import import_tasks
+    project = find_project(projects, args.project)
+    report = import_tasks(project, args.file, storage.add_tasks, args.batch_size)
+    print(report.summary())
+
+
+def export_file(storage, projects, args):
+    from bulkIO import export_tasks
+    project = find_project(projects, args.project)
+    tasks = project.sprint_tasks if args.sprint else project.product_backlog
+    print(f"{export_tasks(tasks, args.file)} tarefas exportadas para {args.file}.")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Gerenciador de Projetos Scrum (sem interface gráfica)")
+    parser.add_argument("--data", default=DATA_FILE, help=f"arquivo de dados (padrão: {DATA_FILE})")
+    parser.add_argument("--instrument", action="store_true",
+                        help="mede o tempo das operações e grava em SCRUM_INSTRUMENT_FILE (o mesmo que SCRUM_INSTRUMENT=1)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("listar", help="lista os projetos")
+    command.set_defaults(handler=list_projects)
+
+    command = commands.add_parser("adicionar-tarefa", help="adiciona uma tarefa ao backlog")
+    command.add_argument("project")
+    command.add_argument("title")
+    command.add_argument("description")
+    command.add_argument("assigned_to")
+    command.add_argument("--pontos", dest="points", help="story points (padrão: 1)")
+    command.add_argument("--prioridade", dest="priority", help="1 (mais urgente) a 5 (padrão: 3)")
+    command.set_defaults(handler=add_task)
+
+    for name, handler, help_text in (
+        ("planejar-sprint", plan, "mostra as tarefas do backlog que cabem na próxima sprint"),
+        ("iniciar-sprint", start_sprint, "move para a sprint as tarefas planejadas")
+    ):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("project")
+        command.add_argument("--capacidade", dest="capacity", type=float, default=DEFAULT_DAILY_CAPACITY,
+                             help=f"pontos por dia de cada responsável (padrão: {DEFAULT_DAILY_CAPACITY:g})")
+        command.add_argument("--capacidade-de", dest="capacity_of", action="append", metavar="NOME=PONTOS",
+                             help="pontos por dia de um responsável específico (pode repetir)")
+        command.set_defaults(handler=handler)
+
+    command = commands.add_parser("status", help="altera o status de uma tarefa da sprint (ou do backlog, com --backlog)")
+    command.add_argument("project")
+    command.add_argument("number", type=int, help="número da tarefa, como em 'backlog'")
+    command.add_argument("status", help="To Do, In Progress ou Done")
+    command.add_argument("--backlog", action="store_true")
+    command.set_defaults(handler=set_status)
+
+    command = commands.add_parser("indicadores", help="burndown, velocidade e tarefas abertas de todos os projetos")
+    command.add_argument("--limit", type=int, default=20, help="responsáveis mostrados (padrão: 20)")
+    command.set_defaults(handler=dashboard)
+
+    command = commands.add_parser("backlog", help="mostra o backlog (ou a sprint, com --sprint)")
+    command.add_argument("project")
+    command.add_argument("--sprint", action="store_true")
+    command.add_argument("--offset", type=int, default=0)
+    command.add_argument("--limit", type=int, default=None)
+    command.set_defaults(handler=print_tasks)
+
+    command = commands.add_parser("importar", help="importa tarefas de um arquivo CSV/JSONL")
+    command.add_argument("project")
+    command.add_argument("file")
+    command.add_argument("--batch-size", type=int, default=1000)
+    command.set_defaults(handler=import_file)
+
+    command = commands.add_parser("exportar", help="exporta o backlog (ou a sprint) para CSV/JSONL")
+    command.add_argument("project")
+    command.add_argument("file")
+    command.add_argument("--sprint", action="store_true")
+    command.set_defaults(handler=export_file)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.instrument:
+        instrumentation.enable()
+    storage = open_storage(args.data)
+    try:
+        projects = load_projects(storage)
+        args.handler(storage, projects, args)
+        # Outra instância pode ter gravado a mesma operação entre a leitura e a gravação
+        for conflict in storage.poll_changes()[1]:
+            print(conflict, file=sys.stderr)
+    finally:
+        storage.close()
+        if instrumentation.ENABLED and os.environ.get("SCRUM_INSTRUMENT_FILE"):
+            instrumentation.dump_json(os.environ["SCRUM_INSTRUMENT_FILE"])
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
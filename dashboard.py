@@ -0,0 +1,133 @@
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk
+from sprintAnalytics import np
+
+ASSIGNEE_COLUMNS = (
+    ("assigned_to", "Responsável", 160),
+    ("open_tasks", "Abertas", 70)
+)
+PROJECT_COLUMNS = (
+    ("project_name", "Projeto", 180),
+    ("sprint", "Sprint (feito/plan.)", 120),
+    ("remaining", "Restante", 70),
+    ("velocity", "Velocidade média", 110),
+    ("open_tasks", "Abertas", 70)
+)
+CHART_HEIGHT = 220
+CHART_MARGIN = 30
+
+
+def scale(values, low, high, size):
+    # Posições no canvas; com NumPy as séries são escaladas de uma vez
+    span = (high - low) or 1
+    if np is not None:
+        return ((np.asarray(values, dtype=np.float64) - low) / span * size).tolist()
+    return [(value - low) / span * size for value in values]
+
+
+def build_tree(master, columns, height):
+    tree = ttk.Treeview(master, columns=[column for column, _, _ in columns], show="headings", height=height)
+    for column, heading, width in columns:
+        tree.heading(column, text=heading)
+        tree.column(column, width=width, stretch=column == columns[0][0])
+    return tree
+
+
+class DashboardWindow:
+    # Painel do portfólio: só lê os indicadores já materializados em Analytics
+    def __init__(self, master, analytics):
+        self.analytics = analytics
+        self.window = tk.Toplevel(master)
+        self.window.title("Indicadores")
+        self.window.geometry("900x620")
+
+        tables = tk.Frame(self.window)
+        tables.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.assignee_tree = build_tree(tables, ASSIGNEE_COLUMNS, 12)
+        self.assignee_tree.pack(side=tk.LEFT, fill=tk.Y)
+        self.project_tree = build_tree(tables, PROJECT_COLUMNS, 12)
+        self.project_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(10, 0))
+        self.project_tree.bind("<<TreeviewSelect>>", lambda event: self.draw_selected())
+
+        self.chart_label = tk.Label(self.window, text="Selecione um projeto para ver o burndown e a velocidade.", anchor="w")
+        self.chart_label.pack(fill=tk.X, padx=10)
+        self.canvas = tk.Canvas(self.window, height=CHART_HEIGHT, bg="white")
+        self.canvas.pack(fill=tk.X, padx=10, pady=(0, 5))
+        self.canvas.bind("<Configure>", lambda event: self.draw_selected())
+
+        tk.Button(self.window, text="Atualizar", command=self.refresh, bg="#2196F3", fg="white").pack(pady=5)
+        self.refresh()
+
+    def refresh(self):
+        data = self.analytics.dashboard()
+        self.assignee_tree.delete(*self.assignee_tree.get_children())
+        for item in data["open_by_assignee"]:
+            self.assignee_tree.insert("", tk.END, values=(item["assigned_to"], item["open_tasks"]))
+
+        self.project_tree.delete(*self.project_tree.get_children())
+        self.rows = {}
+        for position, row in enumerate(data["projects"]):
+            average = f"{row['average_velocity']:.1f}" if row["average_velocity"] is not None else "-"
+            item = self.project_tree.insert("", tk.END, values=(
+                row["project_name"], f"{row['done_points']}/{row['sprint_points']}", row["remaining_points"], average, row["open_tasks"]
+            ))
+            self.rows[item] = position
+        self.draw_selected()
+
+    def draw_selected(self):
+        self.canvas.delete("all")
+        selection = self.project_tree.selection()
+        if not selection or selection[0] not in self.rows:
+            return
+        project = self.analytics.projects[self.rows[selection[0]]]
+        stats = self.analytics.ensure(project)
+        width = max(self.canvas.winfo_width(), 200)
+        chart_width = (width - 3 * CHART_MARGIN) * 2 // 3
+        self.draw_burndown(stats, project.sprint_duration, CHART_MARGIN, chart_width)
+        self.draw_velocity(stats, 2 * CHART_MARGIN + chart_width, width - 3 * CHART_MARGIN - chart_width)
+        started = datetime.fromtimestamp(stats.sprint_started_at).strftime("%Y-%m-%d %H:%M") if stats.sprint_started_at else "-"
+        self.chart_label.configure(text=f"{project.project_name}: sprint iniciada em {started}, "
+                                        f"{stats.sprint_points - stats.done_points} de {stats.sprint_points} pontos restantes")
+
+    def draw_burndown(self, stats, sprint_duration, left, width):
+        times, remaining = stats.burndown_series()
+        height = CHART_HEIGHT - 2 * CHART_MARGIN
+        bottom = CHART_HEIGHT - CHART_MARGIN
+        self.canvas.create_text(left, 10, text="Burndown (pontos restantes)", anchor="nw")
+        self.canvas.create_line(left, bottom, left + width, bottom)
+        if not len(times):
+            return
+        start = times[0]
+        end = max(times[-1], start + (sprint_duration or 1) * 86400)
+        top = max(stats.sprint_points, max(remaining), 1)
+        xs = scale(times, start, end, width)
+        ys = scale(remaining, 0, top, height)
+        # Linha ideal: de todos os pontos no início a zero no fim da sprint
+        self.canvas.create_line(left, bottom - ys[0], left + scale([start + (sprint_duration or 1) * 86400], start, end, width)[0], bottom, fill="#BBBBBB", dash=(4, 2))
+        points = []
+        for position, (x, y) in enumerate(zip(xs, ys)):
+            # Degraus: o restante só muda quando uma tarefa é concluída ou reaberta
+            if position:
+                points += [left + x, points[-1]]
+            points += [left + x, bottom - y]
+        if len(points) >= 4:
+            self.canvas.create_line(*points, fill="#2196F3", width=2)
+        else:
+            self.canvas.create_oval(left + xs[0] - 2, bottom - ys[0] - 2, left + xs[0] + 2, bottom - ys[0] + 2, fill="#2196F3")
+
+    def draw_velocity(self, stats, left, width):
+        velocity = stats.velocity_series()
+        height = CHART_HEIGHT - 2 * CHART_MARGIN
+        bottom = CHART_HEIGHT - CHART_MARGIN
+        self.canvas.create_text(left, 10, text="Velocidade (pontos por sprint)", anchor="nw")
+        self.canvas.create_line(left, bottom, left + width, bottom)
+        # Só as últimas sprints que cabem no gráfico, mesmo com anos de histórico
+        recent = velocity[-max(1, width // 12):]
+        if not len(recent):
+            return
+        bar = width / len(recent)
+        heights = scale(recent, 0, max(max(recent), 1), height)
+        for position, bar_height in enumerate(heights):
+            x = left + position * bar
+            self.canvas.create_rectangle(x + 1, bottom - bar_height, x + bar - 1, bottom, fill="#4CAF50", outline="")
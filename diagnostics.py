@@ -0,0 +1,76 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+import instrumentation
+
+COLUMNS = (
+    ("name", "Operação", 220),
+    ("count", "Chamadas", 70),
+    ("mean_ms", "Média (ms)", 80),
+    ("p50_ms", "p50 (ms)", 70),
+    ("p95_ms", "p95 (ms)", 70),
+    ("max_ms", "Máx (ms)", 80)
+)
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+class DiagnosticsWindow:
+    def __init__(self, master):
+        self.master = master
+        self.window = tk.Toplevel(master)
+        self.window.title("Diagnóstico")
+        self.window.geometry("640x480")
+
+        self.tree = ttk.Treeview(self.window, columns=[column for column, _, _ in COLUMNS], show="headings", height=10)
+        for column, heading, width in COLUMNS:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, stretch=column == "name")
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        self.counters_label = tk.Label(self.window, justify=tk.LEFT, anchor="w")
+        self.counters_label.pack(fill=tk.X, padx=10)
+
+        button_frame = tk.Frame(self.window)
+        button_frame.pack(pady=5)
+        tk.Button(button_frame, text="Atualizar", command=self.refresh, bg="#2196F3", fg="white").pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="Exportar JSON", command=self.export_json, bg="#4CAF50", fg="white").pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="Perfilar Próxima Ação", command=self.arm_profile, bg="#FF9800", fg="white").pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="Salvar Perfil", command=self.save_profile, bg="#FF9800", fg="white").pack(side=tk.LEFT, padx=5)
+
+        self.profile_text = tk.Text(self.window, height=10, font=("Courier", 9))
+        self.profile_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+        self.refresh()
+
+    def refresh(self):
+        instrumentation.set_value("widgets", count_widgets(self.master))
+        data = instrumentation.snapshot()
+
+        self.tree.delete(*self.tree.get_children())
+        for name, metric in data["metrics"].items():
+            self.tree.insert("", tk.END, values=(name, metric["count"], metric["mean_ms"], metric["p50_ms"], metric["p95_ms"], metric["max_ms"]))
+        self.counters_label.configure(text="\n".join(f"{name}: {value}" for name, value in data["counters"].items()))
+
+        self.profile_text.delete("1.0", tk.END)
+        if instrumentation.last_profile is not None:
+            self.profile_text.insert(tk.END, f"Ação: {instrumentation.last_profile['action']}\n")
+            self.profile_text.insert(tk.END, instrumentation.last_profile["text"])
+
+    def export_json(self):
+        path = filedialog.asksaveasfilename(title="Exportar Diagnóstico", defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if path:
+            instrumentation.dump_json(path)
+
+    def arm_profile(self):
+        instrumentation.arm_profile()
+        messagebox.showinfo("Diagnóstico", "A próxima ação da interface será perfilada com cProfile.")
+
+    def save_profile(self):
+        if instrumentation.last_profile is None:
+            messagebox.showwarning("Diagnóstico", "Nenhuma ação foi perfilada ainda.")
+            return
+        path = filedialog.asksaveasfilename(title="Salvar Perfil", defaultextension=".prof", filetypes=[("cProfile", "*.prof")])
+        if path:
+            instrumentation.save_profile(path)
@@ -0,0 +1,69 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    # Lock consultivo entre processos, num arquivo ao lado dos dados. Dentro do processo
+    # é reentrante e serializa as threads; entre processos, leituras podem compartilhar
+    # o lock e escritas são exclusivas (no Windows, todo lock é exclusivo).
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self.file = None
+        self.thread_lock = threading.RLock()
+        self.depth = 0
+
+    def acquire(self, exclusive):
+        if self.file is None:
+            self.file = open(self.file_name, 'a+b')
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            return
+        self.file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_NBLCK, 1)
+                return
+            except OSError:
+                time.sleep(0.01)
+
+    def release(self):
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        else:
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    @contextmanager
+    def hold(self, exclusive):
+        # Chamadas aninhadas mantêm o modo do lock mais externo: quem vai escrever
+        # precisa pedir o exclusivo logo na primeira chamada.
+        with self.thread_lock:
+            if self.depth == 0:
+                self.acquire(exclusive)
+            self.depth += 1
+            try:
+                yield
+            finally:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.release()
+
+    def shared(self):
+        return self.hold(False)
+
+    def exclusive(self):
+        return self.hold(True)
+
+    def close(self):
+        with self.thread_lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
@@ -0,0 +1,230 @@
+import os
+from array import array
+from collections import deque
+from sprintPlanner import SprintPlan
+from instrumentation import timed
+import instrumentation
+
+# Desfazer/refazer das alterações do ScrumApp. Cada Change é criada logo antes da alteração e
+# guarda só o que ela troca: o resto do estado continua compartilhado com o modelo, então cada
+# passo custa o tamanho da alteração, não o do projeto. Iniciar uma sprint, por exemplo, guarda
+# as linhas escolhidas e a sprint anterior (que sairia da memória), nunca uma cópia do backlog.
+# undo/redo alteram o modelo e devolvem as operações de storage que levam o disco junto.
+
+# Orçamento de memória do histórico; acima dele os estados mais antigos são descartados
+HISTORY_BUDGET = int(os.environ.get("SCRUM_HISTORY_BUDGET", 64 * 1024 * 1024))
+# Custo fixo estimado de uma Change (objeto, referências, entrada na pilha)
+CHANGE_BYTES = 256
+
+
+def sprint_info_args(project):
+    return (
+        project.project_name,
+        project.sprint_planning_date.strftime("%Y-%m-%d") if project.sprint_planning_date else None,
+        project.daily_scrum_time.strftime("%H:%M") if project.daily_scrum_time else None,
+        project.sprint_duration
+    )
+
+
+class Change:
+    label = ""
+
+    def __init__(self, project):
+        self.project = project
+
+    def size(self):
+        return CHANGE_BYTES
+
+
+class AddProject(Change):
+    label = "Adicionar Projeto"
+
+    def __init__(self, projects, project):
+        super().__init__(project)
+        self.projects = projects
+        self.removed = False
+
+    def size(self):
+        # Depois de desfeito, o projeto só existe aqui
+        if not self.removed:
+            return CHANGE_BYTES
+        return CHANGE_BYTES + self.project.product_backlog.nbytes() + self.project.sprint_tasks.nbytes()
+
+    def undo(self):
+        self.projects.remove(self.project)
+        self.removed = True
+        return [("remove_project", (self.project.project_name,))]
+
+    def redo(self):
+        self.projects.append(self.project)
+        self.removed = False
+        return [("add_project", (self.project.to_dict(),))]
+
+
+class AddTasks(Change):
+    # Tarefas acrescentadas ao fim do backlog (uma tarefa ou uma importação inteira)
+    def __init__(self, project, label="Adicionar Tarefa"):
+        super().__init__(project)
+        self.label = label
+        self.length = len(project.product_backlog)
+        self.removed = None
+
+    def count(self):
+        if self.removed is not None:
+            return len(self.removed)
+        return len(self.project.product_backlog) - self.length
+
+    def size(self):
+        return CHANGE_BYTES + (self.removed.nbytes() if self.removed is not None else 0)
+
+    def undo(self):
+        count = self.count()
+        self.removed = self.project.remove_last_tasks(count)
+        return [("remove_tasks", (self.project.project_name, count))]
+
+    def redo(self):
+        self.project.restore_tasks(self.removed)
+        tasks = self.removed.to_dicts()
+        self.removed = None
+        return [("add_tasks", (self.project.project_name, tasks))]
+
+
+class SetTaskStatus(Change):
+    label = "Alterar Status"
+
+    def __init__(self, project, in_sprint, row):
+        super().__init__(project)
+        self.in_sprint = in_sprint
+        self.row = row
+        self.status = self.task().status
+        self.timestamp = None
+
+    def task(self):
+        return (self.project.sprint_tasks if self.in_sprint else self.project.product_backlog)[self.row]
+
+    def undo(self):
+        # Troca o status guardado pelo atual; o evento da mudança guarda o timestamp para o refazer
+        task = self.task()
+        previous, self.status, self.timestamp = self.status, task.status, task.events[-1][0]
+        self.project.revert_task_status(self.in_sprint, self.row, previous)
+        return [("revert_task_status", (self.project.project_name, self.in_sprint, self.row, previous))]
+
+    def redo(self):
+        status, self.status = self.status, self.task().status
+        self.project.set_task_status(self.in_sprint, self.row, status, self.timestamp)
+        return [("set_task_status", (self.project.project_name, self.in_sprint, self.row, status, self.timestamp))]
+
+
+class SetSprintInfo(Change):
+    label = "Definir Informações da Sprint"
+
+    def __init__(self, project):
+        super().__init__(project)
+        self.values = (project.sprint_planning_date, project.daily_scrum_time, project.sprint_duration)
+
+    def swap(self):
+        project = self.project
+        current = (project.sprint_planning_date, project.daily_scrum_time, project.sprint_duration)
+        project.sprint_planning_date, project.daily_scrum_time, project.sprint_duration = self.values
+        self.values = current
+        return [("set_sprint_info", sprint_info_args(project))]
+
+    undo = swap
+    redo = swap
+
+
+class StartSprint(Change):
+    label = "Iniciar Sprint"
+
+    def __init__(self, project, plan):
+        super().__init__(project)
+        self.rows = array("I", plan.rows)
+        self.plan = (plan.days, plan.capacities, plan.loads)
+        # A sprint que está terminando: start_sprint a descarta, o histórico a mantém viva
+        self.sprint_tasks = project.sprint_tasks
+        self.started_at = project.sprint_started_at
+        self.timestamp = None
+
+    def size(self):
+        size = CHANGE_BYTES + self.rows.itemsize * len(self.rows)
+        return size + (self.sprint_tasks.nbytes() if self.sprint_tasks is not None else 0)
+
+    def undo(self):
+        project = self.project
+        self.timestamp = project.sprint_started_at
+        project.undo_start_sprint(self.rows, self.sprint_tasks, self.started_at)
+        operations = [("restore_sprint", (project.project_name, self.rows.tolist(), self.sprint_tasks.to_dicts(), self.started_at))]
+        self.sprint_tasks = None
+        return operations
+
+    def redo(self):
+        project = self.project
+        self.sprint_tasks = project.sprint_tasks
+        project.start_sprint(SprintPlan(project.product_backlog, self.rows.tolist(), *self.plan), self.timestamp)
+        return [("start_sprint", (project.project_name, self.rows.tolist(), self.timestamp))]
+
+
+class History:
+    def __init__(self, budget=HISTORY_BUDGET):
+        self.budget = budget
+        # (Change, tamanho quando entrou na pilha); o fim de cada deque é o próximo a sair
+        self.undo_stack = deque()
+        self.redo_stack = deque()
+        self.used = 0
+
+    def push(self, stack, change):
+        size = change.size()
+        stack.append((change, size))
+        self.used += size
+        self.evict()
+
+    def pop(self, stack):
+        change, size = stack.pop()
+        self.used -= size
+        return change
+
+    def evict(self):
+        # Primeiro os estados mais antigos; se só sobrou o refazer, o mais distante do atual
+        while self.used > self.budget and (self.undo_stack or self.redo_stack):
+            stack = self.undo_stack or self.redo_stack
+            self.used -= stack.popleft()[1]
+            instrumentation.add("history_evictions")
+        instrumentation.set_value("history_bytes", self.used)
+
+    def record(self, change):
+        self.used -= sum(size for _, size in self.redo_stack)
+        self.redo_stack.clear()
+        self.push(self.undo_stack, change)
+
+    @timed("History.undo")
+    def undo(self):
+        if not self.undo_stack:
+            return None
+        change = self.pop(self.undo_stack)
+        operations = change.undo()
+        self.push(self.redo_stack, change)
+        return change, operations
+
+    @timed("History.redo")
+    def redo(self):
+        if not self.redo_stack:
+            return None
+        change = self.pop(self.redo_stack)
+        operations = change.redo()
+        self.push(self.undo_stack, change)
+        return change, operations
+
+    def forget(self, project):
+        # O projeto foi relido do disco (alterado por outra instância): seus passos não valem mais
+        for stack in (self.undo_stack, self.redo_stack):
+            kept = [(change, size) for change, size in stack if change.project is not project]
+            stack.clear()
+            stack.extend(kept)
+        self.used = sum(size for stack in (self.undo_stack, self.redo_stack) for _, size in stack)
+        instrumentation.set_value("history_bytes", self.used)
+
+    def undo_label(self):
+        return self.undo_stack[-1][0].label if self.undo_stack else None
+
+    def redo_label(self):
+        return self.redo_stack[-1][0].label if self.redo_stack else None
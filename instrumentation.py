@@ -0,0 +1,141 @@
+import functools
+import json
+import os
+import threading
+import time
+
+# Ativado com SCRUM_INSTRUMENT=1 ou, nas entradas (main.py, cli.py), com --instrument, que
+# chama enable(). Desligado, o custo de timed() é só a verificação de ENABLED por chamada.
+ENABLED = os.environ.get("SCRUM_INSTRUMENT") == "1"
+
+BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000, float("inf"))
+
+lock = threading.Lock()
+metrics = {}
+counters = {}
+profile_armed = False
+last_profile = None
+
+
+class Metric:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * len(BUCKETS_MS)
+
+    def add(self, seconds):
+        milliseconds = seconds * 1000
+        self.count += 1
+        self.total += milliseconds
+        self.max = max(self.max, milliseconds)
+        for position, limit in enumerate(BUCKETS_MS):
+            if milliseconds <= limit:
+                self.histogram[position] += 1
+                break
+
+    def percentile(self, fraction):
+        # Aproximado pelo limite superior do bucket
+        target = fraction * self.count
+        seen = 0
+        for position, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= target:
+                return min(BUCKETS_MS[position], self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max, 3),
+            "histogram": {
+                (f"<={limit}ms" if limit != float("inf") else f">{BUCKETS_MS[-2]}ms"): count
+                for limit, count in zip(BUCKETS_MS, self.histogram)
+            }
+        }
+
+
+def enable():
+    global ENABLED
+    ENABLED = True
+
+
+def record(name, seconds):
+    with lock:
+        metric = metrics.get(name)
+        if metric is None:
+            metric = metrics[name] = Metric()
+        metric.add(seconds)
+
+
+def add(counter, amount=1):
+    if ENABLED:
+        with lock:
+            counters[counter] = counters.get(counter, 0) + amount
+
+
+def set_value(counter, value):
+    if ENABLED:
+        with lock:
+            counters[counter] = value
+
+
+def arm_profile():
+    global profile_armed
+    profile_armed = True
+
+
+def run_profiled(name, function, args, kwargs):
+    global profile_armed, last_profile
+    import cProfile
+    import io
+    import pstats
+    profile_armed = False
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(function, *args, **kwargs)
+    finally:
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(30)
+        last_profile = {"action": name, "stats": profiler, "text": output.getvalue()}
+
+
+def timed(name):
+    def decorator(function):
+        # O decorador roda na importação, antes de enable(): a decisão fica para cada chamada
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                # O perfil só captura ações da interface, nunca a thread de gravação
+                if profile_armed and threading.current_thread() is threading.main_thread():
+                    return run_profiled(name, function, args, kwargs)
+                return function(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    with lock:
+        return {
+            "metrics": {name: metric.to_dict() for name, metric in sorted(metrics.items())},
+            "counters": dict(sorted(counters.items()))
+        }
+
+
+def dump_json(path):
+    with open(path, 'w') as file:
+        json.dump(snapshot(), file, indent=4)
+
+
+def save_profile(path):
+    if last_profile is not None:
+        last_profile["stats"].dump_stats(path)
@@ -0,0 +1,619 @@
+import json
+import mmap
+import os
+import threading
+import time
+from itertools import islice
+import instrumentation
+from fileLock import FileLock
+from instrumentation import timed
+from modelCodec import SCHEMA_VERSION, dumps, load_data, loads, normalize_task
+from taskStore import DEFAULT_STORY_POINTS, EVENT_SPRINT, EVENT_STATUS
+
+PROJECT_FIELDS = (
+    "project_name", "scrum_master", "sprint_planning_date", "daily_scrum_time", "sprint_duration",
+    "sprint_started_at", "sprint_history"
+)
+
+# Operações que não podem ser mescladas: se outra instância fez, no mesmo projeto, uma das
+# operações listadas e esta ainda não viu, a alteração local é descartada. As demais se somam
+# (tarefas) ou a última gravação vence (informações da sprint). Mudanças de status apontam
+# linhas do backlog/sprint, que deixam de valer quando outra instância inicia (ou desfaz) a sprint.
+# As operações de desfazer (remove_*, revert_*, restore_*) só valem sobre o estado que esta
+# instância conhece; remover as últimas tarefas, por exemplo, não pode levar as de outra instância.
+CONFLICTING_OPS = {
+    "add_project": ("add_project",),
+    "start_sprint": ("start_sprint", "restore_sprint", "remove_tasks"),
+    "set_task_status": ("start_sprint", "restore_sprint", "remove_tasks"),
+    "revert_task_status": ("start_sprint", "restore_sprint", "remove_tasks"),
+    "remove_project": ("add_task", "add_tasks", "start_sprint", "set_task_status", "set_sprint_info",
+                       "remove_tasks", "revert_task_status", "restore_sprint"),
+    "remove_tasks": ("add_task", "add_tasks", "start_sprint", "remove_tasks", "restore_sprint"),
+    "restore_sprint": ("start_sprint", "restore_sprint", "set_task_status", "revert_task_status", "remove_tasks")
+}
+CONFLICT_MESSAGES = {
+    "add_project": "O projeto '{}' já foi criado por outra instância; sua criação foi descartada.",
+    "start_sprint": "A Sprint do projeto '{}' já foi iniciada por outra instância; seu início foi descartado.",
+    "set_task_status": "A Sprint do projeto '{}' foi iniciada por outra instância; a mudança de status foi descartada.",
+    "revert_task_status": "A Sprint do projeto '{}' foi alterada por outra instância; a mudança de status não foi desfeita.",
+    "remove_project": "O projeto '{}' foi alterado por outra instância; sua criação não foi desfeita.",
+    "remove_tasks": "O backlog do projeto '{}' foi alterado por outra instância; as tarefas não foram removidas.",
+    "restore_sprint": "A Sprint do projeto '{}' foi alterada por outra instância; seu início não foi desfeito.",
+    "removed": "O projeto '{}' foi removido por outra instância; a alteração foi descartada."
+}
+
+
+def file_stat(file_name):
+    # Identifica uma versão do snapshot: a compactação troca o arquivo inteiro (os.replace)
+    try:
+        stat = os.stat(file_name)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def file_size(file_name):
+    try:
+        return os.path.getsize(file_name)
+    except FileNotFoundError:
+        return 0
+
+
+def read_snapshot(file_name):
+    # Arquivos de versões anteriores (modelCodec.MIGRATIONS) são migrados aqui; a compactação
+    # que segue (o índice não vale para eles) grava o snapshot já na versão atual
+    data = load_data(file_name)
+    return data.get("projects", []), data.get("journal_seq", 0)
+
+
+def read_index(file_name):
+    # O índice só vale para o snapshot exato que o gerou, na versão atual do formato
+    try:
+        with open(file_name + ".idx", 'r') as file:
+            index = json.load(file)
+        stat = os.stat(file_name)
+    except (FileNotFoundError, ValueError):
+        return None
+    if index.get("snapshot_size") != stat.st_size or index.get("snapshot_mtime_ns") != stat.st_mtime_ns:
+        return None
+    if index.get("schema_version") != SCHEMA_VERSION:
+        return None
+    return index["projects"], index["journal_seq"]
+
+
+def index_entry(project_data, offset, length):
+    entry = {field: project_data.get(field) for field in PROJECT_FIELDS}
+    entry["backlog_count"] = len(project_data.get("product_backlog", []))
+    entry["sprint_count"] = len(project_data.get("sprint_tasks", []))
+    entry["version"] = project_data.get("version", 0)
+    entry["offset"] = offset
+    entry["length"] = length
+    return entry
+
+
+def write_snapshot(file_name, projects, journal_seq, read_raw):
+    # Um projeto por linha, para que cada um possa ser lido sozinho pelo offset gravado no índice.
+    # Projetos que não foram carregados são copiados byte a byte do snapshot anterior.
+    entries = []
+    temp_name = file_name + ".tmp"
+    with open(temp_name, 'wb') as file:
+        header = f'{{"schema_version": {SCHEMA_VERSION}, "journal_seq": {journal_seq}, "projects": [\n'.encode()
+        file.write(header)
+        offset = len(header)
+        for position, project_data in enumerate(projects):
+            if "product_backlog" in project_data:
+                raw = dumps(project_data)
+                entry = index_entry(project_data, offset, len(raw))
+            else:
+                raw = read_raw(project_data)
+                entry = dict(project_data, offset=offset, length=len(raw))
+            separator = b",\n" if position < len(projects) - 1 else b"\n"
+            file.write(raw + separator)
+            offset += len(raw) + len(separator)
+            entries.append(entry)
+        file.write(b"]}\n")
+        instrumentation.add("bytes_written", offset + 3)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_name, file_name)
+
+    stat = os.stat(file_name)
+    index = {
+        "schema_version": SCHEMA_VERSION,
+        "snapshot_size": stat.st_size,
+        "snapshot_mtime_ns": stat.st_mtime_ns,
+        "journal_seq": journal_seq,
+        "projects": entries
+    }
+    with open(file_name + ".idx.tmp", 'w') as file:
+        json.dump(index, file, separators=(",", ":"))
+    os.replace(file_name + ".idx.tmp", file_name + ".idx")
+    return entries
+
+
+def close_sprint(project_data, timestamp):
+    # Mesmo cálculo de ScrumProject.start_sprint: guarda o resumo da sprint que termina
+    sprint_tasks = project_data["sprint_tasks"]
+    if project_data.get("sprint_started_at") is not None or sprint_tasks:
+        planned = sum(task.get("story_points", DEFAULT_STORY_POINTS) for task in sprint_tasks)
+        done = sum(task.get("story_points", DEFAULT_STORY_POINTS) for task in sprint_tasks if task.get("status") == "Done")
+        project_data["sprint_history"] = (project_data.get("sprint_history") or []) + [[project_data.get("sprint_started_at"), timestamp, planned, done]]
+    project_data["sprint_started_at"] = timestamp
+
+
+def add_event(task, event):
+    task = dict(task)
+    task["events"] = task.get("events", []) + [event]
+    return task
+
+
+def drop_last_event(task):
+    task = dict(task)
+    events = task.get("events", [])[:-1]
+    if events:
+        task["events"] = events
+    else:
+        task.pop("events", None)
+    return task
+
+
+def merge_rows(selected, remaining, rows):
+    # Inverso do start_sprint com rows: selected volta às posições rows, remaining ocupa as outras
+    merged = []
+    remaining = iter(remaining)
+    for task, row in zip(selected, rows):
+        merged.extend(islice(remaining, row - len(merged)))
+        merged.append(task)
+    merged.extend(remaining)
+    return merged
+
+
+def update_entries(live_entries, entries):
+    # Atualiza pelo nome as entradas do índice que os projetos ainda não carregados guardam:
+    # desfazer a criação de um projeto muda as posições dos seguintes
+    by_name = {entry["project_name"]: entry for entry in entries}
+    kept = []
+    for live_entry in live_entries:
+        entry = by_name.pop(live_entry["project_name"], None)
+        if entry is not None:
+            live_entry.update(entry)
+            kept.append(live_entry)
+    live_entries[:] = kept + [entry for entry in entries if entry["project_name"] in by_name]
+
+
+def record_project(record):
+    return record["project"]["project_name"] if record["op"] == "add_project" else record["project"]
+
+
+def apply_record(projects, positions, record, hydrate):
+    # Cada projeto guarda em "version" o seq do último registro que o alterou
+    op = record["op"]
+    if op == "add_project":
+        project_data = dict(record["project"])
+        project_data.setdefault("product_backlog", [])
+        project_data.setdefault("sprint_tasks", [])
+        project_data["version"] = record.get("seq", 0)
+        projects.append(project_data)
+        positions[project_data["project_name"]] = len(projects) - 1
+        return
+
+    position = positions.get(record["project"])
+    if position is None:
+        return
+    if op == "remove_project":
+        del projects[position]
+        positions.clear()
+        positions.update((project_data["project_name"], position) for position, project_data in enumerate(projects))
+        return
+    project_data = projects[position]
+    if "product_backlog" not in project_data:
+        project_data = projects[position] = hydrate(project_data)
+
+    # Tarefas de registros antigos podem não ter todos os campos da versão atual
+    if op == "add_task":
+        project_data["product_backlog"].append(normalize_task(record["task"]))
+    elif op == "add_tasks":
+        project_data["product_backlog"].extend(map(normalize_task, record["tasks"]))
+    elif op == "start_sprint":
+        # "rows" são as linhas do backlog escolhidas pelo plano; registros antigos movem tudo.
+        # O backlog só cresce no fim entre duas sprints, então as linhas continuam válidas.
+        rows = record.get("rows")
+        timestamp = record.get("time")
+        backlog = project_data["product_backlog"]
+        if timestamp is not None:
+            close_sprint(project_data, timestamp)
+        if rows is None:
+            project_data["sprint_tasks"], project_data["product_backlog"] = backlog, []
+        else:
+            chosen = set(rows)
+            project_data["sprint_tasks"] = [backlog[row] for row in rows if row < len(backlog)]
+            project_data["product_backlog"] = [task for row, task in enumerate(backlog) if row not in chosen]
+        if timestamp is not None:
+            project_data["sprint_tasks"] = [
+                add_event(task, [timestamp, EVENT_SPRINT, task.get("status", "To Do")]) for task in project_data["sprint_tasks"]
+            ]
+    elif op == "set_task_status":
+        tasks = project_data["sprint_tasks" if record["sprint"] else "product_backlog"]
+        row = record["row"]
+        if row < len(tasks):
+            tasks[row] = add_event(dict(tasks[row], status=record["status"]), [record["time"], EVENT_STATUS, record["status"]])
+    elif op == "revert_task_status":
+        tasks = project_data["sprint_tasks" if record["sprint"] else "product_backlog"]
+        row = record["row"]
+        if row < len(tasks):
+            tasks[row] = drop_last_event(dict(tasks[row], status=record["status"]))
+    elif op == "remove_tasks":
+        backlog = project_data["product_backlog"]
+        del backlog[max(0, len(backlog) - record["count"]):]
+    elif op == "restore_sprint":
+        # Inverso de start_sprint: as tarefas da sprint voltam às linhas rows do backlog, sem o
+        # evento de entrada, e a sprint anterior (gravada no registro) volta a valer
+        selected = [drop_last_event(task) for task in project_data["sprint_tasks"]]
+        project_data["product_backlog"] = merge_rows(selected, project_data["product_backlog"], record["rows"])
+        project_data["sprint_tasks"] = record["tasks"]
+        history = project_data.get("sprint_history") or []
+        if history and (record.get("time") is not None or record["tasks"]):
+            project_data["sprint_history"] = history[:-1]
+        project_data["sprint_started_at"] = record.get("time")
+    elif op == "set_sprint_info":
+        project_data["sprint_planning_date"] = record["sprint_planning_date"]
+        project_data["daily_scrum_time"] = record["daily_scrum_time"]
+        project_data["sprint_duration"] = record["sprint_duration"]
+    project_data["version"] = record.get("seq", 0)
+
+
+def read_journal(journal_name, after_seq=0, offset=0):
+    # Devolve também o offset do fim da última linha completa, de onde a próxima leitura continua
+    records = []
+    try:
+        with open(journal_name, 'rb') as file:
+            file.seek(offset)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = loads(line)
+                except ValueError:
+                    # Última linha incompleta (queda durante a escrita): ignora o resto
+                    break
+                offset += len(line)
+                if record.get("seq", 0) > after_seq:
+                    records.append(record)
+    except FileNotFoundError:
+        pass
+    return records, offset
+
+
+class ProjectJournal:
+    def __init__(self, file_name, sync_every=32, sync_interval=1.0, compact_every=1000):
+        self.file_name = file_name
+        self.journal_name = file_name + ".journal"
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.compact_every = compact_every
+        self.file = None
+        self.snapshot_map = None
+        self.entries = []
+        self.needs_index = False
+        self.seq = 0
+        self.records = 0
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+        # Linhas do lote em andamento (apply_batch); None fora de um lote
+        self.batch = None
+        # Protege o snapshot mapeado: a compactação pode rodar na thread de gravação
+        # enquanto a interface carrega as tarefas de um projeto.
+        self.lock = threading.RLock()
+        # Entre processos (várias instâncias no mesmo arquivo): gravação e compactação com o
+        # lock exclusivo, leituras com o compartilhado. Sempre pego depois de self.lock.
+        self.file_lock = FileLock(file_name + ".lock")
+        self.snapshot_stat = None
+        self.snapshot_seq = 0
+        self.journal_offset = 0
+        # Versão conhecida de cada projeto, e o que outras instâncias mudaram (projeto -> operações)
+        # e ainda não foi entregue por poll_changes
+        self.versions = {}
+        self.changed = {}
+        self.conflicts = []
+
+    def open_snapshot(self):
+        if self.snapshot_map is not None:
+            self.snapshot_map.close()
+            self.snapshot_map = None
+        if os.path.exists(self.file_name) and os.path.getsize(self.file_name):
+            with open(self.file_name, 'rb') as file:
+                self.snapshot_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def read_project(self, entry):
+        return self.snapshot_map[entry["offset"]:entry["offset"] + entry["length"]]
+
+    def hydrate(self, entry):
+        return loads(self.read_project(entry))
+
+    def write_snapshot(self, projects):
+        return write_snapshot(self.file_name, projects, self.seq, self.read_project)
+
+    def load_tasks(self, entry):
+        with self.lock:
+            project_data = self.hydrate(entry)
+        return project_data.get("product_backlog", []), project_data.get("sprint_tasks", [])
+
+    def read_state(self):
+        index = read_index(self.file_name)
+        if index is None:
+            projects, snapshot_seq = read_snapshot(self.file_name)
+            return projects, snapshot_seq, True
+        self.open_snapshot()
+        projects, snapshot_seq = index
+        return projects, snapshot_seq, False
+
+    def replay(self, projects, snapshot_seq):
+        positions = {project_data["project_name"]: position for position, project_data in enumerate(projects)}
+        records, self.journal_offset = read_journal(self.journal_name, snapshot_seq)
+        for record in records:
+            apply_record(projects, positions, record, self.hydrate)
+        return records
+
+    def load(self):
+        # Devolve os projetos do índice sem as tarefas (carregadas depois por load_tasks);
+        # só os projetos alterados pelo journal vêm completos.
+        with self.lock, self.file_lock.shared():
+            projects, self.snapshot_seq, self.needs_index = self.read_state()
+            self.snapshot_stat = file_stat(self.file_name)
+            self.entries = [] if self.needs_index else list(projects)
+            records = self.replay(projects, self.snapshot_seq)
+            self.seq = records[-1]["seq"] if records else self.snapshot_seq
+            self.records = len(records)
+            self.versions = {project_data["project_name"]: project_data.get("version", 0) for project_data in projects}
+        return projects
+
+    def load_all(self):
+        return [project_data if "product_backlog" in project_data else self.hydrate(project_data)
+                for project_data in self.load()]
+
+    def track(self, records):
+        # Registros gravados por outras instâncias
+        for record in records:
+            project_name = record_project(record)
+            self.versions[project_name] = record["seq"]
+            self.changed.setdefault(project_name, set()).add(record["op"])
+        if records:
+            self.seq = max(self.seq, records[-1]["seq"])
+            self.records += len(records)
+
+    def reload(self):
+        # Outra instância compactou: o snapshot foi trocado e o journal, truncado
+        projects, self.snapshot_seq, needs_index = self.read_state()
+        self.snapshot_stat = file_stat(self.file_name)
+        versions = {project_data["project_name"]: project_data.get("version", 0) for project_data in projects}
+        if needs_index:
+            # Sem índice novo o snapshot antigo continua mapeado, e todos os projetos são recarregados
+            changed = set(versions) | set(self.versions)
+            self.needs_index = True
+        else:
+            update_entries(self.entries, projects)
+            self.needs_index = False
+            changed = {name for name, version in versions.items() if self.versions.get(name) != version}
+            changed |= set(self.versions) - set(versions)
+        self.versions = versions
+        for project_name in changed:
+            self.changed.setdefault(project_name, set()).add("reload")
+        records, self.journal_offset = read_journal(self.journal_name, self.snapshot_seq)
+        self.seq = self.snapshot_seq
+        self.records = 0
+        self.track(records)
+
+    def catch_up(self):
+        # Chamado com self.lock e o lock do arquivo
+        if file_stat(self.file_name) != self.snapshot_stat:
+            self.reload()
+            return
+        records, self.journal_offset = read_journal(self.journal_name, self.seq, self.journal_offset)
+        self.track(records)
+
+    def prepare_write(self):
+        self.catch_up()
+        # Com o lock exclusivo ninguém está escrevendo: o que vem depois da última linha completa
+        # sobrou de uma gravação interrompida e corromperia o próximo registro
+        if file_size(self.journal_name) > self.journal_offset:
+            os.truncate(self.journal_name, self.journal_offset)
+
+    def finish_write(self):
+        self.file.flush()
+        self.journal_offset = os.fstat(self.file.fileno()).st_size
+
+    def append(self, record):
+        with self.lock, self.file_lock.exclusive():
+            if self.batch is None:
+                self.prepare_write()
+            project_name = record_project(record)
+            changed = self.changed.get(project_name, ())
+            if "remove_project" in changed and record["op"] != "add_project":
+                self.conflicts.append(CONFLICT_MESSAGES["removed"].format(project_name))
+                return
+            if any(op in changed for op in CONFLICTING_OPS.get(record["op"], ())):
+                self.conflicts.append(CONFLICT_MESSAGES[record["op"]].format(project_name))
+                return
+
+            record["seq"] = self.seq + 1
+            line = dumps(record) + b"\n"
+            self.seq += 1
+            self.versions[project_name] = self.seq
+            self.records += 1
+            self.unsynced += 1
+            if self.batch is not None:
+                self.batch.append(line)
+                return
+
+            if self.file is None:
+                self.file = open(self.journal_name, 'ab')
+            self.file.write(line)
+            instrumentation.add("bytes_written", len(line))
+
+            self.finish_write()
+            if self.unsynced >= self.sync_every or time.monotonic() - self.last_sync >= self.sync_interval:
+                self.sync()
+            if self.records >= self.compact_every:
+                self.compact()
+
+    def apply_batch(self, operations):
+        # Um único write + fsync para o lote inteiro, sob um único lock exclusivo. O lote é
+        # atômico: as linhas só vão para o arquivo depois que todas as operações deram certo, e
+        # qualquer falha devolve o journal (arquivo, seq e versões) ao estado de antes do lote.
+        with self.lock, self.file_lock.exclusive():
+            self.prepare_write()
+            state = self.seq, dict(self.versions), self.records, self.unsynced, len(self.conflicts)
+            self.batch = []
+            try:
+                for operation, args in operations:
+                    getattr(self, operation)(*args)
+                if self.batch:
+                    if self.file is None:
+                        self.file = open(self.journal_name, 'ab')
+                    data = b"".join(self.batch)
+                    self.file.write(data)
+                    self.finish_write()
+                    self.sync()
+                    instrumentation.add("bytes_written", len(data))
+            except BaseException:
+                self.seq, self.versions, self.records, self.unsynced, conflict_count = state
+                del self.conflicts[conflict_count:]
+                self.discard_unwritten()
+                raise
+            finally:
+                self.batch = None
+            if self.records >= self.compact_every:
+                try:
+                    self.compact()
+                except OSError:
+                    # O lote já está no journal; a compactação tenta de novo no próximo
+                    pass
+
+    def discard_unwritten(self):
+        # Descarta o que passou de journal_offset (um write do lote que falhou no meio)
+        if self.file is not None:
+            try:
+                self.file.close()
+            except OSError:
+                pass
+            self.file = None
+        if file_size(self.journal_name) > self.journal_offset:
+            os.truncate(self.journal_name, self.journal_offset)
+
+    def poll_changes(self):
+        # Devolve os projetos alterados por outras instâncias e os conflitos desde a última chamada.
+        # Enquanto nada muda no disco custa só dois stat, sem pegar o lock do arquivo.
+        with self.lock:
+            if file_stat(self.file_name) != self.snapshot_stat or file_size(self.journal_name) != self.journal_offset:
+                with self.file_lock.shared():
+                    self.catch_up()
+            changed, self.changed = list(self.changed), {}
+            conflicts, self.conflicts = self.conflicts, []
+        return changed, conflicts
+
+    def load_project(self, project_name):
+        # Estado atual de um projeto no disco: entrada do snapshot + seus registros no journal
+        with self.lock, self.file_lock.shared():
+            self.catch_up()
+            if self.needs_index:
+                projects = [project_data for project_data in read_snapshot(self.file_name)[0]
+                            if project_data["project_name"] == project_name][-1:]
+            else:
+                projects = [self.hydrate(entry) for entry in self.entries
+                            if entry["project_name"] == project_name][-1:]
+            positions = {project_name: 0} if projects else {}
+            for record in read_journal(self.journal_name, self.snapshot_seq)[0]:
+                if record_project(record) == project_name:
+                    apply_record(projects, positions, record, self.hydrate)
+        return projects[-1] if projects else None
+
+    def add_project(self, project_data):
+        self.append({"op": "add_project", "project": project_data})
+
+    def add_task(self, project_name, task_data):
+        self.append({"op": "add_task", "project": project_name, "task": task_data})
+
+    def add_tasks(self, project_name, tasks):
+        self.append({"op": "add_tasks", "project": project_name, "tasks": tasks})
+
+    def start_sprint(self, project_name, rows=None, timestamp=None):
+        record = {"op": "start_sprint", "project": project_name}
+        if rows is not None:
+            record["rows"] = rows
+        if timestamp is not None:
+            record["time"] = timestamp
+        self.append(record)
+
+    def set_task_status(self, project_name, in_sprint, row, status, timestamp):
+        self.append({"op": "set_task_status", "project": project_name, "sprint": in_sprint, "row": row, "status": status, "time": timestamp})
+
+    # Inversos usados pelo histórico de desfazer (history.py)
+
+    def remove_project(self, project_name):
+        self.append({"op": "remove_project", "project": project_name})
+
+    def remove_tasks(self, project_name, count):
+        self.append({"op": "remove_tasks", "project": project_name, "count": count})
+
+    def revert_task_status(self, project_name, in_sprint, row, status):
+        self.append({"op": "revert_task_status", "project": project_name, "sprint": in_sprint, "row": row, "status": status})
+
+    def restore_sprint(self, project_name, rows, tasks, sprint_started_at):
+        self.append({"op": "restore_sprint", "project": project_name, "rows": rows, "tasks": tasks, "time": sprint_started_at})
+
+    def set_sprint_info(self, project_name, planning_date, daily_time, duration):
+        self.append({
+            "op": "set_sprint_info",
+            "project": project_name,
+            "sprint_planning_date": planning_date,
+            "daily_scrum_time": daily_time,
+            "sprint_duration": duration
+        })
+
+    def sync(self):
+        if self.file is not None and self.unsynced:
+            os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    @timed("ProjectJournal.compact")
+    def compact(self):
+        with self.lock, self.file_lock.exclusive():
+            if self.file is not None:
+                self.file.flush()
+            self.sync()
+            self.catch_up()
+            projects, snapshot_seq, _ = self.read_state()
+            self.replay(projects, snapshot_seq)
+            # O snapshot guarda o último seq aplicado; se cairmos antes de truncar o journal,
+            # o replay ignora os registros que já estão no snapshot.
+            entries = self.write_snapshot(projects)
+
+            # Os projetos ainda não carregados guardam a entrada do índice antigo: atualiza os offsets
+            update_entries(self.entries, entries)
+            self.open_snapshot()
+            self.needs_index = False
+            self.snapshot_stat = file_stat(self.file_name)
+            self.snapshot_seq = self.seq
+
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+            open(self.journal_name, 'w').close()
+            self.journal_offset = 0
+            self.records = 0
+
+    def close(self):
+        # O journal continua valendo entre execuções; a compactação acontece quando ele
+        # passa de compact_every registros (em append) ou se o índice precisa ser refeito.
+        with self.lock:
+            if self.needs_index:
+                self.compact()
+            elif self.file is not None:
+                self.sync()
+                self.file.close()
+                self.file = None
+            if self.snapshot_map is not None:
+                self.snapshot_map.close()
+                self.snapshot_map = None
+            self.file_lock.close()
@@ -0,0 +1,167 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import quote
+
+# Teste de carga da API (apiServer.py): N clientes simultâneos, cada um com sua conexão
+# keep-alive, misturando leituras (lista de projetos e páginas do backlog) e escritas
+# (tarefas novas). Mostra vazão e latência p50/p95/p99/máx por tipo de requisição.
+
+
+class Client:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, payload=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+        )
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def run_client(host, port, project_paths, requests, write_ratio, rng, latencies, errors):
+    client = Client(host, port)
+    try:
+        for number in range(requests):
+            project_path = rng.choice(project_paths)
+            roll = rng.random()
+            if roll < write_ratio:
+                kind, method, path = "add_task", "POST", f"{project_path}/backlog"
+                payload = {"title": f"carga {number}", "description": "gerada por loadTest.py", "assigned_to": rng.choice(["Ana", "Bruno", "Carla"])}
+            elif roll < write_ratio + (1 - write_ratio) * 0.3:
+                kind, method, path, payload = "projects", "GET", "/projects?limit=50", None
+            else:
+                kind, method, path, payload = "backlog", "GET", f"{project_path}/backlog?offset={rng.randrange(0, 200)}&limit=50", None
+            start = time.perf_counter()
+            try:
+                status, _ = await client.request(method, path, payload)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                errors[kind] = errors.get(kind, 0) + 1
+                client.close()
+                client = Client(host, port)
+                continue
+            latencies.setdefault(kind, []).append(time.perf_counter() - start)
+            if status >= 400:
+                errors[kind] = errors.get(kind, 0) + 1
+    finally:
+        client.close()
+
+
+async def run(args):
+    client = Client(args.host, args.port)
+    status, data = await client.request("GET", "/projects?limit=1000")
+    client.close()
+    if status != 200 or not data["projects"]:
+        raise SystemExit("A API não tem projetos para testar.")
+    names = args.project or [project["project_name"] for project in data["projects"]]
+    project_paths = [f"/projects/{quote(name, safe='')}" for name in names]
+
+    latencies = {}
+    errors = {}
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_client(args.host, args.port, project_paths, args.requests, args.write_ratio, random.Random(rng.random()), latencies, errors)
+        for _ in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - start
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"{args.clients} clientes, {total} requisições em {elapsed:.2f}s ({total / elapsed:.0f} req/s)")
+    results = {}
+    for kind, values in sorted(latencies.items()):
+        values.sort()
+        results[kind] = {
+            "count": len(values),
+            "errors": errors.get(kind, 0),
+            "p50_ms": round(percentile(values, 0.5) * 1000, 3),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+            "max_ms": round(values[-1] * 1000, 3)
+        }
+        item = results[kind]
+        print(f"  {kind:<10} {item['count']:>7}  erros {item['errors']:>4}  p50 {item['p50_ms']:8.2f} ms  "
+              f"p95 {item['p95_ms']:8.2f} ms  p99 {item['p99_ms']:8.2f} ms  máx {item['max_ms']:8.2f} ms")
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({"clients": args.clients, "requests": total, "seconds": elapsed, "results": results}, file, indent=4)
+
+
+def wait_for_port(host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit(f"A API não respondeu em {host}:{port}.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga da API REST do Scrum App")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=50, help="requisições por cliente")
+    parser.add_argument("--write-ratio", type=float, default=0.05, help="fração de escritas (POST de tarefas)")
+    parser.add_argument("--project", action="append", help="projeto alvo (pode repetir); padrão: todos")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="grava os resultados em JSON")
+    parser.add_argument("--spawn", metavar="DATA", help="sobe apiServer.py com este arquivo de dados (as escritas vão para ele: use uma cópia)")
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen([
+            sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "apiServer.py"),
+            "--data", args.spawn, "--host", args.host, "--port", str(args.port)
+        ])
+    try:
+        if server is not None:
+            wait_for_port(args.host, args.port)
+        asyncio.run(run(args))
+    finally:
+        if server is not None:
+            # SIGINT deixa o servidor gravar as escritas pendentes e fechar o storage
+            if os.name == "nt":
+                server.terminate()
+            else:
+                server.send_signal(signal.SIGINT)
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
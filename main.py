@@ -1,119 +1,25 @@
-import json
-from datetime import datetime, timedelta
+import argparse
+import os
+from datetime import datetime
 import tkinter as tk
-from tkinter import messagebox, simpledialog
+from tkinter import messagebox, simpledialog, filedialog
 import customtkinter as ctk
-
-def load_projects(file_name):
-    try:
-        with open(file_name, 'r') as file:
-            data = json.load(file)
-            projects = []
-            for project_data in data.get("projects", []):
-                project = ScrumProject(
-                    project_data['project_name'],
-                    project_data['scrum_master'],
-                    project_data['sprint_planning_date'],
-                    project_data['daily_scrum_time'],
-                    project_data['sprint_duration']
-                )
-                project.product_backlog = [Task(**task) for task in project_data.get('product_backlog', [])]
-                project.sprint_tasks = []
-                projects.append(project)
-            return projects
-    except FileNotFoundError:
-        return []
-
-def save_projects(file_name, data):
-    with open(file_name, 'w') as file:
-        json.dump(data, file, indent=4)
-
-class Task:
-    def __init__(self, title, description, assigned_to, status="To Do"):
-        self.title = title
-        self.description = description
-        self.assigned_to = assigned_to
-        self.status = status
-
-    def to_dict(self):
-        return {
-            "title": self.title,
-            "description": self.description,
-            "assigned_to": self.assigned_to,
-            "status": self.status
-        }
-
-    def __str__(self):
-        return f"[{self.status}] Tarefa: {self.title}, Responsável: {self.assigned_to}"
-
-class ScrumProject:
-    def __init__(self, project_name, scrum_master, sprint_planning_date=None, daily_scrum_time=None, sprint_duration=0):
-        self.project_name = project_name
-        self.scrum_master = scrum_master
-        self.product_backlog = []
-        self.sprint_planning_date = datetime.strptime(sprint_planning_date, "%Y-%m-%d") if sprint_planning_date else None
-        self.daily_scrum_time = datetime.strptime(daily_scrum_time, "%H:%M").time() if daily_scrum_time else None
-        self.sprint_duration = sprint_duration
-        self.sprint_tasks = []
-
-    def set_sprint_info(self, planning_date, daily_time, duration):
-        self.sprint_planning_date = planning_date
-        self.daily_scrum_time = daily_time
-        self.sprint_duration = duration
-        return f"Informações da Sprint definidas: Data de Planejamento - {planning_date}, Hora da Daily Scrum - {daily_time}, Duração - {duration} dias."
-
-    def add_task_to_backlog(self, title, description, assigned_to):
-        task = Task(title, description, assigned_to)
-        self.product_backlog.append(task)
-
-    def start_sprint(self):
-        today = datetime.today()
-        if not self.sprint_planning_date:
-            return "Reunião de Planejamento da Sprint ainda não foi agendada."
-
-        if today.date() < self.sprint_planning_date.date():
-            return f"A Sprint não pode começar antes da Reunião de Planejamento em {self.sprint_planning_date.date()}."
-        else:
-            print("product_backlog", self.product_backlog)
-            self.sprint_tasks = self.product_backlog.copy()
-            self.product_backlog.clear()
-            return f"Sprint iniciada! Ela terminará em {today + timedelta(days=self.sprint_duration)}."
-
-    def view_backlog(self):
-        if not self.product_backlog:
-            return "Não há tarefas no backlog."
-
-        backlog_info = "\nBacklog do Produto:\n"
-        for i, task in enumerate(self.product_backlog, 1):
-            backlog_info += f"{i}. {task}\n"
-        return backlog_info
-
-    def view_sprint_tasks(self):
-        if not self.sprint_tasks:
-            return "Não há tarefas na Sprint."
-
-        sprint_info = "\nTarefas da Sprint:\n"
-        for i, task in enumerate(self.sprint_tasks, 1):
-            sprint_info += f"{i}. {task}\n"
-        return sprint_info
-
-    def show_scrum_info(self):
-        info = f"\nProjeto: {self.project_name}\n"
-        info += f"Scrum Master: {self.scrum_master}\n"
-        info += f"Data da Reunião de Planejamento da Sprint: {self.sprint_planning_date.date() if self.sprint_planning_date else 'Não definida'}\n"
-        info += f"Horário do Daily Scrum: {self.daily_scrum_time if self.daily_scrum_time else 'Não definido'}\n"
-        return info
-
-    def to_dict(self):
-        return {
-            "project_name": self.project_name,
-            "scrum_master": self.scrum_master,
-            "sprint_planning_date": self.sprint_planning_date.strftime("%Y-%m-%d") if self.sprint_planning_date else None,
-            "daily_scrum_time": self.daily_scrum_time.strftime("%H:%M") if self.daily_scrum_time else None,
-            "sprint_duration": self.sprint_duration,
-            "product_backlog": [task.to_dict() for task in self.product_backlog],
-            "sprint_tasks": [task.to_dict() for task in self.sprint_tasks]
-        }
+from scrumModel import DATA_FILE, ScrumProject, current_timestamp, load_projects, project_from_data
+from storage import open_storage
+from sprintAnalytics import Analytics
+from history import AddProject, AddTasks, History, SetSprintInfo, SetTaskStatus, StartSprint
+from projectList import VirtualProjectList
+from persistence import BackgroundWriter, BatchDiscarded
+from taskTable import open_task_table
+from search import parse_query, search_tasks
+from bulkIO import import_tasks, export_tasks
+from sprintPlanner import DEFAULT_DAILY_CAPACITY
+from taskStore import DEFAULT_PRIORITY, DEFAULT_STORY_POINTS, MAX_STORY_POINTS, PRIORITIES, STATUSES, parse_estimate
+import instrumentation
+from instrumentation import timed
+
+# De quanto em quanto tempo procura alterações de outras instâncias no mesmo arquivo
+POLL_INTERVAL_MS = 2000
 
 class ScrumApp:
     def __init__(self, master):
@@ -122,14 +28,20 @@ class ScrumApp:
         master.geometry("600x400")
         master.configure(bg="#f0f0f0")
 
-        self.projects = load_projects('projects_data.json')
+        self.storage = open_storage(DATA_FILE)
+        self.projects = load_projects(self.storage)
+        self.analytics = Analytics(self.storage.file_name + ".stats")
+        self.analytics.track(self.projects, self.storage.versions)
+        self.writer = BackgroundWriter(self.storage, master, self.on_save_error)
+        self.history = History()
         self.selected_project = None
+        master.protocol("WM_DELETE_WINDOW", self.on_close)
 
         self.project_frame = tk.Frame(master, bg="#ffffff", padx=10, pady=10)
         self.project_frame.pack(padx=20, pady=20, fill=tk.BOTH, expand=True)
 
-        self.project_listbox = tk.Listbox(self.project_frame)
-        self.project_listbox.pack(fill=tk.BOTH, expand=True)
+        self.project_list = VirtualProjectList(self.project_frame, self.projects, self.select_project, bg="#ffffff")
+        self.project_list.pack(fill=tk.BOTH, expand=True)
 
         self.load_projects()
 
@@ -145,22 +57,144 @@ class ScrumApp:
         self.select_project_button = ctk.CTkButton(button_frame, text="Selecionar Projeto", command=self.select_project, fg_color="#2196F3", hover_color="#1e88e5")
         self.select_project_button.pack(side="left", padx=5)
 
+        self.dashboard_button = ctk.CTkButton(button_frame, text="Indicadores", command=self.show_dashboard, fg_color="#2196F3", hover_color="#1e88e5")
+        self.dashboard_button.pack(side="left", padx=5)
+
+        if instrumentation.ENABLED:
+            self.diagnostics_button = ctk.CTkButton(button_frame, text="Diagnóstico", command=self.show_diagnostics, fg_color="#FF9800", hover_color="#E68A00")
+            self.diagnostics_button.pack(side="left", padx=5)
+
+        history_frame = tk.Frame(master)
+        history_frame.pack(pady=(0, 5))
+        self.undo_button = ctk.CTkButton(history_frame, text="Desfazer", command=self.undo, fg_color="#757575", hover_color="#616161")
+        self.undo_button.pack(side="left", padx=5)
+        self.redo_button = ctk.CTkButton(history_frame, text="Refazer", command=self.redo, fg_color="#757575", hover_color="#616161")
+        self.redo_button.pack(side="left", padx=5)
+        master.bind_all("<Control-z>", lambda event: self.undo())
+        master.bind_all("<Control-y>", lambda event: self.redo())
+
+        master.after(POLL_INTERVAL_MS, self.poll_changes)
+
+    def show_diagnostics(self):
+        from diagnostics import DiagnosticsWindow
+        DiagnosticsWindow(self.master)
+
+    def show_dashboard(self):
+        from dashboard import DashboardWindow
+        DashboardWindow(self.master, self.analytics)
+
+    def on_save_error(self, error):
+        if isinstance(error, BatchDiscarded):
+            messagebox.showerror("Erro ao Salvar", f"As alterações não puderam ser salvas e foram descartadas: {error}")
+            # Volta os projetos afetados ao que está no disco
+            for project_name in error.project_names:
+                self.refresh_project(project_name)
+            return
+        messagebox.showerror("Erro ao Salvar", f"Não foi possível salvar as alterações: {error}")
+
+    def on_close(self):
+        try:
+            self.writer.close()
+            # Projetos que outra instância alterou depois da última leitura não entram no cache
+            changed = self.storage.poll_changes()[0]
+            self.analytics.save(self.storage.versions, changed)
+            self.storage.close()
+        except Exception as error:
+            self.on_save_error(error)
+        if instrumentation.ENABLED and os.environ.get("SCRUM_INSTRUMENT_FILE"):
+            instrumentation.dump_json(os.environ["SCRUM_INSTRUMENT_FILE"])
+        self.master.destroy()
+
+    @timed("ScrumApp.load_projects")
     def load_projects(self):
-        for widget in self.project_frame.winfo_children():
-            widget.destroy()
-
-        for project in self.projects:
-            card = ctk.CTkFrame(self.project_frame, fg_color="#333", corner_radius=10)
-            card.pack(padx=10, pady=5, fill="x", expand=True)
-
-            project_name_label = ctk.CTkLabel(card, text=project.project_name, font=("Helvetica", 16, "bold"))
-            project_name_label.pack(anchor="w", pady=10, padx=10)
-
-            scrum_master_label = ctk.CTkLabel(card, text=f"Scrum Master: {project.scrum_master}", text_color="#666666")
-            scrum_master_label.pack(anchor="w", padx=10)
-
-            select_button = ctk.CTkButton(card, text="Selecionar", command=lambda p=project: self.select_project(p), fg_color="#2196F3", hover_color="#1976D2", text_color="white")
-            select_button.pack(pady=5)
+        self.project_list.set_projects(self.projects)
+
+    @timed("ScrumApp.poll_changes")
+    def poll_changes(self):
+        try:
+            # Com gravações locais pendentes o disco ainda não tem tudo: espera a próxima rodada
+            if self.writer.idle():
+                changed, conflicts = self.storage.poll_changes()
+                for project_name in changed:
+                    self.refresh_project(project_name)
+                if conflicts:
+                    messagebox.showwarning("Conflito", "\n".join(conflicts))
+        except OSError:
+            # Arquivo temporariamente inacessível (ex.: unidade de rede): tenta de novo depois
+            pass
+        finally:
+            self.master.after(POLL_INTERVAL_MS, self.poll_changes)
+
+    def refresh_project(self, project_name):
+        # Substitui só o projeto alterado por outra instância, relido do disco
+        project_data = self.storage.load_project(project_name)
+        if project_data is None:
+            # Outra instância desfez a criação do projeto
+            self.remove_project(project_name)
+            return
+        project = project_from_data(self.storage, project_data)
+        for index in range(len(self.projects) - 1, -1, -1):
+            if self.projects[index].project_name == project_name:
+                if self.selected_project is self.projects[index]:
+                    self.selected_project = project
+                # Os passos de desfazer guardados valiam para o estado antigo do projeto
+                self.history.forget(self.projects[index])
+                self.update_history_buttons()
+                self.analytics.replace(self.projects[index], project, self.storage.versions.get(project_name))
+                self.projects[index] = project
+                self.project_list.refresh()
+                return
+        self.projects.append(project)
+        self.analytics.attach(project, self.storage.versions.get(project_name))
+        self.project_list.insert(len(self.projects) - 1)
+
+    def remove_project(self, project_name):
+        for index in range(len(self.projects) - 1, -1, -1):
+            project = self.projects[index]
+            if project.project_name == project_name:
+                if self.selected_project is project:
+                    self.selected_project = None
+                self.history.forget(project)
+                self.update_history_buttons()
+                self.analytics.detach(project)
+                del self.projects[index]
+                self.project_list.remove(index)
+                return
+
+    def record(self, change):
+        self.history.record(change)
+        self.update_history_buttons()
+
+    def update_history_buttons(self):
+        undo_label, redo_label = self.history.undo_label(), self.history.redo_label()
+        self.undo_button.configure(text=f"Desfazer: {undo_label}" if undo_label else "Desfazer")
+        self.redo_button.configure(text=f"Refazer: {redo_label}" if redo_label else "Refazer")
+
+    @timed("ScrumApp.undo")
+    def undo(self):
+        self.apply_history(self.history.undo(), "Nada para desfazer.")
+
+    @timed("ScrumApp.redo")
+    def redo(self):
+        self.apply_history(self.history.redo(), "Nada para refazer.")
+
+    def apply_history(self, result, empty_message):
+        if result is None:
+            messagebox.showinfo("Histórico", empty_message)
+            return
+        change, operations = result
+        for operation, args in operations:
+            self.writer.post(operation, *args)
+        project = change.project
+        if project in self.projects:
+            self.analytics.reset(project)
+        else:
+            # Criação do projeto desfeita
+            self.analytics.detach(project)
+            if self.selected_project is project:
+                self.selected_project = None
+        self.project_list.refresh()
+        self.update_history_buttons()
 
     def create_project_card(self, project):
         card_frame = ctk.CTkFrame(self.project_frame, fg_color="#f9f9f9", corner_radius=8)
@@ -195,42 +229,124 @@ class ScrumApp:
 
         ctk.CTkButton(project_info_window, text="Definir Informações da Sprint", command=self.set_sprint_info, fg_color="#FF9800", hover_color="#E68A00", text_color="white").pack(pady=5)
 
+    @timed("ScrumApp.add_project")
     def add_project(self):
         project_name = simpledialog.askstring("Nome do Projeto", "Digite o nome do projeto:")
         scrum_master = simpledialog.askstring("Scrum Master", "Digite o nome do Scrum Master:")
-        if project_name and scrum_master:
+        if not (project_name and scrum_master):
+            messagebox.showwarning("Entrada Inválida", "Por favor, preencha todos os campos.")
+        elif any(project.project_name == project_name for project in self.projects):
+            # O nome identifica o projeto no storage; um segundo com o mesmo nome ficaria inacessível
+            messagebox.showwarning("Entrada Inválida", f"Já existe um projeto chamado '{project_name}'.")
+        else:
             new_project = ScrumProject(project_name, scrum_master)
+            self.record(AddProject(self.projects, new_project))
             self.projects.append(new_project)
-            save_projects('projects_data.json', {"projects": [project.to_dict() for project in self.projects]})
-            self.load_projects()
+            self.analytics.attach(new_project)
+            self.writer.post("add_project", new_project.to_dict())
+            self.project_list.insert(len(self.projects) - 1)
             messagebox.showinfo("Sucesso", "Projeto adicionado com sucesso!")
-        else:
-            messagebox.showwarning("Entrada Inválida", "Por favor, preencha todos os campos.")
 
+    @timed("ScrumApp.select_project")
     def select_project(self, project):
         self.selected_project = project
 
         project_info_window = tk.Toplevel(self.master)
         project_info_window.title("Informações do Projeto")
-        project_info_window.geometry("400x300")
+        project_info_window.geometry("400x520")
 
         info_label = tk.Label(project_info_window, text=self.selected_project.show_scrum_info(), bg="#f0f0f0")
         info_label.pack(pady=10)
 
         tk.Button(project_info_window, text="Adicionar Tarefa", command=self.add_task, bg="#4CAF50", fg="white").pack(pady=5)
         tk.Button(project_info_window, text="Iniciar Sprint", command=self.start_sprint, bg="#2196F3", fg="white").pack(pady=5)
+        tk.Button(project_info_window, text="Alterar Status de Tarefa", command=self.set_task_status, bg="#FF9800", fg="white").pack(pady=5)
         tk.Button(project_info_window, text="Visualizar Tarefas da Sprint", command=self.show_sprint_tasks, bg="#2196F3", fg="white").pack(pady=5)
         tk.Button(project_info_window, text="Visualizar Backlog", command=self.show_backlog, bg="#2196F3", fg="white").pack(pady=5)
         tk.Button(project_info_window, text="Definir Informações da Sprint", command=self.set_sprint_info, bg="#FF9800", fg="white").pack(pady=5)
+        tk.Button(project_info_window, text="Importar Tarefas (CSV/JSONL)", command=self.import_tasks, bg="#4CAF50", fg="white").pack(pady=5)
+        tk.Button(project_info_window, text="Exportar Backlog (CSV/JSONL)", command=self.export_backlog, bg="#2196F3", fg="white").pack(pady=5)
+
+        # Busca: palavras do título/descrição, @responsável e status:"To Do"
+        search_frame = tk.Frame(project_info_window)
+        search_frame.pack(pady=5, padx=10, fill=tk.X)
+        search_entry = tk.Entry(search_frame)
+        search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        all_projects = tk.BooleanVar(value=False)
+        tk.Checkbutton(search_frame, text="Todos os projetos", variable=all_projects).pack(side=tk.LEFT, padx=5)
+        search = lambda event=None: self.search_tasks(search_entry.get(), all_projects.get())
+        tk.Button(search_frame, text="Buscar", command=search, bg="#2196F3", fg="white").pack(side=tk.LEFT)
+        search_entry.bind("<Return>", search)
+
+    @timed("ScrumApp.search_tasks")
+    def search_tasks(self, query, all_projects=False):
+        if not self.selected_project:
+            messagebox.showwarning("Seleção Inválida", "Por favor, selecione um projeto.")
+            return
+
+        self.selected_project.hydrate()
+        text, assigned_to, status = parse_query(query)
+        projects = self.projects if all_projects else [self.selected_project]
+        results = search_tasks(projects, text, assigned_to, status)
+        if not results:
+            messagebox.showinfo("Busca", "Nenhuma tarefa encontrada.")
+            return
+
+        open_task_table(self.master, f"Resultado da Busca: {query}", len(results), results.page)
 
+    @timed("ScrumApp.import_tasks")
+    def import_tasks(self):
+        if not self.selected_project:
+            messagebox.showwarning("Seleção Inválida", "Por favor, selecione um projeto.")
+            return
+
+        path = filedialog.askopenfilename(title="Importar Tarefas", filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl *.ndjson")])
+        if not path:
+            return
+
+        change = AddTasks(self.selected_project, "Importar Tarefas")
+        try:
+            report = import_tasks(self.selected_project, path, lambda name, tasks: self.writer.post("add_tasks", name, tasks))
+        except (OSError, ValueError) as error:
+            messagebox.showerror("Erro", f"Não foi possível importar o arquivo: {error}")
+            return
+        finally:
+            # Lotes importados antes de um erro também entram no histórico
+            if change.count():
+                self.record(change)
+        messagebox.showinfo("Importar Tarefas", report.summary())
+
+    @timed("ScrumApp.export_backlog")
+    def export_backlog(self):
+        if not self.selected_project:
+            messagebox.showwarning("Seleção Inválida", "Por favor, selecione um projeto.")
+            return
+
+        path = filedialog.asksaveasfilename(title="Exportar Backlog", defaultextension=".csv", filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl")])
+        if not path:
+            return
+
+        try:
+            count = export_tasks(self.selected_project.product_backlog, path)
+        except (OSError, ValueError) as error:
+            messagebox.showerror("Erro", f"Não foi possível exportar o backlog: {error}")
+            return
+        messagebox.showinfo("Exportar Backlog", f"{count} tarefas exportadas para {path}.")
+
+    @timed("ScrumApp.show_backlog")
     def show_backlog(self):
         if not self.selected_project:
             messagebox.showwarning("Seleção Inválida", "Por favor, selecione um projeto.")
             return
 
-        backlog_info = self.selected_project.view_backlog()
-        messagebox.showinfo("Tarefas do Backlog", backlog_info)
+        project = self.selected_project
+        if not project.product_backlog:
+            messagebox.showinfo("Tarefas do Backlog", "Não há tarefas no backlog.")
+            return
+
+        open_task_table(self.master, f"Tarefas do Backlog: {project.project_name}", len(project.product_backlog), project.backlog_page)
 
+    @timed("ScrumApp.add_task")
     def add_task(self):
         if not self.selected_project:
             messagebox.showwarning("Seleção Inválida", "Por favor, selecione um projeto.")
@@ -241,29 +357,83 @@ class ScrumApp:
         assigned_to = simpledialog.askstring("Responsável", "Digite o nome do responsável:")
 
         if title and description and assigned_to:
-            self.selected_project.add_task_to_backlog(title, description, assigned_to)
-            save_projects('projects_data.json', {"projects": [project.to_dict() for project in self.projects]})
+            story_points = simpledialog.askinteger("Story Points", "Estimativa em pontos:", initialvalue=DEFAULT_STORY_POINTS, minvalue=0, maxvalue=MAX_STORY_POINTS)
+            priority = simpledialog.askinteger("Prioridade", "Prioridade (1 = mais urgente, 5 = menos urgente):", initialvalue=DEFAULT_PRIORITY, minvalue=PRIORITIES[0], maxvalue=PRIORITIES[-1])
+            story_points, priority = parse_estimate(story_points, priority)
+            self.record(AddTasks(self.selected_project))
+            task = self.selected_project.add_task_to_backlog(title, description, assigned_to, story_points, priority)
+            self.writer.post("add_task", self.selected_project.project_name, task.to_dict())
             messagebox.showinfo("Sucesso", "Tarefa adicionada ao backlog com sucesso!")
         else:
             messagebox.showwarning("Entrada Inválida", "Por favor, preencha todos os campos.")
 
+    @timed("ScrumApp.start_sprint")
     def start_sprint(self):
         if not self.selected_project:
             messagebox.showwarning("Seleção Inválida", "Por favor, selecione um projeto.")
             return
 
-        result = self.selected_project.start_sprint()
-        save_projects('projects_data.json', {"projects": [project.to_dict() for project in self.projects]})
+        error = self.selected_project.sprint_start_error()
+        if error:
+            messagebox.showinfo("Iniciar Sprint", error)
+            return
+
+        daily_capacity = simpledialog.askfloat("Capacidade da Sprint", "Pontos por dia de cada responsável:", initialvalue=DEFAULT_DAILY_CAPACITY, minvalue=0)
+        if daily_capacity is None:
+            return
+        plan = self.selected_project.plan_sprint(daily_capacity)
+        if not messagebox.askyesno("Iniciar Sprint", f"{plan.summary()}\n\nIniciar a Sprint com este plano?"):
+            return
+
+        project = self.selected_project
+        self.record(StartSprint(project, plan))
+        result = project.start_sprint(plan)
+        self.writer.post("start_sprint", project.project_name, plan.rows, project.sprint_started_at)
         messagebox.showinfo("Iniciar Sprint", result)
 
+    @timed("ScrumApp.set_task_status")
+    def set_task_status(self):
+        if not self.selected_project:
+            messagebox.showwarning("Seleção Inválida", "Por favor, selecione um projeto.")
+            return
+
+        project = self.selected_project
+        if not project.sprint_tasks:
+            messagebox.showinfo("Alterar Status", "Não há tarefas na Sprint.")
+            return
+
+        number = simpledialog.askinteger("Alterar Status", "Número da tarefa da Sprint:", minvalue=1, maxvalue=len(project.sprint_tasks))
+        if number is None:
+            return
+        status = simpledialog.askstring("Alterar Status", f"Novo status ({', '.join(STATUSES)}):", initialvalue=project.sprint_tasks[number - 1].status)
+        if not status:
+            return
+
+        timestamp = current_timestamp()
+        change = SetTaskStatus(project, True, number - 1)
+        try:
+            message = project.set_task_status(True, number - 1, status, timestamp)
+        except ValueError as error:
+            messagebox.showwarning("Entrada Inválida", str(error))
+            return
+        self.record(change)
+        self.writer.post("set_task_status", project.project_name, True, number - 1, status, timestamp)
+        messagebox.showinfo("Alterar Status", message)
+
+    @timed("ScrumApp.show_sprint_tasks")
     def show_sprint_tasks(self):
         if not self.selected_project:
             messagebox.showwarning("Seleção Inválida", "Por favor, selecione um projeto.")
             return
 
-        sprint_tasks_info = self.selected_project.view_sprint_tasks()
-        messagebox.showinfo("Tarefas da Sprint", sprint_tasks_info)
+        project = self.selected_project
+        if not project.sprint_tasks:
+            messagebox.showinfo("Tarefas da Sprint", "Não há tarefas na Sprint.")
+            return
+
+        open_task_table(self.master, f"Tarefas da Sprint: {project.project_name}", len(project.sprint_tasks), project.sprint_page)
 
+    @timed("ScrumApp.set_sprint_info")
     def set_sprint_info(self):
         if not self.selected_project:
             messagebox.showwarning("Seleção Inválida", "Por favor, selecione um projeto.")
@@ -298,7 +468,15 @@ class ScrumApp:
 
                 duration = int(duration) if duration else 0
 
+                self.record(SetSprintInfo(self.selected_project))
                 message = self.selected_project.set_sprint_info(planning_date, daily_time, duration)
+                self.writer.post(
+                    "set_sprint_info",
+                    self.selected_project.project_name,
+                    planning_date.strftime("%Y-%m-%d"),
+                    daily_time.strftime("%H:%M") if daily_time else None,
+                    duration
+                )
                 messagebox.showinfo("Sucesso", message)
                 sprint_info_window.destroy()
             except ValueError as e:
@@ -307,7 +485,15 @@ class ScrumApp:
         tk.Button(sprint_info_window, text="Definir", command=submit_sprint_info, bg="#4CAF50", fg="white").pack(pady=10)
 
 
-if __name__ == "__main__":
+def run(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py", description="Gerenciador de Projetos Scrum")
+    parser.add_argument("--instrument", action="store_true", help="mede o tempo das ações (o mesmo que SCRUM_INSTRUMENT=1)")
+    if parser.parse_args(argv).instrument:
+        instrumentation.enable()
     root = tk.Tk()
     app = ScrumApp(root)
     root.mainloop()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,118 @@
+import json
+from json.encoder import encode_basestring
+from taskStore import DEFAULT_PRIORITY, DEFAULT_STORY_POINTS, assignees, statuses
+import instrumentation
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Formato dos dados no disco. O arquivo JSON leva "schema_version" no cabeçalho e quem lê
+# migra as versões anteriores passo a passo (MIGRATIONS) antes de usar os dados:
+#   1: arquivos sem "schema_version" (scrumProject.py antigo, main.py antes do journal, snapshot
+#      por linhas até aqui): sprint_tasks, sprint_started_at, sprint_history, story_points,
+#      priority e até status podem faltar.
+#   2: todo projeto e toda tarefa têm todos os campos (tarefas na ordem de to_dict).
+# Arquivos de uma versão mais nova que SCHEMA_VERSION são recusados em vez de lidos pela metade.
+# O SQLite guarda a mesma versão em PRAGMA user_version; o snapshot binário tem a sua própria.
+
+SCHEMA_VERSION = 2
+PROJECT_DEFAULTS = (
+    ("sprint_planning_date", None),
+    ("daily_scrum_time", None),
+    ("sprint_duration", 0),
+    ("sprint_started_at", None),
+    ("sprint_history", None)
+)
+
+
+# JSON: orjson quando instalado (bem mais rápido para ler e gravar), senão o json da biblioteca padrão
+
+if orjson is not None:
+    loads = orjson.loads
+
+    def dumps(value):
+        return orjson.dumps(value)
+else:
+    loads = json.loads
+
+    def dumps(value):
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+# Versões
+
+def check_version(version):
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"Os dados foram gravados por uma versão mais nova do app (formato {version}; esta lê até o {SCHEMA_VERSION}).")
+
+
+def normalize_task(task):
+    normalized = {
+        "title": task["title"],
+        "description": task["description"],
+        "assigned_to": task["assigned_to"],
+        "status": task.get("status", "To Do"),
+        "story_points": task.get("story_points", DEFAULT_STORY_POINTS),
+        "priority": task.get("priority", DEFAULT_PRIORITY)
+    }
+    if task.get("events"):
+        normalized["events"] = task["events"]
+    return normalized
+
+
+def migrate_1_to_2(data):
+    for project_data in data.get("projects", []):
+        for field, default in PROJECT_DEFAULTS:
+            project_data.setdefault(field, default)
+        project_data["sprint_history"] = project_data["sprint_history"] or []
+        project_data["product_backlog"] = [normalize_task(task) for task in project_data.get("product_backlog") or []]
+        project_data["sprint_tasks"] = [normalize_task(task) for task in project_data.get("sprint_tasks") or []]
+    return data
+
+
+# versão -> função que leva os dados dessa versão para a seguinte
+MIGRATIONS = {
+    1: migrate_1_to_2
+}
+
+
+def migrate(data):
+    version = data.get("schema_version", 1)
+    check_version(version)
+    while version < SCHEMA_VERSION:
+        data = MIGRATIONS[version](data)
+        version += 1
+        instrumentation.add("schema_migrations")
+    data["schema_version"] = version
+    return data
+
+
+# Codificação rápida: o JSON de cada tarefa sai direto das colunas do TaskStore, sem montar um
+# dict por tarefa (to_dict) para depois serializar. Responsáveis e status são codificados uma
+# vez por código; só títulos, descrições e eventos são codificados tarefa a tarefa. Usado na
+# exportação JSONL (bulkIO.export_tasks), que grava uma linha por tarefa.
+
+def encode_task_lines(store):
+    names = [encode_basestring(name) for name in assignees.values]
+    status_names = [encode_basestring(status) for status in statuses.values]
+    for title, description, assignee, status, points, priority, events in zip(
+        store.titles, store.descriptions, store.assignee_codes, store.status_codes,
+        store.story_points, store.priorities, store.events
+    ):
+        yield (
+            f'{{"title":{encode_basestring(title)},"description":{encode_basestring(description)},'
+            f'"assigned_to":{names[assignee]},"status":{status_names[status]},"story_points":{points},"priority":{priority}'
+            + (f',"events":{json.dumps(events, separators=(",", ":"), ensure_ascii=False)}}}' if events else "}")
+        )
+
+
+def load_data(file_name):
+    # Documento inteiro já migrado para SCHEMA_VERSION; arquivo inexistente é um documento vazio
+    try:
+        with open(file_name, 'rb') as file:
+            data = loads(file.read()) or {}
+    except FileNotFoundError:
+        data = {}
+    return migrate(data)
@@ -0,0 +1,100 @@
+import sqlite3
+import threading
+import time
+from instrumentation import timed
+
+# Erros que podem passar sozinhos (disco cheio, unidade de rede, banco travado por outra
+# instância): o lote volta para a fila. Qualquer outro se repetiria em toda tentativa.
+TRANSIENT_ERRORS = (OSError, sqlite3.OperationalError)
+
+
+class BatchDiscarded(Exception):
+    # O lote falhou com um erro que não passa sozinho e foi descartado; a memória dos projetos
+    # envolvidos tem alterações que não foram para o disco
+    def __init__(self, error, batch):
+        super().__init__(str(error))
+        self.error = error
+        self.project_names = {
+            args[0]["project_name"] if operation == "add_project" else args[0] for operation, args in batch
+        }
+
+
+class BackgroundWriter:
+    # Recebe as mutações da interface e as grava numa thread separada. Rajadas de
+    # edições são agrupadas: a gravação só acontece depois de `delay` segundos sem
+    # novas mutações, e todas as pendentes vão para o storage de uma vez.
+    def __init__(self, storage, master, on_error, delay=0.5, max_pending=20):
+        self.storage = storage
+        self.master = master
+        self.on_error = on_error
+        self.delay = delay
+        self.max_pending = max_pending
+        self.pending = []
+        self.flushing = False
+        self.last_post = 0.0
+        self.lock = threading.Lock()
+        self.dirty = threading.Event()
+        self.stopping = False
+        self.thread = threading.Thread(target=self.run, name="scrum-writer", daemon=True)
+        self.thread.start()
+
+    def post(self, operation, *args):
+        # Os argumentos já devem estar serializados (dicts/strings), nunca objetos do modelo
+        with self.lock:
+            self.pending.append((operation, args))
+            self.last_post = time.monotonic()
+        self.dirty.set()
+
+    def run(self):
+        while True:
+            self.dirty.wait()
+            if self.stopping:
+                return
+            while True:
+                # Não espera a rajada acabar se a fila já está grande (ex.: importação em lote)
+                with self.lock:
+                    remaining = self.last_post + self.delay - time.monotonic()
+                    full = len(self.pending) >= self.max_pending
+                if remaining <= 0 or full or self.stopping:
+                    break
+                time.sleep(min(remaining, 0.05))
+            if self.stopping:
+                return
+            try:
+                self.flush()
+            except Exception as error:
+                self.master.after(0, self.on_error, error)
+
+    def idle(self):
+        # Nada na fila nem sendo gravado: o que está no disco já inclui todas as mutações locais
+        with self.lock:
+            return not self.pending and not self.flushing
+
+    @timed("BackgroundWriter.flush")
+    def flush(self):
+        with self.lock:
+            batch, self.pending = self.pending, []
+            self.flushing = bool(batch)
+            self.dirty.clear()
+        if not batch:
+            return
+        try:
+            self.storage.apply_batch(batch)
+        except TRANSIENT_ERRORS:
+            # O storage desfaz o lote inteiro: devolvido à fila, é tentado de novo na próxima
+            # gravação ou ao sair
+            with self.lock:
+                self.pending = batch + self.pending
+            raise
+        except Exception as error:
+            # Tentar de novo falharia igual e travaria a fila para sempre
+            raise BatchDiscarded(error, batch) from error
+        finally:
+            with self.lock:
+                self.flushing = False
+
+    def close(self):
+        self.stopping = True
+        self.dirty.set()
+        self.thread.join()
+        self.flush()
@@ -0,0 +1,126 @@
+import tkinter as tk
+import customtkinter as ctk
+import instrumentation
+
+ROW_HEIGHT = 130
+CARD_HEIGHT = 120
+
+
+class ProjectCard:
+    def __init__(self, parent, on_select, on_scroll):
+        self.project = None
+        self.on_select = on_select
+
+        self.frame = ctk.CTkFrame(parent, fg_color="#333", corner_radius=10, height=CARD_HEIGHT)
+        self.frame.pack_propagate(False)
+
+        self.project_name_label = ctk.CTkLabel(self.frame, text="", font=("Helvetica", 16, "bold"))
+        self.project_name_label.pack(anchor="w", pady=10, padx=10)
+
+        self.scrum_master_label = ctk.CTkLabel(self.frame, text="", text_color="#666666")
+        self.scrum_master_label.pack(anchor="w", padx=10)
+
+        self.select_button = ctk.CTkButton(self.frame, text="Selecionar", command=self.select, fg_color="#2196F3", hover_color="#1976D2", text_color="white")
+        self.select_button.pack(pady=5)
+
+        for widget in (self.frame, self.project_name_label, self.scrum_master_label):
+            widget.bind("<MouseWheel>", on_scroll)
+            widget.bind("<Button-4>", on_scroll)
+            widget.bind("<Button-5>", on_scroll)
+
+    def show(self, project):
+        # Só reconfigura os labels quando o cartão passa a mostrar outro projeto
+        if project is self.project:
+            return
+        self.project = project
+        self.project_name_label.configure(text=project.project_name)
+        self.scrum_master_label.configure(text=f"Scrum Master: {project.scrum_master}")
+
+    def select(self):
+        if self.project is not None:
+            self.on_select(self.project)
+
+
+class VirtualProjectList(tk.Frame):
+    # Lista virtualizada: só existem cartões para as linhas visíveis, e eles são
+    # reaproveitados durante a rolagem em vez de recriados.
+    def __init__(self, master, projects, on_select, **kwargs):
+        super().__init__(master, **kwargs)
+        self.projects = projects
+        self.on_select = on_select
+        self.cards = []
+        self.offset = 0
+
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.viewport = tk.Frame(self, bg=kwargs.get("bg", "#ffffff"))
+        self.viewport.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.viewport.bind("<Configure>", lambda event: self.refresh())
+        self.viewport.bind("<MouseWheel>", self.on_scroll)
+        self.viewport.bind("<Button-4>", self.on_scroll)
+        self.viewport.bind("<Button-5>", self.on_scroll)
+
+    def total_height(self):
+        return len(self.projects) * ROW_HEIGHT
+
+    def clamp_offset(self):
+        max_offset = max(0, self.total_height() - self.viewport.winfo_height())
+        self.offset = min(max(0, self.offset), max_offset)
+
+    def yview(self, *args):
+        height = self.viewport.winfo_height()
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * self.total_height())
+        elif args[0] == "scroll":
+            step = height if args[2] == "pages" else ROW_HEIGHT
+            self.offset += int(args[1]) * step
+        self.refresh()
+
+    def on_scroll(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.yview("scroll", -1, "units")
+        else:
+            self.yview("scroll", 1, "units")
+
+    def refresh(self):
+        height = self.viewport.winfo_height()
+        visible_rows = height // ROW_HEIGHT + 2
+        while len(self.cards) < visible_rows:
+            self.cards.append(ProjectCard(self.viewport, self.on_select, self.on_scroll))
+
+        self.clamp_offset()
+        first = self.offset // ROW_HEIGHT
+        shift = self.offset % ROW_HEIGHT
+        for row, card in enumerate(self.cards):
+            index = first + row
+            if row < visible_rows and index < len(self.projects):
+                card.show(self.projects[index])
+                card.frame.place(x=10, y=row * ROW_HEIGHT - shift + 5, relwidth=0.95)
+            else:
+                card.frame.place_forget()
+
+        instrumentation.set_value("project_cards", len(self.cards))
+        total = self.total_height()
+        if total <= height:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + height) / total)
+
+    def set_projects(self, projects):
+        self.projects = projects
+        for card in self.cards:
+            card.project = None
+        self.refresh()
+
+    def insert(self, index):
+        # Chamado depois que o projeto já foi inserido em self.projects
+        if index < self.offset // ROW_HEIGHT:
+            self.offset += ROW_HEIGHT
+        self.refresh()
+
+    def remove(self, index):
+        # Chamado depois que o projeto já foi removido de self.projects
+        if index < self.offset // ROW_HEIGHT:
+            self.offset -= ROW_HEIGHT
+        self.refresh()
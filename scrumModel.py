@@ -0,0 +1,279 @@
+import os
+from datetime import datetime, time, timedelta
+from taskStore import DEFAULT_PRIORITY, DEFAULT_STORY_POINTS, EVENT_SPRINT, STATUSES, TaskStore, statuses
+from sprintPlanner import DEFAULT_DAILY_CAPACITY, plan_sprint
+from instrumentation import timed
+
+DATA_FILE = os.environ.get("SCRUM_DATA_FILE", "projects_data.json")
+
+def parse_date(value):
+    # fromisoformat é bem mais rápido que strptime; strptime fica para formatos sem zero à esquerda
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, "%Y-%m-%d")
+
+def parse_time(value):
+    try:
+        return time.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, "%H:%M").time()
+
+def current_timestamp():
+    # Segundos desde a época, com milissegundos: é o que vai para os eventos e para o disco
+    return round(datetime.now().timestamp(), 3)
+
+def project_from_data(storage, project_data):
+    project = ScrumProject(
+        project_data['project_name'],
+        project_data['scrum_master'],
+        project_data['sprint_planning_date'],
+        project_data['daily_scrum_time'],
+        project_data['sprint_duration']
+    )
+    project.sprint_started_at = project_data.get('sprint_started_at')
+    project.sprint_history = project_data.get('sprint_history') or []
+    if 'product_backlog' in project_data:
+        project.product_backlog = TaskStore.from_dicts(project_data['product_backlog'])
+        project.sprint_tasks = TaskStore.from_dicts(project_data.get('sprint_tasks', []))
+    else:
+        # As tarefas só são lidas quando o projeto é aberto pela primeira vez
+        project.set_loader(
+            lambda data=project_data: storage.load_tasks(data),
+            project_data['backlog_count'],
+            project_data['sprint_count']
+        )
+    return project
+
+@timed("load_projects")
+def load_projects(storage):
+    return [project_from_data(storage, project_data) for project_data in storage.load()]
+
+class Task:
+    __slots__ = ("title", "description", "assigned_to", "status", "story_points", "priority", "events")
+
+    def __init__(self, title, description, assigned_to, status="To Do", story_points=DEFAULT_STORY_POINTS, priority=DEFAULT_PRIORITY, events=None):
+        self.title = title
+        self.description = description
+        self.assigned_to = assigned_to
+        self.status = status
+        self.story_points = story_points
+        self.priority = priority
+        self.events = events or []
+
+    def to_dict(self):
+        task = {
+            "title": self.title,
+            "description": self.description,
+            "assigned_to": self.assigned_to,
+            "status": self.status,
+            "story_points": self.story_points,
+            "priority": self.priority
+        }
+        if self.events:
+            task["events"] = [list(event) for event in self.events]
+        return task
+
+    def __str__(self):
+        return f"[{self.status}] Tarefa: {self.title}, Responsável: {self.assigned_to}, Pontos: {self.story_points}, Prioridade: {self.priority}"
+
+class ScrumProject:
+    def __init__(self, project_name, scrum_master, sprint_planning_date=None, daily_scrum_time=None, sprint_duration=0):
+        self.project_name = project_name
+        self.scrum_master = scrum_master
+        self.loader = None
+        self._product_backlog = TaskStore()
+        self.sprint_planning_date = parse_date(sprint_planning_date) if sprint_planning_date else None
+        self.daily_scrum_time = parse_time(daily_scrum_time) if daily_scrum_time else None
+        self.sprint_duration = sprint_duration
+        self._sprint_tasks = TaskStore()
+        self.sprint_started_at = None
+        # [início, fim, pontos planejados, pontos concluídos] de cada sprint encerrada
+        self.sprint_history = []
+        # Recebem task_added, status_changed e sprint_started (ex.: sprintAnalytics.Analytics)
+        self.listeners = []
+
+    def notify(self, event, *args):
+        for listener in self.listeners:
+            getattr(listener, event)(self, *args)
+
+    def set_loader(self, loader, backlog_count, sprint_count):
+        self.loader = loader
+        self.counts = (backlog_count, sprint_count)
+
+    @timed("ScrumProject.hydrate")
+    def hydrate(self):
+        if self.loader is None:
+            return
+        backlog, sprint_tasks = self.loader()
+        # loader só some depois das tarefas prontas: o apiServer hidrata fora do loop de eventos
+        self._product_backlog = TaskStore.from_dicts(backlog)
+        self._sprint_tasks = TaskStore.from_dicts(sprint_tasks)
+        self.loader = None
+
+    @property
+    def product_backlog(self):
+        if self.loader is not None:
+            self.hydrate()
+        return self._product_backlog
+
+    @product_backlog.setter
+    def product_backlog(self, tasks):
+        if self.loader is not None:
+            self.hydrate()
+        self._product_backlog = tasks if isinstance(tasks, TaskStore) else TaskStore(tasks)
+
+    @property
+    def sprint_tasks(self):
+        if self.loader is not None:
+            self.hydrate()
+        return self._sprint_tasks
+
+    @sprint_tasks.setter
+    def sprint_tasks(self, tasks):
+        if self.loader is not None:
+            self.hydrate()
+        self._sprint_tasks = tasks if isinstance(tasks, TaskStore) else TaskStore(tasks)
+
+    @property
+    def backlog_count(self):
+        return self.counts[0] if self.loader else len(self._product_backlog)
+
+    @property
+    def sprint_count(self):
+        return self.counts[1] if self.loader else len(self._sprint_tasks)
+
+    def set_sprint_info(self, planning_date, daily_time, duration):
+        self.sprint_planning_date = planning_date
+        self.daily_scrum_time = daily_time
+        self.sprint_duration = duration
+        return f"Informações da Sprint definidas: Data de Planejamento - {planning_date}, Hora da Daily Scrum - {daily_time}, Duração - {duration} dias."
+
+    def add_task_to_backlog(self, title, description, assigned_to, story_points=DEFAULT_STORY_POINTS, priority=DEFAULT_PRIORITY, status="To Do"):
+        task = self.product_backlog.add(title, description, assigned_to, status, story_points, priority)
+        self.notify("task_added", task.row)
+        return task
+
+    def set_task_status(self, in_sprint, row, status, timestamp=None):
+        # row começa em 0; quem persiste a mudança grava o mesmo timestamp
+        if status not in STATUSES:
+            raise ValueError(f"Status inválido: '{status}' (use {', '.join(STATUSES)}).")
+        tasks = self.sprint_tasks if in_sprint else self.product_backlog
+        if not 0 <= row < len(tasks):
+            raise ValueError(f"A tarefa {row + 1} não existe {'na Sprint' if in_sprint else 'no backlog'}.")
+        old_status = tasks[row].status
+        timestamp = current_timestamp() if timestamp is None else timestamp
+        tasks.set_status(row, status, timestamp)
+        self.notify("status_changed", in_sprint, row, old_status, timestamp)
+        return f"Tarefa '{tasks[row].title}' agora está em {status}."
+
+    # Inversos das alterações acima, usados pelo histórico de desfazer (history.py). Valem para o
+    # estado logo depois da alteração: o histórico desfaz sempre da mais recente para a mais antiga.
+
+    def remove_last_tasks(self, count):
+        # Devolve as tarefas removidas num store, para refazer com restore_tasks
+        backlog = self.product_backlog
+        return backlog.truncate(len(backlog) - count)
+
+    def restore_tasks(self, tasks):
+        self.product_backlog.extend(tasks)
+
+    def revert_task_status(self, in_sprint, row, status):
+        (self.sprint_tasks if in_sprint else self.product_backlog).revert_status(row, status)
+
+    def undo_start_sprint(self, rows, sprint_tasks, started_at):
+        # As tarefas da sprint voltam às posições rows do backlog, sem o evento de entrada,
+        # e sprint_tasks (a sprint anterior) volta a valer
+        selected = self.sprint_tasks
+        for row in range(len(selected)):
+            selected.drop_last_event(row)
+        if self.product_backlog:
+            self.product_backlog = TaskStore.merge(selected, self.product_backlog, rows)
+        else:
+            # O backlog inteiro tinha ido para a sprint: o mesmo store volta, sem cópia
+            self.product_backlog = selected
+        self.sprint_tasks = sprint_tasks
+        if started_at is not None or sprint_tasks:
+            self.sprint_history.pop()
+        self.sprint_started_at = started_at
+
+    def sprint_start_error(self):
+        if not self.sprint_planning_date:
+            return "Reunião de Planejamento da Sprint ainda não foi agendada."
+
+        if datetime.today().date() < self.sprint_planning_date.date():
+            return f"A Sprint não pode começar antes da Reunião de Planejamento em {self.sprint_planning_date.date()}."
+        return None
+
+    def plan_sprint(self, daily_capacity=DEFAULT_DAILY_CAPACITY, capacities=None):
+        return plan_sprint(self.product_backlog, self.sprint_duration, daily_capacity, capacities)
+
+    @timed("ScrumProject.start_sprint")
+    def start_sprint(self, plan=None, timestamp=None):
+        # Quem persiste a sprint grava plan.rows e sprint_started_at; sem plano, usa a capacidade padrão
+        error = self.sprint_start_error()
+        if error:
+            return error
+
+        if plan is None or plan.backlog is not self.product_backlog:
+            plan = self.plan_sprint()
+        timestamp = current_timestamp() if timestamp is None else timestamp
+        if self.sprint_started_at is not None or self.sprint_tasks:
+            self.sprint_history.append([self.sprint_started_at, timestamp, *self.sprint_tasks.points_summary()])
+        today = datetime.today()
+        if len(plan.rows) == len(self.product_backlog):
+            # O store do backlog passa inteiro para a sprint, sem copiar tarefa por tarefa
+            self.sprint_tasks, self.product_backlog = self.product_backlog, TaskStore()
+        else:
+            self.sprint_tasks, self.product_backlog = self.product_backlog.split(plan.rows)
+        sprint_tasks = self.sprint_tasks
+        for row, status in enumerate(sprint_tasks.status_codes):
+            sprint_tasks.add_event(row, timestamp, EVENT_SPRINT, statuses.values[status])
+        self.sprint_started_at = timestamp
+        self.notify("sprint_started", timestamp)
+        return (f"Sprint iniciada com {len(plan.rows)} tarefas ({plan.points} pontos)! "
+                f"Ela terminará em {today + timedelta(days=self.sprint_duration)}.")
+
+    def iter_tasks(self, tasks, offset=0, limit=None):
+        stop = len(tasks) if limit is None else min(len(tasks), offset + limit)
+        for row in range(max(0, offset), stop):
+            yield row + 1, tasks[row]
+
+    def backlog_page(self, offset=0, limit=None):
+        return self.iter_tasks(self.product_backlog, offset, limit)
+
+    def sprint_page(self, offset=0, limit=None):
+        return self.iter_tasks(self.sprint_tasks, offset, limit)
+
+    def view_backlog(self):
+        if not self.product_backlog:
+            return "Não há tarefas no backlog."
+
+        return "\nBacklog do Produto:\n" + "".join(f"{i}. {task}\n" for i, task in self.backlog_page())
+
+    def view_sprint_tasks(self):
+        if not self.sprint_tasks:
+            return "Não há tarefas na Sprint."
+
+        return "\nTarefas da Sprint:\n" + "".join(f"{i}. {task}\n" for i, task in self.sprint_page())
+
+    def show_scrum_info(self):
+        info = f"\nProjeto: {self.project_name}\n"
+        info += f"Scrum Master: {self.scrum_master}\n"
+        info += f"Data da Reunião de Planejamento da Sprint: {self.sprint_planning_date.date() if self.sprint_planning_date else 'Não definida'}\n"
+        info += f"Horário do Daily Scrum: {self.daily_scrum_time if self.daily_scrum_time else 'Não definido'}\n"
+        return info
+
+    @timed("ScrumProject.to_dict")
+    def to_dict(self):
+        return {
+            "project_name": self.project_name,
+            "scrum_master": self.scrum_master,
+            "sprint_planning_date": self.sprint_planning_date.strftime("%Y-%m-%d") if self.sprint_planning_date else None,
+            "daily_scrum_time": self.daily_scrum_time.strftime("%H:%M") if self.daily_scrum_time else None,
+            "sprint_duration": self.sprint_duration,
+            "sprint_started_at": self.sprint_started_at,
+            "sprint_history": self.sprint_history,
+            "product_backlog": self.product_backlog.to_dicts(),
+            "sprint_tasks": self.sprint_tasks.to_dicts()
+        }
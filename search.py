@@ -0,0 +1,79 @@
+import shlex
+from taskStore import assignees, statuses, tokenize
+
+
+def normalize_status(value):
+    wanted = value.lower().replace(" ", "")
+    for status in statuses.values:
+        if status.lower().replace(" ", "") == wanted:
+            return status
+    return value
+
+
+def parse_query(query):
+    # Ex.: login erro @"Maria Silva" status:"In Progress"
+    try:
+        parts = shlex.split(query)
+    except ValueError:
+        parts = query.split()
+
+    words = []
+    assigned_to = None
+    status = None
+    for part in parts:
+        if part.startswith("@") and len(part) > 1:
+            assigned_to = part[1:]
+        elif part.lower().startswith("status:"):
+            status = normalize_status(part[len("status:"):])
+        else:
+            words.append(part)
+    return " ".join(words), assigned_to, status
+
+
+class SearchResults:
+    def __init__(self):
+        self.segments = []
+        self.count = 0
+
+    def add(self, project, list_name, store, rows):
+        if rows:
+            self.segments.append((project, list_name, store, rows))
+            self.count += len(rows)
+
+    def __len__(self):
+        return self.count
+
+    def page(self, offset=0, limit=None):
+        stop = self.count if limit is None else min(self.count, offset + limit)
+        start = 0
+        for project, list_name, store, rows in self.segments:
+            end = start + len(rows)
+            if end > offset and start < stop:
+                for position in range(max(offset, start) - start, min(stop, end) - start):
+                    yield f"{project.project_name} / {list_name} {rows[position] + 1}", store[rows[position]]
+            if end >= stop:
+                break
+            start = end
+
+
+def search_tasks(projects, text="", assigned_to=None, status=None):
+    # Só procura nos projetos já carregados, para não forçar a leitura de todos os backlogs
+    results = SearchResults()
+    tokens = tokenize(text)
+    assignee_code = None
+    status_code = None
+    if assigned_to is not None:
+        assignee_code = assignees.codes.get(assigned_to)
+        if assignee_code is None:
+            return results
+    if status is not None:
+        status_code = statuses.codes.get(status)
+        if status_code is None:
+            return results
+
+    for project in projects:
+        if project.loader is not None:
+            continue
+        for list_name, store in (("Backlog", project.product_backlog), ("Sprint", project.sprint_tasks)):
+            results.add(project, list_name, store, store.query(tokens, assignee_code, status_code))
+    return results
@@ -0,0 +1,309 @@
+import json
+import os
+from array import array
+from collections import Counter
+from taskStore import EVENT_SPRINT, EVENT_STATUS, assignees, statuses
+from instrumentation import timed
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Indicadores materializados (burndown da sprint atual, velocidade por sprint e tarefas abertas
+# por responsável), atualizados a cada evento do modelo em vez de recalculados varrendo tarefas.
+# Cada projeto só é varrido uma vez, quando seus indicadores não estão no cache: o cache fica
+# ao lado dos dados e vale enquanto a versão do projeto no storage não muda.
+
+DONE = "Done"
+VELOCITY_WINDOW = 3
+
+
+def as_series(values, dtype):
+    # Séries para gráficos: arrays NumPy sem cópia quando disponível
+    if np is None:
+        return values
+    return np.frombuffer(values, dtype=dtype) if len(values) else np.zeros(0, dtype=dtype)
+
+
+def open_counts(store):
+    done = statuses.code(DONE)
+    if np is not None and len(store):
+        open_rows = np.frombuffer(store.status_codes, dtype=np.uint16) != done
+        counts = np.bincount(np.frombuffer(store.assignee_codes, dtype=np.uint32)[open_rows])
+        return Counter({assignees.values[code]: count for code, count in enumerate(counts.tolist()) if count})
+    return Counter(assignees.values[code] for code, status in zip(store.assignee_codes, store.status_codes) if status != done)
+
+
+class ProjectStats:
+    def __init__(self):
+        self.open_backlog = Counter()
+        self.open_sprint = Counter()
+        self.sprint_started_at = None
+        self.sprint_points = 0
+        self.done_points = 0
+        # Burndown da sprint atual: pontos restantes depois de cada evento
+        self.burndown_times = array("d")
+        self.burndown_remaining = array("q")
+        # Pontos concluídos em cada sprint encerrada
+        self.velocity = array("q")
+
+    @classmethod
+    @timed("ProjectStats.from_project")
+    def from_project(cls, project):
+        stats = cls()
+        stats.open_backlog = open_counts(project.product_backlog)
+        stats.open_sprint = open_counts(project.sprint_tasks)
+        stats.velocity = array("q", (done for _, _, _, done in project.sprint_history))
+        stats.sprint_started_at = project.sprint_started_at
+        stats.sprint_points, stats.done_points = project.sprint_tasks.points_summary()
+        stats.rebuild_burndown(project.sprint_tasks)
+        return stats
+
+    def rebuild_burndown(self, sprint_tasks):
+        if self.sprint_started_at is None:
+            return
+        remaining = 0
+        changes = []
+        for points, status_code, events in zip(sprint_tasks.story_points, sprint_tasks.status_codes, sprint_tasks.events):
+            status = statuses.values[status_code]
+            entry = None
+            for position in range(len(events or ()) - 1, -1, -1):
+                if events[position][1] == EVENT_SPRINT:
+                    entry = position
+                    break
+            if entry is None:
+                # Tarefa sem eventos: conta com o status atual desde o início
+                remaining += points if status != DONE else 0
+                continue
+            status = events[entry][2]
+            remaining += points if status != DONE else 0
+            for timestamp, kind, new_status in events[entry + 1:]:
+                if kind == EVENT_STATUS and (status == DONE) != (new_status == DONE):
+                    changes.append((timestamp, points if status == DONE else -points))
+                status = new_status if kind == EVENT_STATUS else status
+        changes.sort()
+        self.burndown_times = array("d", [self.sprint_started_at] + [timestamp for timestamp, _ in changes])
+        self.burndown_remaining = array("q", [remaining])
+        for _, delta in changes:
+            remaining += delta
+            self.burndown_remaining.append(remaining)
+
+    def open_total(self):
+        return self.open_backlog + self.open_sprint
+
+    # Eventos: devolvem a variação de tarefas abertas, que o Analytics soma no portfólio
+
+    def task_added(self, assigned_to, status):
+        if status == DONE:
+            return 0
+        self.open_backlog[assigned_to] += 1
+        return 1
+
+    def status_changed(self, in_sprint, assigned_to, points, old_status, new_status, timestamp):
+        if (old_status == DONE) == (new_status == DONE):
+            return 0
+        delta = 1 if old_status == DONE else -1
+        counts = self.open_sprint if in_sprint else self.open_backlog
+        counts[assigned_to] += delta
+        if in_sprint:
+            self.done_points -= delta * points
+            self.burndown_times.append(timestamp)
+            self.burndown_remaining.append(self.sprint_points - self.done_points)
+        return delta
+
+    def sprint_started(self, project, timestamp):
+        # As tarefas abertas da sprint anterior saem do projeto; as novas vieram do backlog
+        discarded = self.open_sprint
+        del self.velocity[len(project.sprint_history):]
+        self.velocity.extend(done for _, _, _, done in project.sprint_history[len(self.velocity):])
+        self.open_sprint = open_counts(project.sprint_tasks)
+        self.open_backlog -= self.open_sprint
+        self.sprint_started_at = timestamp
+        self.sprint_points, self.done_points = project.sprint_tasks.points_summary()
+        self.burndown_times = array("d", [timestamp])
+        self.burndown_remaining = array("q", [self.sprint_points - self.done_points])
+        return discarded
+
+    # Séries e resumo
+
+    def burndown_series(self):
+        return as_series(self.burndown_times, np.float64 if np else None), as_series(self.burndown_remaining, np.int64 if np else None)
+
+    def velocity_series(self):
+        return as_series(self.velocity, np.int64 if np else None)
+
+    def average_velocity(self, window=VELOCITY_WINDOW):
+        recent = self.velocity[-window:]
+        return sum(recent) / len(recent) if recent else None
+
+    def to_dict(self):
+        return {
+            "open_backlog": dict(self.open_backlog),
+            "open_sprint": dict(self.open_sprint),
+            "sprint_started_at": self.sprint_started_at,
+            "sprint_points": self.sprint_points,
+            "done_points": self.done_points,
+            "burndown_times": self.burndown_times.tolist(),
+            "burndown_remaining": self.burndown_remaining.tolist(),
+            "velocity": self.velocity.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.open_backlog = Counter(data["open_backlog"])
+        stats.open_sprint = Counter(data["open_sprint"])
+        stats.sprint_started_at = data["sprint_started_at"]
+        stats.sprint_points = data["sprint_points"]
+        stats.done_points = data["done_points"]
+        stats.burndown_times = array("d", data["burndown_times"])
+        stats.burndown_remaining = array("q", data["burndown_remaining"])
+        stats.velocity = array("q", data["velocity"])
+        return stats
+
+
+def read_cache(cache_file):
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError, TypeError):
+        return {}
+
+
+class Analytics:
+    # Ouvinte dos projetos (ScrumProject.listeners) e dono dos indicadores de todo o portfólio
+    def __init__(self, cache_file=None):
+        self.cache_file = cache_file
+        self.cached = read_cache(cache_file) if cache_file else {}
+        self.projects = []
+        self.stats = {}
+        self.open_by_assignee = Counter()
+
+    def track(self, projects, versions):
+        # Guarda a própria lista do chamador: projetos acrescentados depois passam por attach
+        self.projects = projects
+        for project in projects:
+            self.attach(project, versions.get(project.project_name))
+
+    def attach(self, project, version=None):
+        if self not in project.listeners:
+            project.listeners.append(self)
+        cached = self.cached.get(project.project_name)
+        if cached is not None and version is not None and cached["version"] == version:
+            self.set_stats(project, ProjectStats.from_dict(cached["stats"]))
+        elif project.loader is None:
+            # Já está em memória: calcular agora custa menos que carregar de novo depois
+            self.set_stats(project, ProjectStats.from_project(project))
+
+    def detach(self, project):
+        if self in project.listeners:
+            project.listeners.remove(self)
+        stats = self.stats.pop(project, None)
+        if stats is not None:
+            self.open_by_assignee -= stats.open_total()
+
+    def replace(self, old, new, version=None):
+        if old is not None:
+            self.detach(old)
+        self.attach(new, version)
+
+    def reset(self, project):
+        # Depois de desfazer/refazer (history.py) os indicadores do projeto são recalculados
+        self.set_stats(project, ProjectStats.from_project(project))
+
+    def set_stats(self, project, stats):
+        old = self.stats.get(project)
+        if old is not None:
+            self.open_by_assignee -= old.open_total()
+        if self not in project.listeners:
+            project.listeners.append(self)
+        self.stats[project] = stats
+        self.open_by_assignee += stats.open_total()
+
+    def ensure(self, project):
+        stats = self.stats.get(project)
+        if stats is None:
+            stats = ProjectStats.from_project(project)
+            self.set_stats(project, stats)
+        return stats
+
+    @timed("Analytics.ensure_all")
+    def ensure_all(self):
+        for project in self.projects:
+            self.ensure(project)
+
+    def task_added(self, project, row):
+        stats = self.stats.get(project)
+        if stats is not None:
+            task = project.product_backlog[row]
+            self.open_by_assignee[task.assigned_to] += stats.task_added(task.assigned_to, task.status)
+
+    def status_changed(self, project, in_sprint, row, old_status, timestamp):
+        stats = self.stats.get(project)
+        if stats is not None:
+            task = (project.sprint_tasks if in_sprint else project.product_backlog)[row]
+            delta = stats.status_changed(in_sprint, task.assigned_to, task.story_points, old_status, task.status, timestamp)
+            self.open_by_assignee[task.assigned_to] += delta
+
+    def sprint_started(self, project, timestamp):
+        stats = self.stats.get(project)
+        if stats is not None:
+            self.open_by_assignee -= stats.sprint_started(project, timestamp)
+
+    @timed("Analytics.dashboard")
+    def dashboard(self):
+        self.ensure_all()
+        rows = []
+        for project in self.projects:
+            stats = self.stats[project]
+            rows.append({
+                "project_name": project.project_name,
+                "sprint_started_at": stats.sprint_started_at,
+                "sprint_points": stats.sprint_points,
+                "done_points": stats.done_points,
+                "remaining_points": stats.sprint_points - stats.done_points,
+                "sprints": len(stats.velocity),
+                "last_velocity": stats.velocity[-1] if stats.velocity else None,
+                "average_velocity": stats.average_velocity(),
+                "open_tasks": sum(stats.open_backlog.values()) + sum(stats.open_sprint.values())
+            })
+        return {
+            "open_by_assignee": [
+                {"assigned_to": name, "open_tasks": count} for name, count in self.open_by_assignee.most_common() if count > 0
+            ],
+            "projects": rows
+        }
+
+    def save(self, versions, stale=()):
+        # stale: projetos que outra instância alterou e que este processo ainda não releu
+        if not self.cache_file:
+            return
+        data = {
+            name: cached for name, cached in self.cached.items()
+            if name not in stale and versions.get(name) == cached["version"]
+        }
+        for project, stats in self.stats.items():
+            version = versions.get(project.project_name)
+            if version is not None and project.project_name not in stale:
+                data[project.project_name] = {"version": version, "stats": stats.to_dict()}
+        temp_name = self.cache_file + ".tmp"
+        with open(temp_name, 'w', encoding='utf-8') as file:
+            json.dump(data, file, separators=(",", ":"))
+        os.replace(temp_name, self.cache_file)
+        self.cached = data
+
+
+def format_dashboard(data, limit=20):
+    lines = ["Tarefas abertas por responsável:"]
+    for item in data["open_by_assignee"][:limit]:
+        lines.append(f"  {item['assigned_to']:<24} {item['open_tasks']:>8}")
+    if len(data["open_by_assignee"]) > limit:
+        lines.append(f"  ... e mais {len(data['open_by_assignee']) - limit} responsáveis")
+    lines.append("")
+    lines.append("Projetos (sprint atual: concluído/planejado; velocidade média das últimas sprints):")
+    for row in data["projects"]:
+        average = f"{row['average_velocity']:.1f}" if row["average_velocity"] is not None else "-"
+        lines.append(f"  {row['project_name']:<24} {row['done_points']:>6}/{row['sprint_points']:<6} pontos  "
+                     f"velocidade {average:>6}  abertas {row['open_tasks']:>7}")
+    return "\n".join(lines)
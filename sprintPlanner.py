@@ -0,0 +1,215 @@
+import math
+from functools import lru_cache
+from taskStore import MAX_STORY_POINTS, assignees, statuses
+from instrumentation import timed
+
+# Planejamento da Sprint como uma mochila por responsável: cada pessoa tem uma capacidade
+# (pontos por dia x duração da Sprint) e cada tarefa vale seus pontos pesados pela prioridade,
+# então o plano entrega o máximo de pontos, dos mais urgentes para os menos urgentes.
+# Tarefas do mesmo responsável com os mesmos pontos e prioridade são intercambiáveis: a mochila
+# roda sobre essas classes (com quantidade) e, dentro de cada classe, entram as tarefas mais
+# antigas do backlog. O custo depende do número de classes, não do tamanho do backlog.
+# Com NumPy o agrupamento e a programação dinâmica são vetorizados; sem ele, o mesmo algoritmo
+# roda em Python puro. O NumPy só é importado no primeiro plano (load_numpy): importá-lo junto
+# com o módulo dobraria a partida do cli.py, que na maioria dos comandos não planeja nada.
+
+DEFAULT_DAILY_CAPACITY = 1.0
+DEFAULT_SPRINT_DAYS = 14
+PRIORITY_WEIGHTS = {1: 16, 2: 8, 3: 4, 4: 2, 5: 1}
+# Acima disso (itens x capacidade) a programação dinâmica dá lugar ao guloso por prioridade,
+# que fica muito perto do ótimo quando as tarefas são pequenas perto da capacidade
+MAX_DP_CELLS = 4_000_000
+MAX_DP_CELLS_PYTHON = 250_000
+DONE = statuses.code("Done")
+
+
+class SprintPlan:
+    def __init__(self, backlog, rows, days, capacities, loads):
+        self.backlog = backlog
+        self.rows = rows
+        self.days = days
+        self.capacities = capacities
+        self.loads = loads
+
+    @property
+    def points(self):
+        return sum(self.loads.values())
+
+    def to_dict(self):
+        return {
+            "days": self.days,
+            "task_count": len(self.rows),
+            "points": self.points,
+            "assignees": [
+                {"assigned_to": name, "capacity": capacity, "points": self.loads.get(name, 0)}
+                for name, capacity in sorted(self.capacities.items())
+            ],
+            "numbers": [row + 1 for row in self.rows]
+        }
+
+    def summary(self):
+        text = f"{len(self.rows)} de {len(self.backlog)} tarefas do backlog, {self.points} pontos em {self.days} dias."
+        for name, capacity in sorted(self.capacities.items()):
+            text += f"\n{name}: {self.loads.get(name, 0)} de {capacity} pontos"
+        return text
+
+
+@lru_cache(maxsize=None)
+def load_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def sprint_days(sprint_duration):
+    return sprint_duration if sprint_duration and sprint_duration > 0 else DEFAULT_SPRINT_DAYS
+
+
+def split_count(count):
+    # Divisão binária (1, 2, 4, ...): qualquer quantidade até count sai de uma combinação das partes
+    parts = []
+    size = 1
+    while count > 0:
+        part = min(size, count)
+        parts.append(part)
+        count -= part
+        size *= 2
+    return parts
+
+
+def solve_dp(items, capacity):
+    # Mochila 0/1 sobre as partes; keep[i][c] diz se a parte i entrou no melhor valor com capacidade c
+    keep = []
+    np = load_numpy()
+    if np is not None:
+        best = np.zeros(capacity + 1, dtype=np.int64)
+        for _, _, weight, value in items:
+            candidate = best[:capacity + 1 - weight] + value
+            better = candidate > best[weight:]
+            row = np.zeros(capacity + 1, dtype=bool)
+            row[weight:] = better
+            best[weight:] = np.where(better, candidate, best[weight:])
+            keep.append(row)
+    else:
+        best = [0] * (capacity + 1)
+        for _, _, weight, value in items:
+            row = bytearray(capacity + 1)
+            for c in range(capacity, weight - 1, -1):
+                candidate = best[c - weight] + value
+                if candidate > best[c]:
+                    best[c] = candidate
+                    row[c] = 1
+            keep.append(row)
+
+    taken = {}
+    c = capacity
+    for (klass, count, weight, _), row in zip(reversed(items), reversed(keep)):
+        if row[c]:
+            taken[klass] = taken.get(klass, 0) + count
+            c -= weight
+    return taken
+
+
+def solve_greedy(classes, capacity):
+    taken = {}
+    remaining = capacity
+    for klass in sorted(classes, key=lambda klass: (klass[1], -klass[0])):
+        points, _, count = klass
+        take = min(count, remaining // points)
+        if take:
+            taken[klass] = take
+            remaining -= take * points
+    return taken
+
+
+def solve_assignee(classes, capacity):
+    # classes: (pontos, prioridade, quantidade) com pontos > 0; devolve {classe: quantas entram}
+    items = []
+    for klass in classes:
+        points, priority, count = klass
+        for part in split_count(min(count, capacity // points)):
+            items.append((klass, part, part * points, part * points * PRIORITY_WEIGHTS[priority]))
+    if not items:
+        return {}
+    if len(items) * (capacity + 1) > (MAX_DP_CELLS if load_numpy() is not None else MAX_DP_CELLS_PYTHON):
+        return solve_greedy(classes, capacity)
+    return solve_dp(items, capacity)
+
+
+def group_rows(backlog, capacity_codes, default_capacity):
+    # {(código do responsável, pontos, prioridade): linhas em ordem crescente}, sem tarefas concluídas
+    # nem tarefas maiores que a capacidade do responsável
+    np = load_numpy()
+    if np is not None:
+        codes = np.frombuffer(backlog.assignee_codes, dtype=np.uint32).astype(np.int64)
+        points = np.frombuffer(backlog.story_points, dtype=np.uint16).astype(np.int64)
+        priorities = np.frombuffer(backlog.priorities, dtype=np.uint8).astype(np.int64)
+        capacities = np.full(len(assignees.values) + 1, default_capacity, dtype=np.int64)
+        for code, capacity in capacity_codes.items():
+            capacities[code] = capacity
+        eligible = (np.frombuffer(backlog.status_codes, dtype=np.uint16) != DONE) & (points <= capacities[codes])
+        rows = np.flatnonzero(eligible)
+        keys = (codes[rows] * (MAX_STORY_POINTS + 1) + points[rows]) * 8 + priorities[rows]
+        order = np.argsort(keys, kind="stable")
+        rows = rows[order]
+        unique, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+        return {
+            (key // 8 // (MAX_STORY_POINTS + 1), key // 8 % (MAX_STORY_POINTS + 1), key % 8): rows[start:start + count]
+            for key, start, count in zip(unique.tolist(), starts.tolist(), counts.tolist())
+        }
+
+    groups = {}
+    for row, (code, points, priority, status) in enumerate(zip(backlog.assignee_codes, backlog.story_points, backlog.priorities, backlog.status_codes)):
+        if status != DONE and points <= capacity_codes.get(code, default_capacity):
+            groups.setdefault((code, points, priority), []).append(row)
+    return groups
+
+
+@timed("plan_sprint")
+def plan_sprint(backlog, sprint_duration, daily_capacity=DEFAULT_DAILY_CAPACITY, capacities=None):
+    # capacities: {responsável: pontos por dia} para quem foge do daily_capacity
+    days = sprint_days(sprint_duration)
+    default_capacity = math.floor(daily_capacity * days)
+    capacity_codes = {}
+    for name, per_day in (capacities or {}).items():
+        code = assignees.codes.get(name)
+        if code is not None:
+            capacity_codes[code] = math.floor(per_day * days)
+
+    groups = group_rows(backlog, capacity_codes, default_capacity)
+    by_assignee = {}
+    for code, points, priority in groups:
+        by_assignee.setdefault(code, []).append((points, priority))
+
+    selected = []
+    plan_capacities = {}
+    loads = {}
+    for code, keys in by_assignee.items():
+        capacity = capacity_codes.get(code, default_capacity)
+        name = assignees.values[code]
+        plan_capacities[name] = capacity
+        classes = []
+        for points, priority in keys:
+            rows = groups[(code, points, priority)]
+            if points == 0:
+                # Sem estimativa de esforço: não ocupa capacidade
+                selected.append(rows)
+            else:
+                classes.append((points, priority, len(rows)))
+        load = 0
+        for (points, priority, _), count in solve_assignee(classes, capacity).items():
+            selected.append(groups[(code, points, priority)][:count])
+            load += points * count
+        loads[name] = load
+    # Responsáveis sem nenhuma tarefa que caiba também aparecem no plano
+    for code in set(backlog.by_assignee) - set(by_assignee):
+        plan_capacities[assignees.values[code]] = capacity_codes.get(code, default_capacity)
+
+    np = load_numpy()
+    if np is not None:
+        rows = np.sort(np.concatenate(selected)).tolist() if selected else []
+    else:
+        rows = sorted(row for part in selected for row in part)
+    return SprintPlan(backlog, rows, days, plan_capacities, loads)
@@ -0,0 +1,580 @@
+import json
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from journal import CONFLICT_MESSAGES, ProjectJournal, merge_rows
+from modelCodec import SCHEMA_VERSION, check_version
+from taskStore import DEFAULT_PRIORITY, DEFAULT_STORY_POINTS, EVENT_SPRINT, EVENT_STATUS
+from instrumentation import timed
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    project_name TEXT NOT NULL,
+    scrum_master TEXT NOT NULL,
+    sprint_planning_date TEXT,
+    daily_scrum_time TEXT,
+    sprint_duration INTEGER NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL DEFAULT 0,
+    sprint_version INTEGER NOT NULL DEFAULT 0,
+    backlog_version INTEGER NOT NULL DEFAULT 0,
+    sprint_started_at REAL,
+    sprint_history TEXT
+);
+CREATE TABLE IF NOT EXISTS version_counter (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS backlog_tasks (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL REFERENCES projects(id),
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    assigned_to TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'To Do',
+    story_points INTEGER NOT NULL DEFAULT 1,
+    priority INTEGER NOT NULL DEFAULT 3,
+    events TEXT
+);
+CREATE TABLE IF NOT EXISTS sprint_tasks (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL REFERENCES projects(id),
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    assigned_to TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'To Do',
+    story_points INTEGER NOT NULL DEFAULT 1,
+    priority INTEGER NOT NULL DEFAULT 3,
+    events TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_projects_name ON projects(project_name);
+CREATE INDEX IF NOT EXISTS idx_backlog_project ON backlog_tasks(project_id);
+CREATE INDEX IF NOT EXISTS idx_backlog_assigned_to ON backlog_tasks(assigned_to);
+CREATE INDEX IF NOT EXISTS idx_backlog_status ON backlog_tasks(status);
+CREATE INDEX IF NOT EXISTS idx_sprint_project ON sprint_tasks(project_id);
+CREATE INDEX IF NOT EXISTS idx_sprint_assigned_to ON sprint_tasks(assigned_to);
+CREATE INDEX IF NOT EXISTS idx_sprint_status ON sprint_tasks(status);
+"""
+
+PROJECT_COLUMNS = (
+    "project_name", "scrum_master", "sprint_planning_date", "daily_scrum_time", "sprint_duration",
+    "sprint_started_at", "sprint_history"
+)
+TASK_COLUMNS = ("title", "description", "assigned_to", "status", "story_points", "priority", "events")
+INSERT_TASK = "INSERT INTO {} (project_id, " + ", ".join(TASK_COLUMNS) + ") VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+# Colunas que bancos de versões anteriores não têm
+ADDED_COLUMNS = {
+    "projects": (
+        ("version", "INTEGER NOT NULL DEFAULT 0"),
+        ("sprint_version", "INTEGER NOT NULL DEFAULT 0"),
+        ("backlog_version", "INTEGER NOT NULL DEFAULT 0"),
+        ("sprint_started_at", "REAL"),
+        ("sprint_history", "TEXT")
+    ),
+    "backlog_tasks": (
+        ("story_points", f"INTEGER NOT NULL DEFAULT {DEFAULT_STORY_POINTS}"),
+        ("priority", f"INTEGER NOT NULL DEFAULT {DEFAULT_PRIORITY}"),
+        ("events", "TEXT")
+    )
+}
+ADDED_COLUMNS["sprint_tasks"] = ADDED_COLUMNS["backlog_tasks"]
+
+
+def encode_json(value):
+    # Listas vazias ficam NULL
+    return json.dumps(value, separators=(",", ":")) if value else None
+
+
+def task_row(project_id, task_data):
+    return (
+        project_id,
+        task_data["title"],
+        task_data["description"],
+        task_data["assigned_to"],
+        task_data.get("status", "To Do"),
+        task_data.get("story_points", DEFAULT_STORY_POINTS),
+        task_data.get("priority", DEFAULT_PRIORITY),
+        encode_json(task_data.get("events"))
+    )
+
+
+def task_from_row(row):
+    task_data = dict(zip(TASK_COLUMNS, row))
+    events = task_data.pop("events")
+    if events:
+        task_data["events"] = json.loads(events)
+    return task_data
+
+
+def project_values(project_data):
+    values = [project_data.get(column) for column in PROJECT_COLUMNS]
+    values[-1] = encode_json(values[-1])
+    return tuple(values)
+
+
+def project_from_row(row):
+    project_data = dict(zip(PROJECT_COLUMNS, row))
+    project_data["sprint_history"] = json.loads(project_data["sprint_history"] or "[]")
+    return project_data
+
+
+class ProjectNotFound(KeyError):
+    pass
+
+
+class SqliteStorage:
+    def __init__(self, file_name):
+        self.file_name = file_name
+        # A conexão é compartilhada entre a interface e a thread de gravação, sempre sob self.lock
+        # Outras instâncias podem estar gravando: espera o lock do banco em vez de falhar logo
+        self.connection = sqlite3.connect(file_name, timeout=30, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.in_batch = False
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        # Mesma versão de formato do JSON (modelCodec); para o banco, migrar é criar as colunas que faltam
+        check_version(self.connection.execute("PRAGMA user_version").fetchone()[0])
+        self.connection.executescript(SCHEMA)
+        for table, added in ADDED_COLUMNS.items():
+            columns = [row[1] for row in self.connection.execute(f"PRAGMA table_info({table})")]
+            for column, definition in added:
+                if column not in columns:
+                    self.connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS idx_projects_version ON projects(version)")
+        with self.connection:
+            # Bancos anteriores ao contador continuam da maior versão já gravada
+            self.connection.execute(
+                "INSERT OR IGNORE INTO version_counter (id, version) SELECT 1, COALESCE(MAX(version), 0) FROM projects"
+            )
+        self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.project_ids = {}
+        # Versões conhecidas de cada projeto (da última alteração, do último início de sprint e da
+        # última remoção de tarefas do backlog), para separar as gravações das outras instâncias
+        self.versions = {}
+        self.sprint_versions = {}
+        self.backlog_versions = {}
+        # Projetos em que uma gravação local passou por cima da versão de outra instância: o banco
+        # tem alterações (sem conflito) que a memória ainda não viu
+        self.merged = set()
+        self.last_version = 0
+        self.data_version = None
+        self.conflicts = []
+
+    @contextmanager
+    def transaction(self):
+        # Dentro de apply_batch todas as operações compartilham uma única transação
+        with self.lock:
+            if self.in_batch:
+                yield
+            else:
+                with self.connection:
+                    # IMMEDIATE pega o lock de escrita já no início: as verificações de conflito
+                    # leem o estado mais recente e nenhuma outra instância grava até o commit
+                    if not self.connection.in_transaction:
+                        self.connection.execute("BEGIN IMMEDIATE")
+                    yield
+
+    @timed("SqliteStorage.apply_batch")
+    def apply_batch(self, operations):
+        # Se o lote falhar, a transação é desfeita e as versões conhecidas voltam junto
+        state = self.memory_state()
+        try:
+            with self.transaction():
+                self.in_batch = True
+                try:
+                    for operation, args in operations:
+                        # Cada operação num savepoint, para desfazer o que ela já tinha gravado se falhar
+                        self.connection.execute("SAVEPOINT operation")
+                        try:
+                            getattr(self, operation)(*args)
+                        except ProjectNotFound as error:
+                            # Outra instância removeu o projeto (criação desfeita): o resto do lote segue
+                            self.connection.execute("ROLLBACK TO operation")
+                            self.conflicts.append(CONFLICT_MESSAGES["removed"].format(error.args[0]))
+                        self.connection.execute("RELEASE operation")
+                finally:
+                    self.in_batch = False
+        except BaseException:
+            self.restore_memory_state(state)
+            raise
+
+    def memory_state(self):
+        return (
+            dict(self.project_ids), dict(self.versions), dict(self.sprint_versions),
+            dict(self.backlog_versions), set(self.merged), len(self.conflicts)
+        )
+
+    def restore_memory_state(self, state):
+        self.project_ids, self.versions, self.sprint_versions, self.backlog_versions, self.merged, conflict_count = state
+        del self.conflicts[conflict_count:]
+
+    def load(self):
+        # Só o índice dos projetos (com as contagens); as tarefas vêm sob demanda em load_tasks
+        projects = []
+        query = (
+            f"SELECT id, {', '.join(PROJECT_COLUMNS)}, "
+            "(SELECT COUNT(*) FROM backlog_tasks WHERE project_id = projects.id), "
+            "(SELECT COUNT(*) FROM sprint_tasks WHERE project_id = projects.id), "
+            "version, sprint_version, backlog_version FROM projects ORDER BY id"
+        )
+        with self.lock:
+            self.data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+            rows = self.connection.execute(query).fetchall()
+        count = len(PROJECT_COLUMNS)
+        for row in rows:
+            project_data = project_from_row(row[1:count + 1])
+            project_data["id"] = row[0]
+            project_data["backlog_count"], project_data["sprint_count"], version, sprint_version, backlog_version = row[count + 1:]
+            project_data["version"] = version
+            projects.append(project_data)
+            self.project_ids[project_data["project_name"]] = row[0]
+            self.versions[project_data["project_name"]] = version
+            self.sprint_versions[project_data["project_name"]] = sprint_version
+            self.backlog_versions[project_data["project_name"]] = backlog_version
+            self.last_version = max(self.last_version, version)
+        return projects
+
+    def load_project(self, project_name):
+        with self.lock:
+            row = self.connection.execute(
+                f"SELECT id, {', '.join(PROJECT_COLUMNS)}, version FROM projects WHERE project_name = ? ORDER BY id DESC LIMIT 1",
+                (project_name,)
+            ).fetchone()
+            if row is None:
+                return None
+            project_data = project_from_row(row[1:-1])
+            project_data["id"] = row[0]
+            project_data["version"] = row[-1]
+            project_data["product_backlog"], project_data["sprint_tasks"] = self.load_tasks(project_data)
+        self.project_ids[project_name] = row[0]
+        return project_data
+
+    def poll_changes(self):
+        # PRAGMA data_version só muda quando outra conexão grava no banco
+        with self.lock:
+            conflicts, self.conflicts = self.conflicts, []
+            merged, self.merged = self.merged, set()
+            data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self.data_version:
+                return sorted(merged), conflicts
+            self.data_version = data_version
+            rows = self.connection.execute(
+                "SELECT project_name, version, sprint_version, backlog_version FROM projects WHERE version > ? ORDER BY version",
+                (self.last_version,)
+            ).fetchall()
+            names = {row[0] for row in self.connection.execute("SELECT project_name FROM projects")}
+        # Projetos removidos por outra instância (criação desfeita) não deixam versão nova
+        changed = [project_name for project_name in self.versions if project_name not in names]
+        for project_name in changed:
+            self.forget_project(project_name)
+        changed += sorted(merged.intersection(names))
+        for project_name, version, sprint_version, backlog_version in rows:
+            if self.versions.get(project_name) != version and project_name not in merged:
+                changed.append(project_name)
+            self.versions[project_name] = version
+            self.sprint_versions[project_name] = sprint_version
+            self.backlog_versions[project_name] = backlog_version
+            self.last_version = version
+        return changed, conflicts
+
+    def touch(self, project_name, project_id):
+        # Versão global crescente, gravada na mesma transação da alteração. Vem de um contador
+        # próprio, não de MAX(version): remover o projeto mais recente faria a próxima alteração
+        # repetir uma versão que as outras instâncias já viram, e poll_changes a perderia.
+        current = self.connection.execute("SELECT version FROM projects WHERE id = ?", (project_id,)).fetchone()
+        if current is None:
+            # O id guardado é de um projeto que outra instância removeu
+            raise ProjectNotFound(project_name)
+        if project_name in self.versions and current[0] != self.versions[project_name]:
+            self.merged.add(project_name)
+        self.connection.execute("UPDATE version_counter SET version = version + 1 WHERE id = 1")
+        self.connection.execute(
+            "UPDATE projects SET version = (SELECT version FROM version_counter WHERE id = 1) WHERE id = ?",
+            (project_id,)
+        )
+        self.versions[project_name] = self.connection.execute(
+            "SELECT version FROM projects WHERE id = ?", (project_id,)
+        ).fetchone()[0]
+
+    def load_tasks(self, project_data):
+        tasks = []
+        with self.lock:
+            for table in ("backlog_tasks", "sprint_tasks"):
+                query = f"SELECT {', '.join(TASK_COLUMNS)} FROM {table} WHERE project_id = ? ORDER BY id"
+                tasks.append([task_from_row(row) for row in self.connection.execute(query, (project_data["id"],))])
+        return tasks[0], tasks[1]
+
+    def insert_project(self, project_data):
+        cursor = self.connection.execute(
+            f"INSERT INTO projects ({', '.join(PROJECT_COLUMNS)}) VALUES ({', '.join('?' * len(PROJECT_COLUMNS))})",
+            project_values(project_data)
+        )
+        project_id = cursor.lastrowid
+        self.connection.executemany(
+            INSERT_TASK.format("backlog_tasks"),
+            [task_row(project_id, task_data) for task_data in project_data.get("product_backlog", [])]
+        )
+        self.connection.executemany(
+            INSERT_TASK.format("sprint_tasks"),
+            [task_row(project_id, task_data) for task_data in project_data.get("sprint_tasks", [])]
+        )
+        self.project_ids[project_data["project_name"]] = project_id
+        self.touch(project_data["project_name"], project_id)
+
+    def add_project(self, project_data):
+        # Mesmas regras de conflito do journal (CONFLICTING_OPS): criar um projeto que outra instância
+        # acabou de criar descarta a alteração local; para as tarefas, ver rows_changed
+        project_name = project_data["project_name"]
+        with self.transaction():
+            exists = self.connection.execute("SELECT 1 FROM projects WHERE project_name = ?", (project_name,)).fetchone()
+            if exists and project_name not in self.versions:
+                self.conflicts.append(CONFLICT_MESSAGES["add_project"].format(project_name))
+                return
+            self.insert_project(project_data)
+
+    def project_id(self, project_name):
+        if project_name not in self.project_ids:
+            with self.lock:
+                row = self.connection.execute(
+                    "SELECT id FROM projects WHERE project_name = ? ORDER BY id DESC LIMIT 1", (project_name,)
+                ).fetchone()
+            if row is None:
+                raise ProjectNotFound(project_name)
+            self.project_ids[project_name] = row[0]
+        return self.project_ids[project_name]
+
+    def add_task(self, project_name, task_data):
+        project_id = self.project_id(project_name)
+        with self.transaction():
+            self.connection.execute(
+                INSERT_TASK.format("backlog_tasks"),
+                task_row(project_id, task_data)
+            )
+            self.touch(project_name, project_id)
+
+    def add_tasks(self, project_name, tasks):
+        project_id = self.project_id(project_name)
+        with self.transaction():
+            self.connection.executemany(
+                INSERT_TASK.format("backlog_tasks"),
+                [task_row(project_id, task_data) for task_data in tasks]
+            )
+            self.touch(project_name, project_id)
+
+    def project_changed(self, operation, project_name, project_id):
+        # Outra instância alterou o projeto (qualquer operação) depois da última vez que esta o viu
+        row = self.connection.execute("SELECT version FROM projects WHERE id = ?", (project_id,)).fetchone()
+        if row is None:
+            self.conflicts.append(CONFLICT_MESSAGES["removed"].format(project_name))
+            return True
+        if row[0] != self.versions.get(project_name):
+            self.conflicts.append(CONFLICT_MESSAGES[operation].format(project_name))
+            return True
+        return False
+
+    def rows_changed(self, operation, project_name, project_id):
+        # Outra instância iniciou ou desfez uma sprint (sprint_version) ou removeu tarefas do backlog
+        # (backlog_version) depois da última vez que esta viu o projeto: as linhas locais já não são
+        # as mesmas tarefas. Como no journal, tarefas acrescentadas no fim não mudam as linhas.
+        row = self.connection.execute(
+            "SELECT sprint_version, backlog_version FROM projects WHERE id = ?", (project_id,)
+        ).fetchone()
+        if row is None:
+            self.conflicts.append(CONFLICT_MESSAGES["removed"].format(project_name))
+            return True
+        if row[0] > self.sprint_versions.get(project_name, 0) or row[1] > self.backlog_versions.get(project_name, 0):
+            self.conflicts.append(CONFLICT_MESSAGES[operation].format(project_name))
+            return True
+        return False
+
+    def close_sprint(self, project_id, timestamp):
+        # Mesmo resumo de journal.close_sprint, calculado no banco
+        started_at, history = self.connection.execute(
+            "SELECT sprint_started_at, sprint_history FROM projects WHERE id = ?", (project_id,)
+        ).fetchone()
+        count, planned, done = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(story_points), 0), COALESCE(SUM(CASE WHEN status = 'Done' THEN story_points ELSE 0 END), 0) "
+            "FROM sprint_tasks WHERE project_id = ?", (project_id,)
+        ).fetchone()
+        history = json.loads(history or "[]")
+        if started_at is not None or count:
+            history.append([started_at, timestamp, planned, done])
+        self.connection.execute(
+            "UPDATE projects SET sprint_started_at = ?, sprint_history = ? WHERE id = ?",
+            (timestamp, encode_json(history), project_id)
+        )
+
+    def add_events(self, table, where, parameters, kind, timestamp, status=None):
+        rows = self.connection.execute(f"SELECT id, status, events FROM {table} WHERE {where}", parameters).fetchall()
+        self.connection.executemany(f"UPDATE {table} SET events = ? WHERE id = ?", [
+            (encode_json(json.loads(events or "[]") + [[timestamp, kind, status or task_status]]), task_id)
+            for task_id, task_status, events in rows
+        ])
+
+    def start_sprint(self, project_name, rows=None, timestamp=None):
+        project_id = self.project_id(project_name)
+        with self.transaction():
+            if self.rows_changed("start_sprint", project_name, project_id):
+                return
+            if timestamp is not None:
+                self.close_sprint(project_id, timestamp)
+            self.connection.execute("DELETE FROM sprint_tasks WHERE project_id = ?", (project_id,))
+            columns = ", ".join(TASK_COLUMNS)
+            if rows is None:
+                self.connection.execute(
+                    f"INSERT INTO sprint_tasks (project_id, {columns}) SELECT project_id, {columns} FROM backlog_tasks "
+                    "WHERE project_id = ? ORDER BY id",
+                    (project_id,)
+                )
+                self.connection.execute("DELETE FROM backlog_tasks WHERE project_id = ?", (project_id,))
+            else:
+                # As linhas do plano são posições no backlog, na ordem dos ids
+                ids = [row[0] for row in self.connection.execute(
+                    "SELECT id FROM backlog_tasks WHERE project_id = ? ORDER BY id", (project_id,)
+                )]
+                chosen = [(ids[row],) for row in rows if row < len(ids)]
+                self.connection.executemany(
+                    f"INSERT INTO sprint_tasks (project_id, {columns}) SELECT project_id, {columns} FROM backlog_tasks WHERE id = ?",
+                    chosen
+                )
+                self.connection.executemany("DELETE FROM backlog_tasks WHERE id = ?", chosen)
+            if timestamp is not None:
+                self.add_events("sprint_tasks", "project_id = ?", (project_id,), EVENT_SPRINT, timestamp)
+            self.touch(project_name, project_id)
+            self.connection.execute("UPDATE projects SET sprint_version = version WHERE id = ?", (project_id,))
+            self.sprint_versions[project_name] = self.versions[project_name]
+
+    def set_task_status(self, project_name, in_sprint, row, status, timestamp):
+        project_id = self.project_id(project_name)
+        table = "sprint_tasks" if in_sprint else "backlog_tasks"
+        with self.transaction():
+            if self.rows_changed("set_task_status", project_name, project_id):
+                return
+            found = self.connection.execute(
+                f"SELECT id FROM {table} WHERE project_id = ? ORDER BY id LIMIT 1 OFFSET ?", (project_id, row)
+            ).fetchone()
+            if found is None:
+                return
+            self.connection.execute(f"UPDATE {table} SET status = ? WHERE id = ?", (status, found[0]))
+            self.add_events(table, "id = ?", found, EVENT_STATUS, timestamp, status)
+            self.touch(project_name, project_id)
+
+    # Inversos usados pelo histórico de desfazer (history.py). Remover projeto ou tarefas e desfazer
+    # o início da sprint exigem que ninguém mais tenha alterado o projeto; reverter um status,
+    # como alterá-lo, só depende das linhas (rows_changed).
+
+    def forget_project(self, project_name):
+        self.project_ids.pop(project_name, None)
+        self.versions.pop(project_name, None)
+        self.sprint_versions.pop(project_name, None)
+        self.backlog_versions.pop(project_name, None)
+
+    def remove_project(self, project_name):
+        project_id = self.project_id(project_name)
+        with self.transaction():
+            if self.project_changed("remove_project", project_name, project_id):
+                return
+            for table in ("backlog_tasks", "sprint_tasks"):
+                self.connection.execute(f"DELETE FROM {table} WHERE project_id = ?", (project_id,))
+            self.connection.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+            self.forget_project(project_name)
+
+    def remove_tasks(self, project_name, count):
+        project_id = self.project_id(project_name)
+        with self.transaction():
+            if self.project_changed("remove_tasks", project_name, project_id):
+                return
+            self.connection.execute(
+                "DELETE FROM backlog_tasks WHERE id IN (SELECT id FROM backlog_tasks WHERE project_id = ? ORDER BY id DESC LIMIT ?)",
+                (project_id, count)
+            )
+            self.touch(project_name, project_id)
+            self.connection.execute("UPDATE projects SET backlog_version = version WHERE id = ?", (project_id,))
+            self.backlog_versions[project_name] = self.versions[project_name]
+
+    def revert_task_status(self, project_name, in_sprint, row, status):
+        project_id = self.project_id(project_name)
+        table = "sprint_tasks" if in_sprint else "backlog_tasks"
+        with self.transaction():
+            if self.rows_changed("revert_task_status", project_name, project_id):
+                return
+            found = self.connection.execute(
+                f"SELECT id, events FROM {table} WHERE project_id = ? ORDER BY id LIMIT 1 OFFSET ?", (project_id, row)
+            ).fetchone()
+            if found is None:
+                return
+            task_id, events = found
+            self.connection.execute(
+                f"UPDATE {table} SET status = ?, events = ? WHERE id = ?",
+                (status, encode_json(json.loads(events or "[]")[:-1]), task_id)
+            )
+            self.touch(project_name, project_id)
+
+    def restore_sprint(self, project_name, rows, tasks, sprint_started_at):
+        # Inverso de start_sprint: as tarefas da sprint voltam às linhas rows do backlog (sem o
+        # evento de entrada) e tasks, a sprint anterior, volta para sprint_tasks
+        project_id = self.project_id(project_name)
+        with self.transaction():
+            if self.project_changed("restore_sprint", project_name, project_id):
+                return
+            task_lists = self.load_tasks({"id": project_id})
+            selected = [dict(task, events=task.get("events", [])[:-1]) for task in task_lists[1]]
+            backlog = merge_rows(selected, task_lists[0], rows)
+            for table, table_tasks in (("backlog_tasks", backlog), ("sprint_tasks", tasks)):
+                self.connection.execute(f"DELETE FROM {table} WHERE project_id = ?", (project_id,))
+                self.connection.executemany(INSERT_TASK.format(table), [task_row(project_id, task_data) for task_data in table_tasks])
+            history = json.loads(self.connection.execute(
+                "SELECT sprint_history FROM projects WHERE id = ?", (project_id,)
+            ).fetchone()[0] or "[]")
+            if history and (sprint_started_at is not None or tasks):
+                history.pop()
+            self.connection.execute(
+                "UPDATE projects SET sprint_started_at = ?, sprint_history = ? WHERE id = ?",
+                (sprint_started_at, encode_json(history), project_id)
+            )
+            self.touch(project_name, project_id)
+            self.connection.execute("UPDATE projects SET sprint_version = version WHERE id = ?", (project_id,))
+            self.sprint_versions[project_name] = self.versions[project_name]
+
+    def set_sprint_info(self, project_name, planning_date, daily_time, duration):
+        project_id = self.project_id(project_name)
+        with self.transaction():
+            self.connection.execute(
+                "UPDATE projects SET sprint_planning_date = ?, daily_scrum_time = ?, sprint_duration = ? WHERE id = ?",
+                (planning_date, daily_time, duration, project_id)
+            )
+            self.touch(project_name, project_id)
+
+    def sync(self):
+        with self.lock:
+            self.connection.commit()
+
+    def close(self):
+        with self.lock:
+            self.connection.commit()
+            self.connection.close()
+
+
+def migrate_json(json_file, db_file):
+    journal = ProjectJournal(json_file)
+    try:
+        projects = journal.load_all()
+    finally:
+        journal.close()
+    storage = SqliteStorage(db_file)
+    try:
+        with storage.connection:
+            for project_data in projects:
+                storage.insert_project(project_data)
+    finally:
+        storage.close()
+    return len(projects)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Uso: python sqliteStorage.py projects_data.json projects_data.db")
+        sys.exit(1)
+    count = migrate_json(sys.argv[1], sys.argv[2])
+    print(f"{count} projetos migrados para {sys.argv[2]}.")
@@ -0,0 +1,19 @@
+import os
+from journal import ProjectJournal
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+BINARY_EXTENSIONS = (".bin",)
+
+
+def open_storage(file_name):
+    # Todos os backends expõem a mesma interface: load, load_tasks, load_project, add_project,
+    # add_task, add_tasks, start_sprint, set_sprint_info, set_task_status, apply_batch, poll_changes, sync e close,
+    # além dos inversos usados pelo desfazer: remove_project, remove_tasks, revert_task_status e restore_sprint.
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension in SQLITE_EXTENSIONS:
+        from sqliteStorage import SqliteStorage
+        return SqliteStorage(file_name)
+    if extension in BINARY_EXTENSIONS:
+        from binarySnapshot import BinaryJournal
+        return BinaryJournal(file_name)
+    return ProjectJournal(file_name)
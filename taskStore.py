@@ -0,0 +1,402 @@
+import re
+from array import array
+from bisect import bisect_left, insort
+from collections import defaultdict
+from itertools import compress
+
+STATUSES = ("To Do", "In Progress", "Done")
+# Prioridade 1 é a mais urgente; tarefas sem estimativa valem 1 ponto
+PRIORITIES = (1, 2, 3, 4, 5)
+DEFAULT_PRIORITY = 3
+DEFAULT_STORY_POINTS = 1
+MAX_STORY_POINTS = 1000
+# Eventos de cada tarefa: (timestamp, tipo, status). "sprint" marca a entrada numa sprint
+# (com o status daquele momento) e "status", cada mudança de status.
+EVENT_SPRINT = "sprint"
+EVENT_STATUS = "status"
+COLUMNS = ("titles", "descriptions", "assignee_codes", "status_codes", "story_points", "priorities", "events")
+INDEXES = ("by_assignee", "by_status", "by_token")
+# Estimativa do custo fixo de cada tarefa em memória (referências nas colunas, objetos str,
+# entradas nos índices); os textos são somados à parte
+ROW_BYTES = 240
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return set(TOKEN_PATTERN.findall(text.lower()))
+
+
+def parse_estimate(story_points=None, priority=None):
+    # Aceita números ou texto (CSV, diálogos); vazio usa o padrão
+    try:
+        points = DEFAULT_STORY_POINTS if story_points in (None, "") else int(story_points)
+        priority = DEFAULT_PRIORITY if priority in (None, "") else int(priority)
+    except (TypeError, ValueError):
+        raise ValueError("story_points e priority devem ser inteiros")
+    if not 0 <= points <= MAX_STORY_POINTS:
+        raise ValueError(f"story_points deve estar entre 0 e {MAX_STORY_POINTS}")
+    if priority not in PRIORITIES:
+        raise ValueError(f"priority deve estar entre {PRIORITIES[0]} e {PRIORITIES[-1]}")
+    return points, priority
+
+
+class StringPool:
+    # Guarda cada string uma única vez; as tarefas guardam só o código inteiro
+    def __init__(self, values=()):
+        self.values = []
+        self.codes = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+
+# Compartilhados por todos os stores, para que um store possa trocar de lista sem recodificar nada
+assignees = StringPool()
+statuses = StringPool(STATUSES)
+
+
+class TaskView:
+    __slots__ = ("store", "row")
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    @property
+    def title(self):
+        return self.store.titles[self.row]
+
+    @title.setter
+    def title(self, value):
+        self.store.update(self.row, titles=value)
+
+    @property
+    def description(self):
+        return self.store.descriptions[self.row]
+
+    @description.setter
+    def description(self, value):
+        self.store.update(self.row, descriptions=value)
+
+    @property
+    def assigned_to(self):
+        return assignees.values[self.store.assignee_codes[self.row]]
+
+    @assigned_to.setter
+    def assigned_to(self, value):
+        self.store.update(self.row, assignee_codes=assignees.code(value))
+
+    @property
+    def status(self):
+        return statuses.values[self.store.status_codes[self.row]]
+
+    @status.setter
+    def status(self, value):
+        self.store.update(self.row, status_codes=statuses.code(value))
+
+    @property
+    def story_points(self):
+        return self.store.story_points[self.row]
+
+    @story_points.setter
+    def story_points(self, value):
+        self.store.story_points[self.row] = value
+
+    @property
+    def priority(self):
+        return self.store.priorities[self.row]
+
+    @priority.setter
+    def priority(self, value):
+        self.store.priorities[self.row] = value
+
+    @property
+    def events(self):
+        return self.store.events[self.row] or ()
+
+    def to_dict(self):
+        return self.store.row_dict(self.row)
+
+    def __str__(self):
+        return f"[{self.status}] Tarefa: {self.title}, Responsável: {self.assigned_to}, Pontos: {self.story_points}, Prioridade: {self.priority}"
+
+
+def remove_row(postings, key, row):
+    rows = postings[key]
+    del rows[bisect_left(rows, row)]
+    if not rows:
+        del postings[key]
+
+
+def contains(rows, row):
+    position = bisect_left(rows, row)
+    return position < len(rows) and rows[position] == row
+
+
+class TaskStore:
+    # Tarefas guardadas em colunas: títulos e descrições em listas; responsável,
+    # status, pontos e prioridade como inteiros em arrays compactos; eventos numa lista
+    # (None enquanto a tarefa não tem nenhum). Os eventos de cada tarefa são uma tupla,
+    # trocada inteira a cada evento novo: stores separados por split e estados guardados
+    # no histórico de desfazer compartilham as tuplas sem que uma alteração vaze para o outro.
+    # Cada store mantém seus próprios índices (listas ordenadas de linhas) por
+    # responsável, status e palavra do título/descrição; como os índices andam junto
+    # com o store, start_sprint não precisa reindexar nada.
+    def __init__(self, tasks=()):
+        self.titles = []
+        self.descriptions = []
+        self.assignee_codes = array("I")
+        self.status_codes = array("H")
+        self.story_points = array("H")
+        self.priorities = array("B")
+        self.events = []
+        self.by_assignee = {}
+        self.by_status = {}
+        self.by_token = {}
+        for task in tasks:
+            self.append(task)
+
+    @classmethod
+    def from_dicts(cls, tasks):
+        return cls.from_columns(
+            [task["title"] for task in tasks],
+            [task["description"] for task in tasks],
+            [task["assigned_to"] for task in tasks],
+            [task.get("status", "To Do") for task in tasks],
+            [task.get("story_points", DEFAULT_STORY_POINTS) for task in tasks],
+            [task.get("priority", DEFAULT_PRIORITY) for task in tasks],
+            [task.get("events") for task in tasks]
+        )
+
+    @classmethod
+    def from_columns(cls, titles, descriptions, assigned_to, status, story_points, priorities, events):
+        # Monta o store inteiro de uma vez (ex.: ao carregar do disco). As linhas entram em
+        # ordem, então cada lista dos índices já nasce ordenada: só appends, sem insort.
+        store = cls()
+        store.titles = list(titles)
+        store.descriptions = list(descriptions)
+        store.assignee_codes = array("I", map(assignees.code, assigned_to))
+        store.status_codes = array("H", map(statuses.code, status))
+        store.story_points = array("H", story_points)
+        store.priorities = array("B", priorities)
+        store.events = [tuple(map(tuple, task_events)) if task_events else None for task_events in events]
+        for index, codes in (("by_assignee", store.assignee_codes), ("by_status", store.status_codes)):
+            postings = defaultdict(list)
+            for row, code in enumerate(codes):
+                postings[code].append(row)
+            setattr(store, index, {key: array("I", rows) for key, rows in postings.items()})
+        postings = defaultdict(list)
+        for row, (title, description) in enumerate(zip(store.titles, store.descriptions)):
+            for token in tokenize(title + " " + description):
+                postings[token].append(row)
+        store.by_token = {key: array("I", rows) for key, rows in postings.items()}
+        return store
+
+    def add(self, title, description, assigned_to, status="To Do", story_points=DEFAULT_STORY_POINTS, priority=DEFAULT_PRIORITY, events=None):
+        self.titles.append(title)
+        self.descriptions.append(description)
+        self.assignee_codes.append(assignees.code(assigned_to))
+        self.status_codes.append(statuses.code(status))
+        self.story_points.append(story_points)
+        self.priorities.append(priority)
+        self.events.append(tuple(tuple(event) for event in events) if events else None)
+        row = len(self.titles) - 1
+        self.index_row(row)
+        return TaskView(self, row)
+
+    def row_tokens(self, row):
+        return tokenize(self.titles[row] + " " + self.descriptions[row])
+
+    def index_row(self, row):
+        insort(self.by_assignee.setdefault(self.assignee_codes[row], array("I")), row)
+        insort(self.by_status.setdefault(self.status_codes[row], array("I")), row)
+        for token in self.row_tokens(row):
+            insort(self.by_token.setdefault(token, array("I")), row)
+
+    def unindex_row(self, row):
+        remove_row(self.by_assignee, self.assignee_codes[row], row)
+        remove_row(self.by_status, self.status_codes[row], row)
+        for token in self.row_tokens(row):
+            remove_row(self.by_token, token, row)
+
+    def update(self, row, **columns):
+        self.unindex_row(row)
+        for column, value in columns.items():
+            getattr(self, column)[row] = value
+        self.index_row(row)
+
+    def set_status(self, row, status, timestamp):
+        self.update(row, status_codes=statuses.code(status))
+        self.add_event(row, timestamp, EVENT_STATUS, status)
+
+    def add_event(self, row, timestamp, kind, status):
+        self.events[row] = (self.events[row] or ()) + ((timestamp, kind, status),)
+
+    def drop_last_event(self, row):
+        self.events[row] = self.events[row][:-1] or None
+
+    def revert_status(self, row, status):
+        # Inverso de set_status: volta ao status anterior e descarta o evento da mudança
+        self.update(row, status_codes=statuses.code(status))
+        self.drop_last_event(row)
+
+    def points_summary(self):
+        # (pontos de todas as tarefas, pontos das concluídas)
+        done = statuses.code("Done")
+        return sum(self.story_points), sum(points for points, status in zip(self.story_points, self.status_codes) if status == done)
+
+    def query(self, tokens=(), assignee_code=None, status_code=None):
+        postings = []
+        if assignee_code is not None:
+            postings.append(self.by_assignee.get(assignee_code))
+        if status_code is not None:
+            postings.append(self.by_status.get(status_code))
+        for token in tokens:
+            postings.append(self.by_token.get(token))
+        if not postings:
+            return range(len(self.titles))
+        if any(rows is None for rows in postings):
+            return []
+
+        # Percorre a menor lista e confere as outras por busca binária
+        postings.sort(key=len)
+        smallest, others = postings[0], postings[1:]
+        return [row for row in smallest if all(contains(rows, row) for rows in others)]
+
+    def append(self, task):
+        self.add(task.title, task.description, task.assigned_to, task.status, task.story_points, task.priority, task.events)
+
+    def extend(self, store):
+        for task in store:
+            self.append(task)
+
+    def truncate(self, length):
+        # Remove as tarefas a partir de length e as devolve num store novo. As linhas removidas
+        # são as maiores de cada índice, então saem do fim das listas.
+        tail = TaskStore(self[length:])
+        for row in range(len(self.titles) - 1, length - 1, -1):
+            self.unindex_row(row)
+        for column in COLUMNS:
+            del getattr(self, column)[length:]
+        return tail
+
+    def split(self, rows):
+        # Separa as linhas dadas (em ordem crescente) num store novo e devolve (escolhidas, resto).
+        # Os índices são remapeados em vez de reconstruídos: não precisa tokenizar nada de novo.
+        chosen = bytearray(len(self.titles))
+        for row in rows:
+            chosen[row] = 1
+        rest = chosen.translate(bytes([1, 0]) + bytes(254))
+        mapping = array("I", bytes(4 * len(self.titles)))
+        counts = [0, 0]
+        for row, flag in enumerate(chosen):
+            mapping[row] = counts[flag]
+            counts[flag] += 1
+
+        selected, remaining = TaskStore(), TaskStore()
+        for column in COLUMNS:
+            values = getattr(self, column)
+            for store, flags in ((selected, chosen), (remaining, rest)):
+                kept = list(compress(values, flags))
+                setattr(store, column, kept if isinstance(values, list) else array(values.typecode, kept))
+        for index in INDEXES:
+            for key, postings in getattr(self, index).items():
+                for store, flags in ((selected, chosen), (remaining, rest)):
+                    kept = array("I", [mapping[row] for row in postings if flags[row]])
+                    if kept:
+                        getattr(store, index)[key] = kept
+        return selected, remaining
+
+    @classmethod
+    def merge(cls, selected, remaining, rows):
+        # Inverso de split: as linhas de selected voltam para as posições rows (em ordem crescente)
+        # e as de remaining preenchem as outras. Os índices também são remapeados.
+        chosen = bytearray(len(selected) + len(remaining))
+        for row in rows:
+            chosen[row] = 1
+        positions = ([], [])
+        for position, flag in enumerate(chosen):
+            positions[flag].append(position)
+
+        store = cls()
+        for column in COLUMNS:
+            sources = (iter(getattr(remaining, column)), iter(getattr(selected, column)))
+            values = [next(sources[flag]) for flag in chosen]
+            template = getattr(store, column)
+            setattr(store, column, values if isinstance(template, list) else array(template.typecode, values))
+        for index in INDEXES:
+            merged = {}
+            for source, mapping in ((remaining, positions[0]), (selected, positions[1])):
+                for key, postings in getattr(source, index).items():
+                    merged.setdefault(key, []).extend(mapping[row] for row in postings)
+            setattr(store, index, {key: array("I", sorted(postings)) for key, postings in merged.items()})
+        return store
+
+    def row_dict(self, row):
+        task = {
+            "title": self.titles[row],
+            "description": self.descriptions[row],
+            "assigned_to": assignees.values[self.assignee_codes[row]],
+            "status": statuses.values[self.status_codes[row]],
+            "story_points": self.story_points[row],
+            "priority": self.priorities[row]
+        }
+        if self.events[row]:
+            task["events"] = [list(event) for event in self.events[row]]
+        return task
+
+    def to_dicts(self):
+        return [self.row_dict(row) for row in range(len(self.titles))]
+
+    def copy(self):
+        store = TaskStore()
+        store.titles = self.titles.copy()
+        store.descriptions = self.descriptions.copy()
+        store.assignee_codes = array("I", self.assignee_codes)
+        store.status_codes = array("H", self.status_codes)
+        store.story_points = array("H", self.story_points)
+        store.priorities = array("B", self.priorities)
+        store.events = list(self.events)
+        store.by_assignee = {key: array("I", rows) for key, rows in self.by_assignee.items()}
+        store.by_status = {key: array("I", rows) for key, rows in self.by_status.items()}
+        store.by_token = {key: array("I", rows) for key, rows in self.by_token.items()}
+        return store
+
+    def clear(self):
+        self.titles = []
+        self.descriptions = []
+        self.assignee_codes = array("I")
+        self.status_codes = array("H")
+        self.story_points = array("H")
+        self.priorities = array("B")
+        self.events = []
+        self.by_assignee = {}
+        self.by_status = {}
+        self.by_token = {}
+
+    def nbytes(self):
+        # Estimativa, para orçamentos de memória (ex.: histórico de desfazer)
+        return ROW_BYTES * len(self.titles) + sum(map(len, self.titles)) + sum(map(len, self.descriptions))
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __iter__(self):
+        for row in range(len(self.titles)):
+            yield TaskView(self, row)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [TaskView(self, index) for index in range(*row.indices(len(self.titles)))]
+        if row < 0:
+            row += len(self.titles)
+        if not 0 <= row < len(self.titles):
+            raise IndexError("task index out of range")
+        return TaskView(self, row)
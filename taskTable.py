@@ -0,0 +1,96 @@
+import tkinter as tk
+from tkinter import ttk
+
+ROW_HEIGHT = 22
+HEADER_HEIGHT = 26
+COLUMNS = (
+    ("number", "#", 50),
+    ("title", "Título", 180),
+    ("assigned_to", "Responsável", 120),
+    ("status", "Status", 90),
+    ("story_points", "Pontos", 60),
+    ("priority", "Prioridade", 75),
+    ("description", "Descrição", 260)
+)
+
+
+class TaskTable(tk.Frame):
+    # Tabela virtualizada: a Treeview só tem as linhas visíveis, e a cada rolagem
+    # elas são preenchidas com a página correspondente pedida a fetch_rows(offset, limit).
+    def __init__(self, master, count, fetch_rows, **kwargs):
+        super().__init__(master, **kwargs)
+        self.count = count
+        self.fetch_rows = fetch_rows
+        self.offset = 0
+        self.items = []
+
+        style = ttk.Style(self)
+        style.configure("TaskTable.Treeview", rowheight=ROW_HEIGHT)
+
+        self.tree = ttk.Treeview(self, columns=[column for column, _, _ in COLUMNS], show="headings", style="TaskTable.Treeview")
+        for column, heading, width in COLUMNS:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, stretch=column == "description")
+
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.tree.bind("<Configure>", lambda event: self.refresh())
+        self.tree.bind("<MouseWheel>", self.on_scroll)
+        self.tree.bind("<Button-4>", self.on_scroll)
+        self.tree.bind("<Button-5>", self.on_scroll)
+
+    def visible_rows(self):
+        return max(1, (self.tree.winfo_height() - HEADER_HEIGHT) // ROW_HEIGHT)
+
+    def yview(self, *args):
+        rows = self.visible_rows()
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * self.count)
+        elif args[0] == "scroll":
+            step = rows if args[2] == "pages" else 1
+            self.offset += int(args[1]) * step
+        self.refresh()
+
+    def on_scroll(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.yview("scroll", -3, "units")
+        else:
+            self.yview("scroll", 3, "units")
+        return "break"
+
+    def refresh(self):
+        rows = self.visible_rows()
+        self.offset = min(max(0, self.offset), max(0, self.count - rows))
+        page = list(self.fetch_rows(self.offset, rows))
+
+        while len(self.items) < len(page):
+            self.items.append(self.tree.insert("", tk.END))
+        for position, item in enumerate(self.items):
+            if position < len(page):
+                number, task = page[position]
+                self.tree.item(item, values=(number, task.title, task.assigned_to, task.status, task.story_points, task.priority, task.description))
+                self.tree.move(item, "", position)
+            else:
+                self.tree.detach(item)
+
+        if self.count <= rows:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.offset / self.count, (self.offset + rows) / self.count)
+
+    def set_count(self, count):
+        self.count = count
+        self.refresh()
+
+
+def open_task_table(master, title, count, fetch_rows):
+    window = tk.Toplevel(master)
+    window.title(title)
+    window.geometry("860x420")
+
+    tk.Label(window, text=f"{count} tarefas").pack(anchor="w", padx=10, pady=5)
+    table = TaskTable(window, count, fetch_rows)
+    table.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+    return table
@@ -0,0 +1,15 @@
+import os
+import sys
+import pytest
+
+# Os módulos do app ficam na raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Extensões dos backends de storage.open_storage: journal JSON, snapshot binário e SQLite
+STORAGE_EXTENSIONS = (".json", ".bin", ".db")
+
+
+@pytest.fixture(params=STORAGE_EXTENSIONS)
+def data_file(request, tmp_path):
+    # Arquivo de dados ainda inexistente; cada teste que o usa roda uma vez por backend
+    return str(tmp_path / ("dados" + request.param))
@@ -0,0 +1,54 @@
+import asyncio
+import json
+import threading
+from apiServer import ApiServer, WriteRequest
+from scrumModel import ScrumProject
+from storage import open_storage
+
+
+def test_duplicate_project_is_conflict(tmp_path):
+    server = ApiServer(open_storage(str(tmp_path / "dados.json")))
+    try:
+        requests = [WriteRequest("add_project", "Projeto", ("Ana",), None) for _ in range(2)]
+        operations = server.apply_writes(requests)
+        assert [request.response[0] for request in requests] == [201, 409]
+        assert len(operations) == 1
+        assert [project.project_name for project in server.projects] == ["Projeto"]
+    finally:
+        server.storage.close()
+
+
+def test_tasks_are_loaded_off_the_event_loop(tmp_path):
+    file_name = str(tmp_path / "dados.json")
+    storage = open_storage(file_name)
+    project = ScrumProject("Projeto", "Ana")
+    project.add_task_to_backlog("t", "d", "Bruno")
+    storage.add_project(project.to_dict())
+    storage.close()
+    # Reabrir e fechar grava o snapshot com índice: o servidor carrega os projetos sem as tarefas
+    storage = open_storage(file_name)
+    storage.load()
+    storage.close()
+
+    server = ApiServer(open_storage(file_name))
+    threads = []
+    load_tasks = server.storage.load_tasks
+
+    def recording_load_tasks(entry):
+        threads.append(threading.current_thread())
+        return load_tasks(entry)
+
+    server.storage.load_tasks = recording_load_tasks
+    try:
+        assert server.projects[0].loader is not None
+
+        async def read_twice():
+            return await asyncio.gather(*(server.dispatch("GET", "/projects/Projeto/backlog", b"") for _ in range(2)))
+
+        responses = asyncio.run(read_twice())
+        assert [status for status, _ in responses] == [200, 200]
+        assert json.loads(responses[0][1])["tasks"][0]["title"] == "t"
+        # Uma única leitura, fora da thread do loop
+        assert len(threads) == 1 and threads[0] is not threading.main_thread()
+    finally:
+        server.storage.close()
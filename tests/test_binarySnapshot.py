@@ -0,0 +1,31 @@
+from binarySnapshot import binary_to_json, json_to_binary
+from scrumModel import ScrumProject, load_projects
+from storage import open_storage
+
+
+def write_project(file_name):
+    project = ScrumProject("Projeto", "Ana", "2024-01-15", "09:30", 10)
+    for i in range(5):
+        project.add_task_to_backlog(f"tarefa {i}", "descrição", ("Bruno", "Érica")[i % 2], i + 1, i % 5 + 1)
+    project.start_sprint(project.plan_sprint(), 1705309200.0)
+    project.set_task_status(True, 0, "Done", 1705399200.0)
+    storage = open_storage(file_name)
+    storage.add_project(project.to_dict())
+    storage.close()
+    return project.to_dict()
+
+
+def read_projects(file_name):
+    storage = open_storage(file_name)
+    try:
+        return [project.to_dict() for project in load_projects(storage)]
+    finally:
+        storage.close()
+
+
+def test_conversion_round_trip(tmp_path):
+    expected = write_project(str(tmp_path / "dados.json"))
+    assert json_to_binary(str(tmp_path / "dados.json"), str(tmp_path / "dados.bin")) == 1
+    assert binary_to_json(str(tmp_path / "dados.bin"), str(tmp_path / "copia.json")) == 1
+    assert read_projects(str(tmp_path / "dados.bin")) == [expected]
+    assert read_projects(str(tmp_path / "copia.json")) == [expected]
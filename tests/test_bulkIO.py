@@ -0,0 +1,74 @@
+import csv
+import json
+from bulkIO import export_tasks, import_tasks
+from scrumModel import ScrumProject
+
+
+def project_with_events():
+    project = ScrumProject("Projeto", "Ana")
+    project.add_task_to_backlog("Login", "Tela de login", "Bruno", 5, 2)
+    project.add_task_to_backlog("Cadastro", "Tela de cadastro", "Carla")
+    project.set_task_status(False, 0, "In Progress", 1704103200.0)
+    return project
+
+
+def test_export_csv_with_events(tmp_path):
+    project = project_with_events()
+    path = str(tmp_path / "tarefas.csv")
+    assert export_tasks(project.product_backlog, path) == 2
+    with open(path, newline='', encoding='utf-8') as file:
+        rows = list(csv.DictReader(file))
+    assert list(rows[0]) == ["title", "description", "assigned_to", "status", "story_points", "priority"]
+    assert rows[0]["status"] == "In Progress"
+    assert rows[0]["story_points"] == "5"
+    assert rows[1]["title"] == "Cadastro"
+
+
+def test_export_jsonl_keeps_events(tmp_path):
+    project = project_with_events()
+    path = str(tmp_path / "tarefas.jsonl")
+    export_tasks(project.product_backlog, path)
+    with open(path, encoding='utf-8') as file:
+        rows = [json.loads(line) for line in file]
+    assert rows[0]["events"] == [[1704103200.0, "status", "In Progress"]]
+    assert "events" not in rows[1]
+
+
+def test_export_jsonl_matches_to_dict(tmp_path):
+    project = project_with_events()
+    project.add_task_to_backlog('Aspas "e" barra \\', "Ação\nnova linha", "Érica")
+    path = str(tmp_path / "tarefas.jsonl")
+    export_tasks(project.product_backlog, path)
+    with open(path, encoding='utf-8') as file:
+        assert [json.loads(line) for line in file] == [task.to_dict() for task in project.product_backlog]
+
+
+def test_import_validates_status(tmp_path):
+    path = tmp_path / "tarefas.csv"
+    path.write_text(
+        "title,description,assigned_to,status,story_points,priority\n"
+        "a,d,Bruno,done,3,1\n"
+        "b,d,Bruno,,,\n"
+        "c,d,Bruno,Pronto,,\n"
+        "d,d,Bruno, IN PROGRESS ,,\n",
+        encoding="utf-8"
+    )
+    project = ScrumProject("Projeto", "Ana")
+    batches = []
+    report = import_tasks(project, str(path), lambda name, tasks: batches.append(tasks))
+    assert report.imported == 3
+    assert report.errors == [(4, "status inválido 'Pronto' (use To Do, In Progress, Done)")]
+    assert [task.status for task in project.product_backlog] == ["Done", "To Do", "In Progress"]
+    assert [task["status"] for task in batches[0]] == ["Done", "To Do", "In Progress"]
+
+
+def test_csv_round_trip(tmp_path):
+    source = project_with_events()
+    path = str(tmp_path / "tarefas.csv")
+    export_tasks(source.product_backlog, path)
+    target = ScrumProject("Outro", "Ana")
+    report = import_tasks(target, path, lambda name, tasks: None)
+    assert report.imported == 2 and report.error_count == 0
+    # O CSV não leva os eventos de status
+    expected = [dict(task.to_dict(), events=None) for task in source.product_backlog]
+    assert [dict(task.to_dict(), events=None) for task in target.product_backlog] == expected
@@ -0,0 +1,50 @@
+import json
+import pytest
+import cli
+import instrumentation
+from scrumModel import ScrumProject, load_projects
+from storage import open_storage
+
+
+@pytest.fixture
+def project_file(data_file):
+    storage = open_storage(data_file)
+    storage.load()
+    storage.add_project(ScrumProject("Alpha", "Ana").to_dict())
+    storage.close()
+    return data_file
+
+
+def backlog(data_file):
+    storage = open_storage(data_file)
+    try:
+        return [task.title for task in load_projects(storage)[0].product_backlog]
+    finally:
+        storage.close()
+
+
+def test_add_task(project_file, capsys):
+    cli.main(["--data", project_file, "adicionar-tarefa", "Alpha", " Login ", "Tela de login", "Ana"])
+    assert "Tarefa 'Login' adicionada" in capsys.readouterr().out
+    assert backlog(project_file) == ["Login"]
+
+
+@pytest.mark.parametrize("fields", [("", "d", "Ana"), ("   ", "d", "Ana"), ("t", " \t", "Ana"), ("t", "d", " ")])
+def test_add_task_rejects_empty_fields(project_file, fields):
+    with pytest.raises(SystemExit) as error:
+        cli.main(["--data", project_file, "adicionar-tarefa", "Alpha", *fields])
+    assert error.value.code == "Por favor, preencha todos os campos."
+    assert backlog(project_file) == []
+
+
+def test_instrument_flag_enables_timing_after_import(project_file, tmp_path, monkeypatch):
+    metrics_file = str(tmp_path / "metrics.json")
+    monkeypatch.setattr(instrumentation, "ENABLED", False)
+    monkeypatch.setattr(instrumentation, "metrics", {})
+    monkeypatch.setenv("SCRUM_INSTRUMENT_FILE", metrics_file)
+    cli.main(["--data", project_file, "listar"])
+    assert instrumentation.metrics == {}
+
+    cli.main(["--data", project_file, "--instrument", "listar"])
+    with open(metrics_file) as file:
+        assert "load_projects" in json.load(file)["metrics"]
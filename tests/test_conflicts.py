@@ -0,0 +1,127 @@
+import pytest
+from journal import CONFLICT_MESSAGES
+from scrumModel import ScrumProject
+from storage import open_storage
+
+
+def task_data(title):
+    return {"title": title, "description": "d", "assigned_to": "Bruno", "status": "To Do", "story_points": 1, "priority": 3}
+
+
+@pytest.fixture
+def two_instances(data_file):
+    first = open_storage(data_file)
+    project = ScrumProject("P", "Ana").to_dict()
+    project["product_backlog"] = [task_data(f"t{i}") for i in range(3)]
+    first.add_project(project)
+    first.sync()
+    second = open_storage(data_file)
+    second.load()
+    yield data_file, first, second
+    first.close()
+    second.close()
+
+
+def reopen(file_name):
+    storage = open_storage(file_name)
+    try:
+        storage.load()
+        return storage.load_project("P")
+    finally:
+        storage.close()
+
+
+@pytest.mark.parametrize("operation, args", [
+    ("start_sprint", ([0], 1704103200.0)),
+    ("set_task_status", (False, 0, "Done", 1704103200.0)),
+    ("revert_task_status", (False, 0, "To Do"))
+])
+def test_remote_remove_and_add_conflicts(two_instances, operation, args):
+    file_name, first, second = two_instances
+    # A outra instância trocou a última tarefa: as linhas que esta conhece já não são as mesmas
+    first.remove_tasks("P", 1)
+    first.add_task("P", task_data("nova"))
+    first.sync()
+    getattr(second, operation)("P", *args)
+    second.sync()
+    assert len(second.poll_changes()[1]) == 1
+    project = reopen(file_name)
+    assert [task["title"] for task in project["product_backlog"]] == ["t0", "t1", "nova"]
+    assert [task["status"] for task in project["product_backlog"]] == ["To Do"] * 3
+    assert project["sprint_tasks"] == []
+
+
+def test_remote_add_does_not_conflict(two_instances):
+    file_name, first, second = two_instances
+    first.add_task("P", task_data("nova"))
+    first.sync()
+    second.start_sprint("P", [0], 1704103200.0)
+    second.sync()
+    assert second.poll_changes() == (["P"], [])
+    project = reopen(file_name)
+    assert [task["title"] for task in project["sprint_tasks"]] == ["t0"]
+    assert [task["title"] for task in project["product_backlog"]] == ["t1", "t2", "nova"]
+
+
+def test_write_to_removed_project(two_instances):
+    file_name, first, second = two_instances
+    first.add_project(ScrumProject("Q", "Ana").to_dict())
+    first.remove_project("P")
+    first.sync()
+    # O lote segue depois da operação descartada
+    second.apply_batch([("add_task", ("P", task_data("nova"))), ("add_task", ("Q", task_data("nova")))])
+    second.sync()
+    changed, conflicts = second.poll_changes()
+    assert "P" in changed
+    assert conflicts == ["O projeto 'P' foi removido por outra instância; a alteração foi descartada."]
+    assert reopen(file_name) is None
+
+
+def test_poll_sees_other_instance(two_instances):
+    file_name, first, second = two_instances
+    assert second.poll_changes() == ([], [])
+    first.add_task("P", task_data("nova"))
+    first.set_sprint_info("P", "2024-01-15", "09:30", 10)
+    first.sync()
+    assert second.poll_changes() == (["P"], [])
+    project = second.load_project("P")
+    assert project["product_backlog"][-1]["title"] == "nova"
+    assert project["sprint_duration"] == 10
+    # Nada novo desde a última consulta
+    assert second.poll_changes() == ([], [])
+
+
+def test_concurrent_start_sprint(two_instances):
+    file_name, first, second = two_instances
+    first.start_sprint("P", [0], 1704103200.0)
+    first.sync()
+    second.start_sprint("P", [1, 2], 1704103300.0)
+    second.sync()
+    assert second.poll_changes()[1] == [CONFLICT_MESSAGES["start_sprint"].format("P")]
+    project = reopen(file_name)
+    assert [task["title"] for task in project["sprint_tasks"]] == ["t0"]
+
+
+def test_concurrent_add_project(two_instances):
+    file_name, first, second = two_instances
+    first.add_project(ScrumProject("Q", "Ana").to_dict())
+    first.sync()
+    second.add_project(ScrumProject("Q", "Bruno").to_dict())
+    second.sync()
+    assert second.poll_changes()[1] == [CONFLICT_MESSAGES["add_project"].format("Q")]
+    storage = open_storage(file_name)
+    try:
+        assert [project["scrum_master"] for project in storage.load() if project["project_name"] == "Q"] == ["Ana"]
+    finally:
+        storage.close()
+
+
+def test_undo_after_remote_add(two_instances):
+    file_name, first, second = two_instances
+    # Desfazer "Adicionar Tarefa" aqui removeria a tarefa que a outra instância acabou de criar
+    first.add_task("P", task_data("nova"))
+    first.sync()
+    second.remove_tasks("P", 1)
+    second.sync()
+    assert second.poll_changes()[1] == [CONFLICT_MESSAGES["remove_tasks"].format("P")]
+    assert [task["title"] for task in reopen(file_name)["product_backlog"]] == ["t0", "t1", "t2", "nova"]
@@ -0,0 +1,140 @@
+import inspect
+import pytest
+from history import AddProject, AddTasks, History, SetSprintInfo, SetTaskStatus, StartSprint, sprint_info_args
+from scrumModel import ScrumProject, load_projects, parse_date
+from storage import open_storage
+
+
+class App:
+    # O mínimo do ScrumApp: modelo, storage e histórico andando juntos
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self.storage = open_storage(file_name)
+        self.projects = load_projects(self.storage)
+        self.history = History()
+        project = ScrumProject("P", "Ana", "2024-01-15", sprint_duration=5)
+        for i in range(6):
+            project.add_task_to_backlog(f"t{i}", "d", ("Bruno", "Carla")[i % 2], i % 3 + 1)
+        self.projects.append(project)
+        self.storage.add_project(project.to_dict())
+        self.project = project
+
+    def post(self, operations):
+        for operation, args in operations:
+            getattr(self.storage, operation)(*args)
+
+    def state(self):
+        return {project.project_name: project.to_dict() for project in self.projects}
+
+    def saved_state(self):
+        self.storage.close()
+        self.storage = open_storage(self.file_name)
+        return {project.project_name: project.to_dict() for project in load_projects(self.storage)}
+
+    def close(self):
+        self.storage.close()
+
+
+def add_project(app):
+    project = ScrumProject("Q", "Bruno")
+    app.history.record(AddProject(app.projects, project))
+    app.projects.append(project)
+    app.storage.add_project(project.to_dict())
+
+
+def add_tasks(app):
+    change = AddTasks(app.project, "Importar Tarefas")
+    tasks = [app.project.add_task_to_backlog(f"novo {i}", "d", "Diego").to_dict() for i in range(3)]
+    app.history.record(change)
+    app.storage.add_tasks("P", tasks)
+
+
+def set_task_status(app):
+    change = SetTaskStatus(app.project, False, 1)
+    app.project.set_task_status(False, 1, "Done", 1705399200.0)
+    app.history.record(change)
+    app.storage.set_task_status("P", False, 1, "Done", 1705399200.0)
+
+
+def set_sprint_info(app):
+    app.history.record(SetSprintInfo(app.project))
+    app.project.set_sprint_info(parse_date("2024-02-01"), None, 10)
+    app.post([("set_sprint_info", sprint_info_args(app.project))])
+
+
+def start_sprint(app, daily_capacity=1.0, timestamp=1705309200.0):
+    plan = app.project.plan_sprint(daily_capacity)
+    app.history.record(StartSprint(app.project, plan))
+    app.project.start_sprint(plan, timestamp)
+    app.storage.start_sprint("P", plan.rows, timestamp)
+
+
+def start_second_sprint(app):
+    # Desfazer a segunda sprint devolve a primeira, com status e eventos
+    start_sprint(app)
+    app.project.set_task_status(True, 0, "Done", 1705399200.0)
+    app.storage.set_task_status("P", True, 0, "Done", 1705399200.0)
+    app.history = History()
+    yield
+    start_sprint(app, 2, 1705741200.0)
+
+
+CHANGES = (add_project, add_tasks, set_task_status, set_sprint_info, start_sprint, start_second_sprint)
+
+
+def apply_change(app, change):
+    # Mudanças com preparação são geradores: o estado "antes" é o do yield
+    if not inspect.isgeneratorfunction(change):
+        before = app.state()
+        change(app)
+        return before
+    steps = change(app)
+    next(steps)
+    before = app.state()
+    next(steps, None)
+    return before
+
+
+@pytest.fixture
+def app(data_file):
+    app = App(data_file)
+    yield app
+    app.close()
+
+
+@pytest.mark.parametrize("change", CHANGES, ids=[change.__name__ for change in CHANGES])
+def test_undo_redo(app, change):
+    before = apply_change(app, change)
+    after = app.state()
+    assert after != before
+
+    change_result = app.history.undo()
+    app.post(change_result[1])
+    assert app.state() == before
+    assert app.saved_state() == before
+
+    change_result = app.history.redo()
+    app.post(change_result[1])
+    assert app.state() == after
+    assert app.saved_state() == after
+
+
+def test_undo_all_and_redo_all(app):
+    states = [app.state()]
+    for change in CHANGES[:-1]:
+        assert apply_change(app, change) == states[-1]
+        states.append(app.state())
+    while app.history.undo_stack:
+        app.post(app.history.undo()[1])
+        states.pop()
+        assert app.state() == states[-1]
+    assert app.saved_state() == states[0]
+    assert app.history.redo_label() == "Adicionar Projeto"
+
+
+def test_budget_evicts_oldest(app):
+    app.history.budget = 600
+    for change in (add_tasks, set_sprint_info, set_task_status):
+        change(app)
+    assert [change.label for change, _ in app.history.undo_stack] == ["Definir Informações da Sprint", "Alterar Status"]
+    assert app.history.used <= app.history.budget
@@ -0,0 +1,76 @@
+import json
+import pytest
+import scrumProject
+from modelCodec import SCHEMA_VERSION, load_data
+from scrumModel import ScrumProject, load_projects
+from storage import open_storage
+
+
+def legacy_document():
+    # Como scrumProject.py gravava: sem schema_version e sem os campos que vieram depois
+    return {"projects": [{
+        "project_name": "Antigo",
+        "scrum_master": "Ana",
+        "sprint_planning_date": "2024-01-15",
+        "daily_scrum_time": "09:30",
+        "sprint_duration": 14,
+        "product_backlog": [{"title": "t", "description": "d", "assigned_to": "Bruno"}]
+    }]}
+
+
+def test_legacy_file_is_migrated(tmp_path):
+    file_name = str(tmp_path / "dados.json")
+    scrumProject.save_project(file_name, legacy_document())
+    data = scrumProject.load_project(file_name)
+    assert data["schema_version"] == SCHEMA_VERSION
+    project = data["projects"][0]
+    assert project["sprint_tasks"] == [] and project["sprint_history"] == []
+    assert project["product_backlog"][0] == {
+        "title": "t", "description": "d", "assigned_to": "Bruno", "status": "To Do", "story_points": 1, "priority": 3
+    }
+    storage = open_storage(file_name)
+    try:
+        projects = load_projects(storage)
+        assert [task.title for task in projects[0].product_backlog] == ["t"]
+    finally:
+        storage.close()
+
+
+def test_missing_file_is_empty(tmp_path):
+    assert load_data(str(tmp_path / "nada.json")).get("projects", []) == []
+
+
+def test_shims_export_the_model():
+    import task
+    assert scrumProject.ScrumProject is ScrumProject
+    assert task.Task is scrumProject.Task
+
+
+@pytest.mark.parametrize("extension", [".json", ".db"])
+def test_newer_version_is_refused(tmp_path, extension):
+    file_name = str(tmp_path / ("dados" + extension))
+    if extension == ".json":
+        with open(file_name, 'w') as file:
+            json.dump({"schema_version": SCHEMA_VERSION + 1, "projects": []}, file)
+    else:
+        storage = open_storage(file_name)
+        storage.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+        storage.close()
+    with pytest.raises(ValueError):
+        storage = open_storage(file_name)
+        storage.load()
+
+
+def test_save_project_goes_through_the_storage(data_file):
+    # Outra instância com o arquivo aberto vê a gravação do shim como uma alteração comum
+    other = open_storage(data_file)
+    other.load()
+    other.add_project(ScrumProject("Velho", "Bruno").to_dict())
+    try:
+        scrumProject.save_project(data_file, legacy_document())
+        assert sorted(other.poll_changes()[0]) == ["Antigo", "Velho"]
+    finally:
+        other.close()
+    data = scrumProject.load_project(data_file)
+    assert [project["project_name"] for project in data["projects"]] == ["Antigo"]
+    assert [task["title"] for task in data["projects"][0]["product_backlog"]] == ["t"]
@@ -0,0 +1,97 @@
+import pytest
+from persistence import BackgroundWriter, BatchDiscarded
+from scrumModel import ScrumProject, load_projects
+from storage import open_storage
+
+
+def task_data(title):
+    return {"title": title, "description": "d", "assigned_to": "Bruno", "status": "To Do", "story_points": 1, "priority": 3}
+
+
+class Master:
+    def after(self, delay, function, *args):
+        pass
+
+
+def failing(*args):
+    raise ValueError("falha no meio do lote")
+
+
+def titles(data_file):
+    storage = open_storage(data_file)
+    try:
+        return [task.title for project in load_projects(storage) for task in project.product_backlog]
+    finally:
+        storage.close()
+
+
+@pytest.fixture
+def storage(data_file):
+    storage = open_storage(data_file)
+    storage.load()
+    storage.add_project(ScrumProject("P", "Ana", "2024-01-15").to_dict())
+    yield storage
+    storage.close()
+
+
+def test_failed_batch_leaves_nothing(storage, data_file):
+    batch = [
+        ("add_task", ("P", task_data("t1"))),
+        ("set_sprint_info", ("P", "2024-02-01", None, 10)),
+        ("add_task", ("P", task_data("t2")))
+    ]
+    storage.set_sprint_info = failing
+    with pytest.raises(ValueError):
+        storage.apply_batch(batch)
+    assert titles(data_file) == []
+
+    # A nova tentativa grava cada operação uma única vez
+    del storage.set_sprint_info
+    storage.apply_batch(batch)
+    storage.add_task("P", task_data("t3"))
+    assert titles(data_file) == ["t1", "t2", "t3"]
+    other = open_storage(data_file)
+    try:
+        other.load()
+        assert other.poll_changes() == ([], [])
+    finally:
+        other.close()
+
+
+def test_writer_drops_logic_errors(storage, data_file):
+    writer = BackgroundWriter(storage, Master(), None, delay=60, max_pending=1000)
+    try:
+        storage.set_sprint_info = failing
+        writer.post("add_task", "P", task_data("t1"))
+        writer.post("set_sprint_info", "P", "2024-02-01", None, 10)
+        with pytest.raises(BatchDiscarded) as error:
+            writer.flush()
+        assert error.value.project_names == {"P"}
+        del storage.set_sprint_info
+        # A fila não fica presa no lote descartado
+        writer.post("add_task", "P", task_data("t2"))
+        writer.flush()
+        assert writer.idle()
+        assert titles(data_file) == ["t2"]
+    finally:
+        writer.close()
+
+
+def test_writer_retries_os_errors(storage, data_file):
+    writer = BackgroundWriter(storage, Master(), None, delay=60, max_pending=1000)
+    try:
+        apply_batch = storage.apply_batch
+
+        def unavailable(operations):
+            raise OSError("unidade de rede indisponível")
+
+        storage.apply_batch = unavailable
+        writer.post("add_task", "P", task_data("t1"))
+        with pytest.raises(OSError):
+            writer.flush()
+        assert not writer.idle()
+        storage.apply_batch = apply_batch
+        writer.flush()
+        assert titles(data_file) == ["t1"]
+    finally:
+        writer.close()
@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+import sprintPlanner
+from scrumModel import ScrumProject
+
+
+def project_with_backlog():
+    project = ScrumProject("Projeto", "Ana", sprint_duration=5)
+    for i in range(40):
+        project.add_task_to_backlog(f"t{i}", "d", ("Bruno", "Carla")[i % 2], i % 4 + 1, i % 5 + 1)
+    return project
+
+
+def test_cli_does_not_import_numpy():
+    code = "import sys, cli; print('numpy' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=os.path.dirname(sprintPlanner.__file__), check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_plan_without_numpy(monkeypatch):
+    expected = project_with_backlog().plan_sprint()
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    sprintPlanner.load_numpy.cache_clear()
+    try:
+        assert sprintPlanner.load_numpy() is None
+        plan = project_with_backlog().plan_sprint()
+    finally:
+        sprintPlanner.load_numpy.cache_clear()
+    assert plan.rows == expected.rows
+    assert plan.loads == expected.loads
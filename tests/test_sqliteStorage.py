@@ -0,0 +1,68 @@
+from scrumModel import ScrumProject, load_projects
+from sqliteStorage import SqliteStorage, migrate_json
+from storage import open_storage
+
+
+def project_data(project_name):
+    return ScrumProject(project_name, "Ana").to_dict()
+
+
+def task_data(title):
+    return {"title": title, "description": "d", "assigned_to": "Bruno"}
+
+
+def test_versions_survive_remove_project(tmp_path):
+    file_name = str(tmp_path / "dados.db")
+    first = SqliteStorage(file_name)
+    first.add_project(project_data("A"))
+    first.add_project(project_data("B"))
+    second = SqliteStorage(file_name)
+    second.load()
+    try:
+        # Remover o projeto com a maior versão não pode fazer a próxima alteração repetir a versão dele
+        first.remove_project("B")
+        first.add_task("A", task_data("t1"))
+        changed, conflicts = second.poll_changes()
+        assert sorted(changed) == ["A", "B"]
+        assert conflicts == []
+        assert second.load_project("A")["product_backlog"][0]["title"] == "t1"
+    finally:
+        first.close()
+        second.close()
+
+
+def test_counter_starts_after_existing_versions(tmp_path):
+    file_name = str(tmp_path / "dados.db")
+    storage = SqliteStorage(file_name)
+    storage.add_project(project_data("A"))
+    storage.add_task("A", task_data("t1"))
+    storage.connection.execute("DROP TABLE version_counter")
+    storage.close()
+    # Banco gravado antes do contador: continua da maior versão dos projetos
+    storage = SqliteStorage(file_name)
+    try:
+        storage.load()
+        version = storage.versions["A"]
+        storage.add_project(project_data("B"))
+        assert storage.versions["B"] == version + 1
+    finally:
+        storage.close()
+
+
+def test_migrate_json(tmp_path):
+    json_file = str(tmp_path / "dados.json")
+    project = ScrumProject("A", "Ana", "2024-01-15", "09:30", 10)
+    project.add_task_to_backlog("t1", "d", "Bruno", 3, 1)
+    project.add_task_to_backlog("t2", "d", "Érica")
+    project.start_sprint(project.plan_sprint(), 1705309200.0)
+    project.set_task_status(True, 0, "Done", 1705399200.0)
+    storage = open_storage(json_file)
+    storage.add_project(project.to_dict())
+    storage.close()
+
+    assert migrate_json(json_file, str(tmp_path / "dados.db")) == 1
+    storage = open_storage(str(tmp_path / "dados.db"))
+    try:
+        assert [loaded.to_dict() for loaded in load_projects(storage)] == [project.to_dict()]
+    finally:
+        storage.close()
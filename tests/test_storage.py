@@ -0,0 +1,73 @@
+from scrumModel import ScrumProject, load_projects, parse_date, parse_time
+from storage import open_storage
+
+
+def reopen(data_file):
+    storage = open_storage(data_file)
+    try:
+        return {project.project_name: project.to_dict() for project in load_projects(storage)}
+    finally:
+        storage.close()
+
+
+def edit_projects(storage):
+    # Mesmas alterações no modelo e no storage, como o app faz
+    projects = [ScrumProject("Alfa", "Ana"), ScrumProject("Beta", "Bruno", "2024-01-15")]
+    for project in projects:
+        storage.add_project(project.to_dict())
+    alfa, beta = projects
+
+    task = alfa.add_task_to_backlog("Login", "Tela de \"login\"", "Érica", 3, 1)
+    storage.add_task("Alfa", task.to_dict())
+    tasks = [alfa.add_task_to_backlog(f"t{i}", "d", ("Bruno", "Carla")[i % 2], i % 4, i % 5 + 1) for i in range(8)]
+    storage.add_tasks("Alfa", [task.to_dict() for task in tasks])
+    alfa.set_sprint_info(parse_date("2024-01-15"), parse_time("09:30"), 5)
+    storage.set_sprint_info("Alfa", "2024-01-15", "09:30", 5)
+
+    plan = alfa.plan_sprint()
+    alfa.start_sprint(plan, 1705309200.0)
+    storage.start_sprint("Alfa", plan.rows, 1705309200.0)
+    alfa.set_task_status(True, 0, "Done", 1705399200.0)
+    storage.set_task_status("Alfa", True, 0, "Done", 1705399200.0)
+    alfa.set_task_status(False, 0, "In Progress", 1705399300.0)
+    storage.set_task_status("Alfa", False, 0, "In Progress", 1705399300.0)
+    # A segunda sprint fecha a primeira no histórico
+    plan = alfa.plan_sprint(2)
+    alfa.start_sprint(plan, 1705741200.0)
+    storage.start_sprint("Alfa", plan.rows, 1705741200.0)
+
+    operations = []
+    for i in range(3):
+        task = beta.add_task_to_backlog(f"b{i}", "d", "Diego")
+        operations.append(("add_task", ("Beta", task.to_dict())))
+    plan = beta.plan_sprint()
+    beta.start_sprint(plan, 1705309200.0)
+    operations.append(("start_sprint", ("Beta", plan.rows, 1705309200.0)))
+    storage.apply_batch(operations)
+    return {project.project_name: project.to_dict() for project in projects}
+
+
+def test_round_trip(data_file):
+    storage = open_storage(data_file)
+    load_projects(storage)
+    expected = edit_projects(storage)
+    storage.close()
+    assert expected["Alfa"]["sprint_history"] and expected["Beta"]["sprint_tasks"]
+    assert reopen(data_file) == expected
+    # De novo, agora a partir do snapshot compactado (índice e tarefas sob demanda)
+    assert reopen(data_file) == expected
+
+
+def test_round_trip_after_reload(data_file):
+    storage = open_storage(data_file)
+    load_projects(storage)
+    edit_projects(storage)
+    storage.close()
+    storage = open_storage(data_file)
+    projects = load_projects(storage)
+    alfa = next(project for project in projects if project.project_name == "Alfa")
+    task = alfa.add_task_to_backlog("depois", "d", "Ana")
+    storage.add_task("Alfa", task.to_dict())
+    expected = {project.project_name: project.to_dict() for project in projects}
+    storage.close()
+    assert reopen(data_file) == expected